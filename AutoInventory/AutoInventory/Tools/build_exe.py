@@ -1,6 +1,7 @@
 """
 使用 PyInstaller 将应用打包为单文件 exe
 使用方法：python build_exe.py
+          python build_exe.py --onedir   # 目录模式：体积稍大，但启动时无需解压到临时目录，启动更快
 """
 import os
 import sys
@@ -8,6 +9,22 @@ import subprocess
 import shutil
 
 
+def compile_adc_cache():
+    """用 mypyc 将 adc/_cache.py 编译为扩展模块，编译失败不影响打包"""
+    try:
+        import mypyc  # noqa: F401
+    except ImportError:
+        print("未安装 mypyc，ADC缓存索引使用纯Python版本")
+        return
+    
+    print("使用 mypyc 编译 adc/_cache.py ...")
+    try:
+        subprocess.run([sys.executable, "-m", "mypyc", os.path.join("adc", "_cache.py")], check=True)
+        print("mypyc 编译完成")
+    except subprocess.CalledProcessError as e:
+        print(f"mypyc 编译失败，使用纯Python版本: {e}")
+
+
 def main():
     # 获取脚本所在目录和项目根目录
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -34,6 +51,9 @@ def main():
         print(f"错误: 找不到主程序 {main_script}")
         sys.exit(1)
     
+    # 用 mypyc 编译ADC缓存索引（可选，未安装 mypyc 时使用纯Python版本）
+    compile_adc_cache()
+    
     # 输出目录
     dist_dir = os.path.join(project_dir, "dist")
     build_dir = os.path.join(project_dir, "build")
@@ -41,10 +61,13 @@ def main():
     # 应用名称
     app_name = "ADC库存管理系统"
     
+    # 单文件模式每次启动都要解压到临时目录，包越小启动越快；目录模式省去解压
+    onedir = "--onedir" in sys.argv[1:]
+    
     # PyInstaller 参数
     pyinstaller_args = [
         sys.executable, "-m", "PyInstaller",
-        "--onefile",                    # 打包为单文件
+        "--onedir" if onedir else "--onefile",  # 打包模式
         "--windowed",                   # 无控制台窗口 (GUI应用)
         "--noconfirm",                  # 覆盖已存在的输出
         f"--name={app_name}",           # 输出文件名
@@ -65,11 +88,39 @@ def main():
         "--hidden-import=adc.models",
         "--hidden-import=adc.repository",
         "--hidden-import=adc.controller",
+        "--hidden-import=adc._cache",
+        "--hidden-import=adc_workflow",
+        "--hidden-import=adc_workflow.controller",
+        # 函数内延迟导入的模块
+        "--hidden-import=adc_workflow.sp_core",
+        "--hidden-import=openpyxl",
+        "--hidden-import=PIL.Image",
+        # 排除用不到的模块（tkinter版界面只在没有PyQt5时使用，打包版总带PyQt5）
+        "--exclude-module=tkinter",
+        "--exclude-module=unittest",
+        "--exclude-module=test",
+        "--exclude-module=pydoc",
+        "--exclude-module=distutils",
+        "--exclude-module=xmlrpc",
+        "--exclude-module=http.server",
         # 添加数据文件（如有需要）
         # f"--add-data={os.path.join(project_dir, 'config.json')};.",
-        main_script
     ]
     
+    # 找到UPX时压缩二进制文件
+    upx_path = shutil.which("upx")
+    if upx_path:
+        pyinstaller_args.append(f"--upx-dir={os.path.dirname(upx_path)}")
+        print(f"使用 UPX 压缩: {upx_path}")
+    else:
+        pyinstaller_args.append("--noupx")
+    
+    # 非Windows平台去除调试符号
+    if sys.platform != "win32":
+        pyinstaller_args.append("--strip")
+    
+    pyinstaller_args.append(main_script)
+    
     print("\n开始打包...")
     print(f"命令: {' '.join(pyinstaller_args)}")
     print("-" * 50)
@@ -78,7 +129,10 @@ def main():
         result = subprocess.run(pyinstaller_args, check=True)
         print("-" * 50)
         print(f"\n✅ 打包成功!")
-        print(f"输出文件: {os.path.join(dist_dir, app_name + '.exe')}")
+        if onedir:
+            print(f"输出目录: {os.path.join(dist_dir, app_name)}")
+        else:
+            print(f"输出文件: {os.path.join(dist_dir, app_name + '.exe')}")
         
         # 清理 build 目录和 .spec 文件
         if os.path.exists(build_dir):
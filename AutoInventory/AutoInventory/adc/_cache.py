@@ -0,0 +1,234 @@
+"""
+ADC模块 - 缓存索引
+ADC内存缓存及其派生索引（lot_number、sample_id、spec_id）
+
+本模块只依赖标准库和 .models，并带有完整的类型注解，可用 mypyc 编译：
+    mypyc adc/_cache.py
+编译产物（_cache.*.so / _cache.*.pyd）与本文件同名，导入时优先于 .py 生效；
+未编译时直接使用纯Python版本，行为一致。
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from bisect import bisect_right
+from math import fsum
+from collections import defaultdict
+from datetime import datetime
+
+from .models import ADC, ADCSpec
+
+
+# 拼接搜索字段时使用的分隔符（不会出现在正常输入中）
+SEPARATOR = "\x01"
+
+
+def _order_key(adc: ADC) -> Tuple[datetime, int]:
+    """与数据库查询一致的排序键（ORDER BY created_at DESC, id DESC）"""
+    created_at = adc.created_at if adc.created_at is not None else datetime.min
+    adc_id = adc.id if adc.id is not None else 0
+    return created_at, adc_id
+
+
+class ADCCacheIndex:
+    """ADC缓存索引：按创建时间倒序的列表，加上id/lot_number/spec_id索引和搜索用小写字段"""
+
+    def __init__(self) -> None:
+        self.by_id: Dict[int, ADC] = {}  # adc_id -> ADC对象
+        self.items: List[ADC] = []  # 所有ADC（与数据库顺序一致）
+        self.view: Tuple[ADC, ...] = ()  # 对外返回的只读视图
+        self.lot_index: Dict[str, ADC] = {}  # lot_number -> ADC对象
+        # 搜索用的小写字段，与items一一对应（加载时计算一次，搜索时不再逐个lower()）
+        self.sample_lc: List[str] = []
+        self.antibody_lc: List[str] = []
+        self.linker_lc: List[str] = []
+        # 字段名 -> (以"\x01"分隔拼接的小写字段, 每条记录在其中的起始位置)，首次搜索时构建
+        self._blobs: Dict[str, Tuple[str, List[int]]] = {}
+        # 整个库存的(总毫克数, 总小管数)，首次查询时计算
+        self._totals: Optional[Tuple[float, int]] = None
+        self.spec_adc_ids: Dict[int, int] = {}  # spec_id -> adc_id
+
+    def copy(self) -> "ADCCacheIndex":
+        """浅拷贝各容器（ADC对象共享），写时复制：在副本上修改后整体替换"""
+        other = ADCCacheIndex()
+        other.by_id = dict(self.by_id)
+        other.items = list(self.items)
+        other.view = self.view
+        other._totals = self._totals
+        other.lot_index = dict(self.lot_index)
+        other.sample_lc = list(self.sample_lc)
+        other.antibody_lc = list(self.antibody_lc)
+        other.linker_lc = list(self.linker_lc)
+        other.spec_adc_ids = dict(self.spec_adc_ids)
+        return other
+
+    def load(self, adc_rows: List[Any], spec_rows: List[Any]) -> None:
+        """由数据库行（sqlite3.Row）全量重建缓存（规格按adc_id分组）"""
+        specs_by_adc: Dict[int, List[ADCSpec]] = defaultdict(list)
+        for spec in spec_rows:
+            specs_by_adc[spec['adc_id']].append(ADCSpec.from_row(spec))
+
+        self.by_id = {}
+        self.items = []
+        for row in adc_rows:
+            adc_id: int = row['id']
+            adc = ADC.from_row(row)
+            adc.set_specs(specs_by_adc.get(adc_id, []))
+            self.by_id[adc_id] = adc
+            self.items.append(adc)
+
+        self.rebuild()
+
+    def insert_new(self, adc: ADC) -> None:
+        """插入新建的ADC（按created_at、id倒序定位，新建的通常就在最前面）"""
+        adc_id = adc.id
+        if adc_id is None:
+            return
+        key = _order_key(adc)
+        pos = 0
+        count = len(self.items)
+        while pos < count and _order_key(self.items[pos]) > key:
+            pos += 1
+        self.by_id[adc_id] = adc
+        self.items.insert(pos, adc)
+        self.sample_lc.insert(pos, adc.sample_id.lower())
+        self.antibody_lc.insert(pos, adc.antibody.lower())
+        self.linker_lc.insert(pos, adc.linker_payload.lower())
+        self._index_adc(adc)
+        self.view = tuple(self.items)
+        self._blobs = {}
+        self._totals = None
+
+    def replace(self, adc_id: int, adc: Optional[ADC]) -> bool:
+        """原位替换单个ADC（adc为None表示删除），缓存中不存在时返回False"""
+        old = self.by_id.get(adc_id)
+        if old is None:
+            return False
+
+        # 在列表中定位旧对象（按身份比较），created_at不变，排序位置保持不变
+        index = next(i for i, a in enumerate(self.items) if a is old)
+        # 只增量维护受影响ADC的索引项（lot_number在数据库中唯一）
+        self._unindex_adc(old)
+        if adc is None:
+            del self.by_id[adc_id]
+            del self.items[index]
+            del self.sample_lc[index]
+            del self.antibody_lc[index]
+            del self.linker_lc[index]
+        else:
+            self.by_id[adc_id] = adc
+            self.items[index] = adc
+            self.sample_lc[index] = adc.sample_id.lower()
+            self.antibody_lc[index] = adc.antibody.lower()
+            self.linker_lc[index] = adc.linker_payload.lower()
+            self._index_adc(adc)
+
+        self.view = tuple(self.items)
+        self._blobs = {}
+        self._totals = None
+        return True
+
+    def _index_adc(self, adc: ADC) -> None:
+        """将单个ADC加入lot_number索引和spec_id索引"""
+        self.lot_index[adc.lot_number] = adc
+        adc_id = adc.id
+        if adc_id is None:
+            return
+        for spec in adc.specs:
+            if spec.id is not None:
+                self.spec_adc_ids[spec.id] = adc_id
+
+    def _unindex_adc(self, adc: ADC) -> None:
+        """将单个ADC从lot_number索引和spec_id索引中移除"""
+        if self.lot_index.get(adc.lot_number) is adc:
+            del self.lot_index[adc.lot_number]
+        for spec in adc.specs:
+            if spec.id is not None:
+                self.spec_adc_ids.pop(spec.id, None)
+
+    def rebuild(self) -> None:
+        """根据缓存列表重建只读视图和各索引"""
+        self.view = tuple(self.items)
+        self._blobs = {}
+        self._totals = None
+        lot_index: Dict[str, ADC] = {}
+        spec_adc_ids: Dict[int, int] = {}
+        for adc in self.items:
+            lot_index.setdefault(adc.lot_number, adc)
+            adc_id = adc.id
+            if adc_id is None:
+                continue
+            for spec in adc.specs:
+                if spec.id is not None:
+                    spec_adc_ids[spec.id] = adc_id
+        self.lot_index = lot_index
+        self.sample_lc = [adc.sample_id.lower() for adc in self.items]
+        self.antibody_lc = [adc.antibody.lower() for adc in self.items]
+        self.linker_lc = [adc.linker_payload.lower() for adc in self.items]
+        self.spec_adc_ids = spec_adc_ids
+
+    def get_by_lot_number(self, lot_number: str) -> Optional[ADC]:
+        """根据Lot Number获取ADC"""
+        return self.lot_index.get(lot_number)
+
+    def get_totals(self) -> Tuple[float, int]:
+        """
+        汇总整个库存的总毫克数和总小管数
+        每个ADC的合计已在set_specs时算好，这里只需一次遍历；结果随快照缓存
+        """
+        totals = self._totals
+        if totals is None:
+            items = self.items
+            totals = (fsum([adc.total_mg for adc in items]),
+                      sum([adc.total_vials for adc in items]))
+            self._totals = totals
+        return totals
+
+    def search_sample_id(self, sample_id: str) -> List[ADC]:
+        """根据SampleID模糊匹配（不区分大小写）"""
+        return self._search('sample_id', self.sample_lc, sample_id)
+
+    def search_antibody(self, antibody: str) -> List[ADC]:
+        """根据Antibody模糊匹配（不区分大小写）"""
+        return self._search('antibody', self.antibody_lc, antibody)
+
+    def search_linker_payload(self, linker_payload: str) -> List[ADC]:
+        """根据Linker-payload模糊匹配（不区分大小写）"""
+        return self._search('linker_payload', self.linker_lc, linker_payload)
+
+    def _search(self, field: str, lowered: List[str], text: str) -> List[ADC]:
+        """
+        在拼接后的小写字段中查找子串，返回对应的ADC
+        整个目录只做一次C层面的str.find扫描，命中位置用二分查找换算成记录下标
+        """
+        needle = text.lower()
+        items = self.items
+        if not needle:
+            return list(items)
+        if SEPARATOR in needle:
+            return []
+
+        blob_entry = self._blobs.get(field)
+        if blob_entry is None:
+            blob_entry = self._build_blob(lowered)
+            self._blobs[field] = blob_entry
+        blob, starts = blob_entry
+
+        results: List[ADC] = []
+        count = len(starts)
+        pos = blob.find(needle)
+        while pos != -1:
+            index = bisect_right(starts, pos) - 1
+            results.append(items[index])
+            # 同一条记录只取一次，从下一条记录开头继续查找
+            if index + 1 >= count:
+                break
+            pos = blob.find(needle, starts[index + 1])
+        return results
+
+    @staticmethod
+    def _build_blob(lowered: List[str]) -> Tuple[str, List[int]]:
+        """将小写字段以分隔符拼接成一个字符串，并记录每条记录的起始位置"""
+        starts: List[int] = []
+        offset = 0
+        for value in lowered:
+            starts.append(offset)
+            offset += len(value) + 1
+        return SEPARATOR.join(lowered) + SEPARATOR, starts
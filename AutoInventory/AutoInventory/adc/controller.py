@@ -2,15 +2,24 @@
 ADC模块 - 控制器层
 实现ADC样品及规格的业务逻辑
 """
-from typing import List, Optional, Dict, Any
+import sqlite3
+import threading
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from collections import defaultdict
 
 from .models import ADC, ADCSpec, ADCOutbound, ADCInbound, ADCMovementItem
 from .repository import ADCRepository
+from ._cache import ADCCacheIndex
 
 
-# 预设规格列表（mg）
-PRESET_SPECS = [0.5, 1.0, 2.0, 5.0, 10.0]
+# 预设规格列表（mg，只读）
+PRESET_SPECS: Tuple[float, ...] = (0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+def spec_mg_key(spec_mg: float) -> int:
+    """规格的字典键：换算为整数（0.001mg为单位），避免浮点数直接比较"""
+    return round(spec_mg * 1000)
 
 
 class ADCController:
@@ -19,40 +28,81 @@ class ADCController:
     def __init__(self, db_manager):
         self.db = db_manager
         self.repository = ADCRepository(db_manager)
-        self._adc_cache = {}  # 内存缓存：adc_id -> ADC对象
-        self._all_adcs_cache = []  # 所有ADC的缓存列表
+        # 内存缓存及索引（mypyc编译版优先）。写时复制：刷新时在副本上修改后整体替换，
+        # 读取方只取一次self._index引用即可得到一致的快照，无需加锁
+        self._index = ADCCacheIndex()
+        self._lock = threading.RLock()  # 串行化缓存的刷新/替换
         self._cache_initialized = False
     
     def _init_cache(self):
         """初始化缓存"""
         if not self._cache_initialized:
-            self._refresh_cache()
-            self._cache_initialized = True
+            with self._lock:
+                if not self._cache_initialized:
+                    self._refresh_cache()
     
     def _refresh_cache(self):
-        """刷新缓存"""
-        # 清空缓存
-        self._adc_cache.clear()
-        self._all_adcs_cache.clear()
-        
-        # 从数据库加载所有ADC
-        adc_rows = self.repository.get_all_adcs()
-        
-        for row in adc_rows:
-            adc = ADC.from_dict(row)
-            # 加载规格列表
-            spec_rows = self.repository.get_specs_by_adc_id(adc.id)
-            adc.specs = [ADCSpec.from_dict(spec) for spec in spec_rows]
+        """刷新缓存（全量重新加载，规格一次查询后按adc_id分组）"""
+        with self._lock:
+            index = ADCCacheIndex()
+            index.load(self.repository.get_all_adcs(),
+                       self.repository.get_all_specs())
+            self._index = index
+            self._cache_initialized = True
+    
+    def _fetch_adc(self, adc_id: int) -> Optional[ADC]:
+        """从数据库读取单个ADC及其规格（一次查询），不存在时返回None"""
+        result = self.repository.get_adc_with_specs(adc_id)
+        if result is None:
+            return None
+        row, spec_rows = result
+        adc = ADC.from_dict(row)
+        adc.set_specs([ADCSpec.from_dict(spec) for spec in spec_rows])
+        return adc
+    
+    def _refresh_adc(self, adc_id: int):
+        """只重新加载单个ADC及其规格，在缓存副本中替换后整体替换缓存"""
+        with self._lock:
+            if not self._cache_initialized:
+                return  # 尚未加载，首次访问时会全量加载
+            
+            adc = self._fetch_adc(adc_id)
+            index = self._index.copy()
+            if index.replace(adc_id, adc):
+                self._index = index
+            else:
+                # 缓存中没有（不应发生），退回全量刷新以保证顺序正确
+                self._refresh_cache()
+    
+    def _load_new_adc(self, adc_id: int):
+        """加载新建的ADC及其规格并插入缓存"""
+        with self._lock:
+            if not self._cache_initialized:
+                return
             
-            # 存入缓存
-            self._adc_cache[adc.id] = adc
-            self._all_adcs_cache.append(adc)
+            adc = self._fetch_adc(adc_id)
+            if adc is None:
+                return
+            
+            index = self._index.copy()
+            index.insert_new(adc)
+            self._index = index
+    
+    def _refresh_adc_of_spec(self, spec_id: int):
+        """刷新规格所属ADC的缓存"""
+        with self._lock:
+            adc_id = self._index.spec_adc_ids.get(spec_id)
+            if adc_id is None:
+                self._refresh_cache()
+            else:
+                self._refresh_adc(adc_id)
     
     # ==================== ADC CRUD ====================
     
     def create_adc(self, adc: ADC) -> int:
         """创建ADC"""
-        adc_id = self.repository.create_adc(
+        # ADC记录和规格在同一事务中写入（规格用executemany批量插入）
+        adc_id = self.repository.create_adc_with_specs(
             lot_number=adc.lot_number,
             sample_id=adc.sample_id,
             description=adc.description,
@@ -61,121 +111,108 @@ class ADCController:
             storage_temp=adc.storage_temp,
             storage_position=adc.storage_position,
             antibody=adc.antibody,
-            linker_payload=adc.linker_payload
+            linker_payload=adc.linker_payload,
+            specs=[(spec.spec_mg, spec.quantity) for spec in adc.specs]
         )
         
-        # 添加规格
-        if adc.specs:
-            for spec in adc.specs:
-                if isinstance(spec, ADCSpec):
-                    self.repository.add_spec(adc_id, spec.spec_mg, spec.quantity)
-                elif isinstance(spec, dict):
-                    self.repository.add_spec(adc_id, spec['spec_mg'], spec['quantity'])
-        
-        # 刷新缓存
-        self._refresh_cache()
+        # 刷新缓存（只加载新建的ADC）
+        self._load_new_adc(adc_id)
         
         return adc_id
     
     def get_adc(self, adc_id: int) -> Optional[ADC]:
         """获取ADC（从缓存）"""
         self._init_cache()
-        return self._adc_cache.get(adc_id)
+        return self._index.by_id.get(adc_id)
     
     def get_adc_by_lot_number(self, lot_number: str) -> Optional[ADC]:
         """根据Lot Number获取ADC"""
         self._init_cache()
-        for adc in self._all_adcs_cache:
-            if adc.lot_number == lot_number:
-                return adc
-        return None
+        return self._index.get_by_lot_number(lot_number)
     
-    def get_all_adcs(self) -> List[ADC]:
-        """获取所有ADC（从缓存）"""
+    def get_all_adcs(self) -> Tuple[ADC, ...]:
+        """获取所有ADC（从缓存，返回只读元组，无需复制）"""
         self._init_cache()
-        return self._all_adcs_cache.copy()
+        return self._index.view
     
     def search_by_sample_id(self, sample_id: str) -> List[ADC]:
         """根据SampleID搜索ADC（从缓存，模糊匹配）"""
         self._init_cache()
-        sample_id_lower = sample_id.lower()
-        results = []
-        for adc in self._all_adcs_cache:
-            if sample_id_lower in adc.sample_id.lower():
-                results.append(adc)
-        return results
+        return self._index.search_sample_id(sample_id)
     
     def search_by_antibody(self, antibody: str) -> List[ADC]:
         """根据Antibody搜索ADC（从缓存，模糊匹配）"""
         self._init_cache()
-        antibody_lower = antibody.lower()
-        results = []
-        for adc in self._all_adcs_cache:
-            if antibody_lower in adc.antibody.lower():
-                results.append(adc)
-        return results
+        return self._index.search_antibody(antibody)
     
     def search_by_linker_payload(self, linker_payload: str) -> List[ADC]:
         """根据Linker-payload搜索ADC（从缓存，模糊匹配）"""
         self._init_cache()
-        linker_payload_lower = linker_payload.lower()
-        results = []
-        for adc in self._all_adcs_cache:
-            if linker_payload_lower in adc.linker_payload.lower():
-                results.append(adc)
-        return results
+        return self._index.search_linker_payload(linker_payload)
+    
+    def get_inventory_totals(self) -> Tuple[float, int]:
+        """获取整个ADC库存的(总毫克数, 总小管数)（从缓存）"""
+        self._init_cache()
+        return self._index.get_totals()
     
     def update_adc(self, adc: ADC) -> tuple:
         """更新ADC，返回(成功状态, 错误信息)"""
         if not adc.id:
             return False, "ADC ID不能为空"
         
-        # 检查ADC是否存在
-        existing = self.repository.get_adc_by_id(adc.id)
-        if not existing:
-            return False, "ADC不存在"
-        
-        # 检查Lot Number是否被其他记录使用
-        lot_check = self.repository.get_adc_by_lot_number(adc.lot_number)
-        if lot_check and lot_check['id'] != adc.id:
+        # 直接更新ADC基本信息，不再事先查询：
+        # ADC不存在时影响0行，Lot Number被其他记录使用时由唯一约束拒绝
+        try:
+            success = self.repository.update_adc(
+                adc_id=adc.id,
+                lot_number=adc.lot_number,
+                sample_id=adc.sample_id,
+                description=adc.description,
+                concentration=adc.concentration,
+                owner=adc.owner,
+                storage_temp=adc.storage_temp,
+                storage_position=adc.storage_position,
+                antibody=adc.antibody,
+                linker_payload=adc.linker_payload
+            )
+        except sqlite3.IntegrityError:
             return False, f"Lot Number '{adc.lot_number}' 已被其他记录使用"
         
-        # 更新ADC基本信息
-        success = self.repository.update_adc(
-            adc_id=adc.id,
-            lot_number=adc.lot_number,
-            sample_id=adc.sample_id,
-            description=adc.description,
-            concentration=adc.concentration,
-            owner=adc.owner,
-            storage_temp=adc.storage_temp,
-            storage_position=adc.storage_position,
-            antibody=adc.antibody,
-            linker_payload=adc.linker_payload
-        )
-        
         if not success:
-            return False, "更新失败"
+            return False, "ADC不存在"
         
-        # 更新规格（先删除旧的，再添加新的）
-        self.repository.delete_specs_by_adc_id(adc.id)
-        if adc.specs:
-            for spec in adc.specs:
-                if isinstance(spec, ADCSpec):
-                    self.repository.add_spec(adc.id, spec.spec_mg, spec.quantity)
-                elif isinstance(spec, dict):
-                    self.repository.add_spec(adc.id, spec['spec_mg'], spec['quantity'])
+        # 更新规格：只写入与现有规格的差异（未改动的规格不写库，规格ID保持不变）
+        self._sync_specs(adc.id, adc.specs)
         
         # 刷新缓存
-        self._refresh_cache()
+        self._refresh_adc(adc.id)
         
         return True, "更新成功"
     
+    def _sync_specs(self, adc_id: int, specs: List[ADCSpec]):
+        """将ADC的规格同步为specs：按规格匹配现有记录，计算新增/修改/删除后批量写入"""
+        existing = defaultdict(list)
+        for row in self.repository.get_specs_by_adc_id(adc_id):
+            existing[spec_mg_key(row['spec_mg'])].append(row)
+        
+        inserts, updates = [], []
+        for spec in specs:
+            matches = existing.get(spec_mg_key(spec.spec_mg))
+            if matches:
+                row = matches.pop(0)
+                if row['spec_mg'] != spec.spec_mg or row['quantity'] != spec.quantity:
+                    updates.append((spec.spec_mg, spec.quantity, row['id']))
+            else:
+                inserts.append((spec.spec_mg, spec.quantity))
+        deletes = [row['id'] for rows in existing.values() for row in rows]
+        
+        self.repository.apply_spec_changes(adc_id, inserts, updates, deletes)
+    
     def delete_adc(self, adc_id: int) -> bool:
         """删除ADC"""
         success = self.repository.delete_adc(adc_id)
         if success:
-            self._refresh_cache()
+            self._refresh_adc(adc_id)
         return success
     
     # ==================== 规格管理 ====================
@@ -183,45 +220,50 @@ class ADCController:
     def add_spec(self, adc_id: int, spec_mg: float, quantity: int) -> int:
         """添加规格"""
         spec_id = self.repository.add_spec(adc_id, spec_mg, quantity)
-        self._refresh_cache()
+        self._refresh_adc(adc_id)
         return spec_id
     
     def update_spec(self, spec_id: int, spec_mg: float, quantity: int) -> bool:
         """更新规格"""
+        self._init_cache()
         success = self.repository.update_spec(spec_id, spec_mg, quantity)
         if success:
-            self._refresh_cache()
+            self._refresh_adc_of_spec(spec_id)
         return success
     
     def update_spec_quantity(self, spec_id: int, quantity: int) -> bool:
         """更新规格库存量"""
+        self._init_cache()
         success = self.repository.update_spec_quantity(spec_id, quantity)
         if success:
-            self._refresh_cache()
+            self._refresh_adc_of_spec(spec_id)
         return success
     
     def delete_spec(self, spec_id: int) -> bool:
         """删除规格"""
+        self._init_cache()
         success = self.repository.delete_spec(spec_id)
         if success:
-            self._refresh_cache()
+            self._refresh_adc_of_spec(spec_id)
         return success
     
     # ==================== 汇总计算 ====================
     
     def calculate_total_mg(self, adc_id: int) -> float:
-        """计算ADC的总毫克数"""
-        return self.repository.calculate_total_mg(adc_id)
+        """计算ADC的总毫克数（读取缓存中随规格变更预先算好的合计，不再逐次SUM）"""
+        adc = self.get_adc(adc_id)
+        return adc.total_mg if adc is not None else 0.0
     
     def calculate_total_vials(self, adc_id: int) -> int:
-        """计算ADC的总小管数"""
-        return self.repository.calculate_total_vials(adc_id)
+        """计算ADC的总小管数（读取缓存中随规格变更预先算好的合计，不再逐次SUM）"""
+        adc = self.get_adc(adc_id)
+        return adc.total_vials if adc is not None else 0
     
     # ==================== 辅助方法 ====================
     
-    def get_preset_specs(self) -> List[float]:
-        """获取预设规格列表"""
-        return PRESET_SPECS.copy()
+    def get_preset_specs(self) -> Tuple[float, ...]:
+        """获取预设规格列表（只读元组）"""
+        return PRESET_SPECS
     
     def refresh(self):
         """手动刷新缓存"""
@@ -229,91 +271,112 @@ class ADCController:
     
     # ==================== 出库管理 ====================
     
+    @staticmethod
+    def _group_movement_items(item_rows: List[Dict[str, Any]], key: str) -> Dict[int, List[ADCMovementItem]]:
+        """将明细行按出库/入库ID分组"""
+        items_by_id = defaultdict(list)
+        for row in item_rows:
+            items_by_id[row[key]].append(ADCMovementItem.from_dict(row))
+        return items_by_id
+    
     def create_outbound(self, outbound: ADCOutbound) -> tuple:
         """
         创建出库记录并减少库存
         返回 (成功状态, 消息或出库ID)
         """
+        return self._create_movement(outbound, -1)
+    
+    def _create_movement(self, movement, sign: int) -> tuple:
+        """
+        出库（sign=-1）/入库（sign=1）共用的创建流程
+        记录、明细和库存调整在同一事务中写入，返回 (成功状态, 消息或记录ID)
+        """
         # 检查ADC是否存在
-        adc = self.get_adc_by_lot_number(outbound.lot_number)
+        adc = self.get_adc_by_lot_number(movement.lot_number)
         if not adc:
-            return False, f"Lot Number '{outbound.lot_number}' 不存在"
+            return False, f"Lot Number '{movement.lot_number}' 不存在"
         
-        # 检查库存是否充足
-        for item in outbound.items:
-            spec_mg = item.spec_mg if isinstance(item, ADCMovementItem) else item['spec_mg']
-            quantity = item.quantity if isinstance(item, ADCMovementItem) else item['quantity']
-            
-            # 查找对应规格
-            spec_found = None
-            for spec in adc.specs:
-                if isinstance(spec, ADCSpec) and abs(spec.spec_mg - spec_mg) < 0.001:
-                    spec_found = spec
-                    break
-                elif isinstance(spec, dict) and abs(spec.get('spec_mg', 0) - spec_mg) < 0.001:
-                    spec_found = spec
-                    break
-            
-            if not spec_found:
-                return False, f"规格 {spec_mg}mg 不存在"
-            
-            current_qty = spec_found.quantity if isinstance(spec_found, ADCSpec) else spec_found.get('quantity', 0)
-            if current_qty < quantity:
-                return False, f"规格 {spec_mg}mg 库存不足，当前库存 {current_qty}，需要 {quantity}"
-        
-        # 创建出库记录（使用当前时间作为精确时间戳）
-        shipping_date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        items = [(item.spec_mg, item.quantity) for item in movement.items]
         
-        outbound_id = self.repository.create_outbound(
-            lot_number=outbound.lot_number,
-            requester=outbound.requester,
-            operator=outbound.operator,
-            shipping_address=outbound.shipping_address,
-            shipping_date=shipping_date_str,
-            notes=outbound.notes
-        )
+        # 使用当前时间作为精确时间戳
+        timestamp = datetime.now().isoformat(sep=' ', timespec='microseconds')
         
-        # 添加出库明细并减少库存
-        for item in outbound.items:
-            spec_mg = item.spec_mg if isinstance(item, ADCMovementItem) else item['spec_mg']
-            quantity = item.quantity if isinstance(item, ADCMovementItem) else item['quantity']
-            
-            # 添加明细记录
-            self.repository.add_outbound_item(outbound_id, spec_mg, quantity)
+        if sign < 0:
+            # 检查库存是否充足（规格换算为整数键建字典，精确且O(1)查找；重复规格取第一条）
+            specs_by_mg = {}
+            for spec in adc.specs:
+                specs_by_mg.setdefault(spec_mg_key(spec.spec_mg), spec)
+            decrements = []
+            for spec_mg, quantity in items:
+                spec_found = specs_by_mg.get(spec_mg_key(spec_mg))
+                if not spec_found:
+                    return False, f"规格 {spec_mg}mg 不存在"
+                if spec_found.quantity < quantity:
+                    return False, f"规格 {spec_mg}mg 库存不足，当前库存 {spec_found.quantity}，需要 {quantity}"
+                decrements.append((spec_found.id, quantity))
             
-            # 减少库存
-            spec_record = self.repository.get_spec_by_adc_and_mg(adc.id, spec_mg)
-            if spec_record:
-                self.repository.decrease_spec_quantity(spec_record['id'], quantity)
+            # 复用检查时找到的规格扣减库存，无需再查询数据库；
+            # 扣减在事务中按条件执行，缓存过期导致库存不足时整体回滚
+            try:
+                movement_id = self.repository.create_outbound_with_items(
+                    lot_number=movement.lot_number,
+                    requester=movement.requester,
+                    operator=movement.operator,
+                    shipping_address=movement.shipping_address,
+                    shipping_date=timestamp,
+                    notes=movement.notes,
+                    items=items,
+                    decrements=decrements
+                )
+            except ValueError as e:
+                self._refresh_adc(adc.id)
+                return False, str(e)
+        else:
+            # 规格不存在时新建
+            movement_id = self.repository.create_inbound_with_items(
+                adc_id=adc.id,
+                lot_number=movement.lot_number,
+                operator=movement.operator,
+                owner=movement.owner,
+                storage_position=movement.storage_position,
+                storage_date=timestamp,
+                notes=movement.notes,
+                items=items
+            )
         
         # 刷新缓存
-        self._refresh_cache()
+        self._refresh_adc(adc.id)
         
-        return True, outbound_id
+        return True, movement_id
     
-    def get_all_outbounds(self) -> List[ADCOutbound]:
+    def get_all_outbounds(self, load_items: bool = True) -> List[ADCOutbound]:
         """获取所有出库记录"""
         outbound_rows = self.repository.get_all_outbounds()
+        # 明细一次查询后按outbound_id分组（load_items=False时不加载）
+        items_by_id = self._group_movement_items(self.repository.get_all_outbound_items(), 'outbound_id') if load_items else {}
         outbounds = []
         for row in outbound_rows:
             outbound = ADCOutbound.from_dict(row)
-            # 加载明细
-            item_rows = self.repository.get_outbound_items(outbound.id)
-            outbound.items = [ADCMovementItem.from_dict(item) for item in item_rows]
+            outbound.items = items_by_id.get(outbound.id, [])
             outbounds.append(outbound)
         return outbounds
     
-    def search_outbounds_by_lot_number(self, lot_number: str) -> List[ADCOutbound]:
+    def search_outbounds_by_lot_number(self, lot_number: str, load_items: bool = True) -> List[ADCOutbound]:
         """根据LotNumber搜索出库记录"""
         outbound_rows = self.repository.search_outbounds_by_lot_number(lot_number)
+        # 明细一次查询后按outbound_id分组（load_items=False时不加载）
+        items_by_id = self._group_movement_items(self.repository.search_outbound_items_by_lot_number(lot_number), 'outbound_id') if load_items else {}
         outbounds = []
         for row in outbound_rows:
             outbound = ADCOutbound.from_dict(row)
-            item_rows = self.repository.get_outbound_items(outbound.id)
-            outbound.items = [ADCMovementItem.from_dict(item) for item in item_rows]
+            outbound.items = items_by_id.get(outbound.id, [])
             outbounds.append(outbound)
         return outbounds
     
+    def get_outbound_items(self, outbound_id: int) -> List[ADCMovementItem]:
+        """获取单条出库记录的明细（配合load_items=False的列表按需加载）"""
+        return [ADCMovementItem.from_dict(row) for row in self.repository.get_outbound_items(outbound_id)]
+    
     # ==================== 入库管理 ====================
     
     def create_inbound(self, inbound: ADCInbound) -> tuple:
@@ -321,130 +384,99 @@ class ADCController:
         创建入库记录并增加库存
         返回 (成功状态, 消息或入库ID)
         """
-        # 检查ADC是否存在
-        adc = self.get_adc_by_lot_number(inbound.lot_number)
-        if not adc:
-            return False, f"Lot Number '{inbound.lot_number}' 不存在"
-        
-        # 创建入库记录（使用当前时间作为精确时间戳）
-        storage_date_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
-        
-        inbound_id = self.repository.create_inbound(
-            lot_number=inbound.lot_number,
-            operator=inbound.operator,
-            owner=inbound.owner,
-            storage_position=inbound.storage_position,
-            storage_date=storage_date_str,
-            notes=inbound.notes
-        )
-        
-        # 添加入库明细并增加库存
-        for item in inbound.items:
-            spec_mg = item.spec_mg if isinstance(item, ADCMovementItem) else item['spec_mg']
-            quantity = item.quantity if isinstance(item, ADCMovementItem) else item['quantity']
-            
-            # 添加明细记录
-            self.repository.add_inbound_item(inbound_id, spec_mg, quantity)
-            
-            # 查找规格，如果不存在则新建
-            spec_record = self.repository.get_spec_by_adc_and_mg(adc.id, spec_mg)
-            if spec_record:
-                # 增加库存
-                self.repository.increase_spec_quantity(spec_record['id'], quantity)
-            else:
-                # 新建规格
-                self.repository.add_spec(adc.id, spec_mg, quantity)
-        
-        # 刷新缓存
-        self._refresh_cache()
-        
-        return True, inbound_id
+        return self._create_movement(inbound, 1)
     
-    def get_all_inbounds(self) -> List[ADCInbound]:
+    def get_all_inbounds(self, load_items: bool = True) -> List[ADCInbound]:
         """获取所有入库记录"""
         inbound_rows = self.repository.get_all_inbounds()
+        # 明细一次查询后按inbound_id分组（load_items=False时不加载）
+        items_by_id = self._group_movement_items(self.repository.get_all_inbound_items(), 'inbound_id') if load_items else {}
         inbounds = []
         for row in inbound_rows:
             inbound = ADCInbound.from_dict(row)
-            # 加载明细
-            item_rows = self.repository.get_inbound_items(inbound.id)
-            inbound.items = [ADCMovementItem.from_dict(item) for item in item_rows]
+            inbound.items = items_by_id.get(inbound.id, [])
             inbounds.append(inbound)
         return inbounds
     
-    def search_inbounds_by_lot_number(self, lot_number: str) -> List[ADCInbound]:
+    def search_inbounds_by_lot_number(self, lot_number: str, load_items: bool = True) -> List[ADCInbound]:
         """根据LotNumber搜索入库记录"""
         inbound_rows = self.repository.search_inbounds_by_lot_number(lot_number)
+        # 明细一次查询后按inbound_id分组（load_items=False时不加载）
+        items_by_id = self._group_movement_items(self.repository.search_inbound_items_by_lot_number(lot_number), 'inbound_id') if load_items else {}
         inbounds = []
         for row in inbound_rows:
             inbound = ADCInbound.from_dict(row)
-            item_rows = self.repository.get_inbound_items(inbound.id)
-            inbound.items = [ADCMovementItem.from_dict(item) for item in item_rows]
+            inbound.items = items_by_id.get(inbound.id, [])
             inbounds.append(inbound)
         return inbounds
     
+    def get_inbound_items(self, inbound_id: int) -> List[ADCMovementItem]:
+        """获取单条入库记录的明细（配合load_items=False的列表按需加载）"""
+        return [ADCMovementItem.from_dict(row) for row in self.repository.get_inbound_items(inbound_id)]
+    
     # ==================== 混合查询 ====================
     
     def get_all_movements(self) -> List[Dict]:
-        """获取所有出入库记录（混合列表，按时间倒序）"""
-        movements = []
-        
-        # 获取所有出库记录
-        for outbound in self.get_all_outbounds():
-            movements.append({
-                'type': 'outbound',
-                'record': outbound,
-                'lot_number': outbound.lot_number,
-                'operator': outbound.operator,
-                'date': outbound.shipping_date,
-                'created_at': outbound.created_at,
-                'items': outbound.items
-            })
-        
-        # 获取所有入库记录
-        for inbound in self.get_all_inbounds():
-            movements.append({
-                'type': 'inbound',
-                'record': inbound,
-                'lot_number': inbound.lot_number,
-                'operator': inbound.operator,
-                'date': inbound.storage_date,
-                'created_at': inbound.created_at,
-                'items': inbound.items
-            })
-        
-        # 按创建时间倒序排序
-        movements.sort(key=lambda x: x['created_at'] or '', reverse=True)
-        
-        return movements
+        """获取所有出入库记录（混合列表，按时间倒序，排序由SQLite完成）"""
+        return self._build_movements(
+            self.repository.get_all_movements_union(),
+            self.repository.get_all_outbound_items(),
+            self.repository.get_all_inbound_items()
+        )
     
     def search_movements_by_lot_number(self, lot_number: str) -> List[Dict]:
         """根据LotNumber搜索出入库记录"""
-        movements = []
-        
-        for outbound in self.search_outbounds_by_lot_number(lot_number):
-            movements.append({
-                'type': 'outbound',
-                'record': outbound,
-                'lot_number': outbound.lot_number,
-                'operator': outbound.operator,
-                'date': outbound.shipping_date,
-                'created_at': outbound.created_at,
-                'items': outbound.items
-            })
+        return self._build_movements(
+            self.repository.search_movements_union(lot_number),
+            self.repository.search_outbound_items_by_lot_number(lot_number),
+            self.repository.search_inbound_items_by_lot_number(lot_number)
+        )
+    
+    def _build_movements(self, rows: List[Dict[str, Any]],
+                         outbound_item_rows: List[Dict[str, Any]],
+                         inbound_item_rows: List[Dict[str, Any]]) -> List[Dict]:
+        """将已排序的UNION查询结果包装为出入库记录字典（保持查询顺序）"""
+        outbound_items = self._group_movement_items(outbound_item_rows, 'outbound_id')
+        inbound_items = self._group_movement_items(inbound_item_rows, 'inbound_id')
         
-        for inbound in self.search_inbounds_by_lot_number(lot_number):
+        movements = []
+        for row in rows:
+            if row['type'] == 'outbound':
+                record = ADCOutbound.from_dict({
+                    'id': row['id'],
+                    'lot_number': row['lot_number'],
+                    'requester': row['requester'],
+                    'operator': row['operator'],
+                    'shipping_address': row['shipping_address'],
+                    'shipping_date': row['date'],
+                    'notes': row['notes'],
+                    'created_at': row['created_at'],
+                    'items': outbound_items.get(row['id'], [])
+                })
+                date = record.shipping_date
+            else:
+                record = ADCInbound.from_dict({
+                    'id': row['id'],
+                    'lot_number': row['lot_number'],
+                    'operator': row['operator'],
+                    'owner': row['owner'],
+                    'storage_position': row['storage_position'],
+                    'storage_date': row['date'],
+                    'notes': row['notes'],
+                    'created_at': row['created_at'],
+                    'items': inbound_items.get(row['id'], [])
+                })
+                date = record.storage_date
+            
             movements.append({
-                'type': 'inbound',
-                'record': inbound,
-                'lot_number': inbound.lot_number,
-                'operator': inbound.operator,
-                'date': inbound.storage_date,
-                'created_at': inbound.created_at,
-                'items': inbound.items
+                'type': row['type'],
+                'record': record,
+                'lot_number': record.lot_number,
+                'operator': record.operator,
+                'date': date,
+                'created_at': record.created_at,
+                'items': record.items
             })
         
-        movements.sort(key=lambda x: x['created_at'] or '', reverse=True)
-        
         return movements
 
@@ -2,12 +2,37 @@
 ADC模块 - 数据模型类
 定义ADC样品及规格的数据模型
 """
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
+import sys
 from datetime import datetime
 
 
-@dataclass
+# Python 3.10+ 使用 __slots__：实例不再带 __dict__，内存更省、属性访问更快
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _to_datetime(value):
+    """
+    数据库时间字段转为datetime
+    支持ISO字符串、纯日期字符串和整数时间戳（epoch微秒），其它值原样返回
+    """
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.strptime(value, '%Y-%m-%d')
+    if isinstance(value, int) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1_000_000)
+    return value
+
+
+def _isoformat(value):
+    """datetime转为ISO字符串，其它值（字符串或None）原样返回"""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCSpec:
     """ADC规格库存模型"""
     id: Optional[int] = None
@@ -17,28 +42,38 @@ class ADCSpec:
     created_at: Optional[datetime] = None
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        data = asdict(self)
-        if data.get('created_at'):
-            data['created_at'] = data['created_at'].isoformat()
-        return data
+        """转换为字典（逐字段构造，避免asdict的反射和深拷贝）"""
+        return {
+            'id': self.id,
+            'adc_id': self.adc_id,
+            'spec_mg': self.spec_mg,
+            'quantity': self.quantity,
+            'created_at': _isoformat(self.created_at),
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ADCSpec':
         """从字典创建对象"""
-        if data.get('created_at') and isinstance(data['created_at'], str):
-            data['created_at'] = datetime.fromisoformat(data['created_at'])
+        if data.get('created_at'):
+            data['created_at'] = _to_datetime(data['created_at'])
         
         spec_fields = {'id', 'adc_id', 'spec_mg', 'quantity', 'created_at'}
         filtered_data = {k: v for k, v in data.items() if k in spec_fields}
         return cls(**filtered_data)
     
+    @classmethod
+    def from_row(cls, row) -> 'ADCSpec':
+        """从数据库行（sqlite3.Row）直接创建对象，不经过中间dict"""
+        created_at = row['created_at']
+        return cls(row['id'], row['adc_id'], row['spec_mg'], row['quantity'],
+                   _to_datetime(created_at) if created_at else created_at)
+    
     def get_total_mg(self) -> float:
         """计算该规格的总毫克数"""
         return self.spec_mg * self.quantity
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADC:
     """ADC样品模型"""
     id: Optional[int] = None
@@ -54,28 +89,47 @@ class ADC:
     created_at: Optional[datetime] = None   # 入库时间
     updated_at: Optional[datetime] = None   # 更新时间
     specs: List[ADCSpec] = field(default_factory=list)  # 规格列表
+    # 规格汇总（随specs一起计算，界面渲染时直接读取）
+    total_mg: float = field(default=0.0, init=False, repr=False, compare=False)
+    total_vials: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """构造时统一将字典形式的规格转换为ADCSpec，之后无需再区分类型"""
+        self.set_specs([ADCSpec.from_dict(spec) if isinstance(spec, dict) else spec
+                        for spec in self.specs])
+    
+    def set_specs(self, specs: List[ADCSpec]):
+        """设置规格列表并重新计算汇总（替换specs时应使用此方法）"""
+        self.specs = specs
+        self.total_mg = sum((spec.spec_mg * spec.quantity for spec in specs), 0.0)
+        self.total_vials = sum(spec.quantity for spec in specs)
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        data = asdict(self)
-        # 处理datetime对象
-        if data.get('created_at'):
-            data['created_at'] = data['created_at'].isoformat()
-        if data.get('updated_at'):
-            data['updated_at'] = data['updated_at'].isoformat()
-        # 处理specs列表
-        if data.get('specs'):
-            data['specs'] = [spec if isinstance(spec, dict) else spec for spec in data['specs']]
-        return data
+        """转换为字典（逐字段构造，避免asdict的反射和深拷贝）"""
+        return {
+            'id': self.id,
+            'lot_number': self.lot_number,
+            'sample_id': self.sample_id,
+            'description': self.description,
+            'concentration': self.concentration,
+            'owner': self.owner,
+            'storage_temp': self.storage_temp,
+            'storage_position': self.storage_position,
+            'antibody': self.antibody,
+            'linker_payload': self.linker_payload,
+            'created_at': _isoformat(self.created_at),
+            'updated_at': _isoformat(self.updated_at),
+            'specs': [spec.to_dict() for spec in self.specs],
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ADC':
         """从字典创建对象"""
         # 处理datetime字符串
-        if data.get('created_at') and isinstance(data['created_at'], str):
-            data['created_at'] = datetime.fromisoformat(data['created_at'])
-        if data.get('updated_at') and isinstance(data['updated_at'], str):
-            data['updated_at'] = datetime.fromisoformat(data['updated_at'])
+        if data.get('created_at'):
+            data['created_at'] = _to_datetime(data['created_at'])
+        if data.get('updated_at'):
+            data['updated_at'] = _to_datetime(data['updated_at'])
         
         # 只保留ADC类定义的字段
         adc_fields = {
@@ -91,30 +145,31 @@ class ADC:
         
         return cls(**filtered_data)
     
+    @classmethod
+    def from_row(cls, row) -> 'ADC':
+        """从数据库行（sqlite3.Row）直接创建对象（规格为空，由set_specs设置），不经过中间dict"""
+        created_at = row['created_at']
+        updated_at = row['updated_at']
+        return cls(
+            row['id'], row['lot_number'], row['sample_id'], row['description'],
+            row['concentration'], row['owner'], row['storage_temp'], row['storage_position'],
+            row['antibody'], row['linker_payload'],
+            _to_datetime(created_at) if created_at else created_at,
+            _to_datetime(updated_at) if updated_at else updated_at,
+        )
+    
     def get_total_mg(self) -> float:
-        """计算所有规格的总毫克数"""
-        total = 0.0
-        for spec in self.specs:
-            if isinstance(spec, ADCSpec):
-                total += spec.get_total_mg()
-            elif isinstance(spec, dict):
-                total += spec.get('spec_mg', 0) * spec.get('quantity', 0)
-        return total
+        """所有规格的总毫克数"""
+        return self.total_mg
     
     def get_total_vials(self) -> int:
-        """计算所有规格的总小管数"""
-        total = 0
-        for spec in self.specs:
-            if isinstance(spec, ADCSpec):
-                total += spec.quantity
-            elif isinstance(spec, dict):
-                total += spec.get('quantity', 0)
-        return total
+        """所有规格的总小管数"""
+        return self.total_vials
 
 
 # ==================== 出入库相关模型 ====================
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCMovementItem:
     """出入库明细项（规格+数量）"""
     id: Optional[int] = None
@@ -124,7 +179,12 @@ class ADCMovementItem:
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        return asdict(self)
+        return {
+            'id': self.id,
+            'movement_id': self.movement_id,
+            'spec_mg': self.spec_mg,
+            'quantity': self.quantity,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ADCMovementItem':
@@ -138,7 +198,7 @@ class ADCMovementItem:
         return self.spec_mg * self.quantity
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCOutbound:
     """ADC出库记录"""
     id: Optional[int] = None
@@ -151,25 +211,32 @@ class ADCOutbound:
     created_at: Optional[datetime] = None     # 记录创建时间
     items: List[ADCMovementItem] = field(default_factory=list)  # 出库明细
     
+    def __post_init__(self):
+        """构造时统一将字典形式的明细转换为ADCMovementItem"""
+        self.items = [ADCMovementItem.from_dict(item) if isinstance(item, dict) else item
+                      for item in self.items]
+    
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        data = asdict(self)
-        if data.get('shipping_date'):
-            data['shipping_date'] = data['shipping_date'].isoformat() if isinstance(data['shipping_date'], datetime) else data['shipping_date']
-        if data.get('created_at'):
-            data['created_at'] = data['created_at'].isoformat() if isinstance(data['created_at'], datetime) else data['created_at']
-        return data
+        """转换为字典（逐字段构造，避免asdict的反射和深拷贝）"""
+        return {
+            'id': self.id,
+            'lot_number': self.lot_number,
+            'requester': self.requester,
+            'operator': self.operator,
+            'shipping_address': self.shipping_address,
+            'shipping_date': _isoformat(self.shipping_date),
+            'notes': self.notes,
+            'created_at': _isoformat(self.created_at),
+            'items': [item.to_dict() for item in self.items],
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ADCOutbound':
         """从字典创建对象"""
-        if data.get('shipping_date') and isinstance(data['shipping_date'], str):
-            try:
-                data['shipping_date'] = datetime.fromisoformat(data['shipping_date'])
-            except ValueError:
-                data['shipping_date'] = datetime.strptime(data['shipping_date'], '%Y-%m-%d')
-        if data.get('created_at') and isinstance(data['created_at'], str):
-            data['created_at'] = datetime.fromisoformat(data['created_at'])
+        if data.get('shipping_date'):
+            data['shipping_date'] = _to_datetime(data['shipping_date'])
+        if data.get('created_at'):
+            data['created_at'] = _to_datetime(data['created_at'])
         
         outbound_fields = {
             'id', 'lot_number', 'requester', 'operator', 'shipping_address',
@@ -182,26 +249,14 @@ class ADCOutbound:
     
     def get_total_mg(self) -> float:
         """计算出库总毫克数"""
-        total = 0.0
-        for item in self.items:
-            if isinstance(item, ADCMovementItem):
-                total += item.get_total_mg()
-            elif isinstance(item, dict):
-                total += item.get('spec_mg', 0) * item.get('quantity', 0)
-        return total
+        return sum((item.spec_mg * item.quantity for item in self.items), 0.0)
     
     def get_total_vials(self) -> int:
         """计算出库总小管数"""
-        total = 0
-        for item in self.items:
-            if isinstance(item, ADCMovementItem):
-                total += item.quantity
-            elif isinstance(item, dict):
-                total += item.get('quantity', 0)
-        return total
+        return sum(item.quantity for item in self.items)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCInbound:
     """ADC入库记录"""
     id: Optional[int] = None
@@ -214,25 +269,32 @@ class ADCInbound:
     created_at: Optional[datetime] = None     # 记录创建时间
     items: List[ADCMovementItem] = field(default_factory=list)  # 入库明细
     
+    def __post_init__(self):
+        """构造时统一将字典形式的明细转换为ADCMovementItem"""
+        self.items = [ADCMovementItem.from_dict(item) if isinstance(item, dict) else item
+                      for item in self.items]
+    
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        data = asdict(self)
-        if data.get('storage_date'):
-            data['storage_date'] = data['storage_date'].isoformat() if isinstance(data['storage_date'], datetime) else data['storage_date']
-        if data.get('created_at'):
-            data['created_at'] = data['created_at'].isoformat() if isinstance(data['created_at'], datetime) else data['created_at']
-        return data
+        """转换为字典（逐字段构造，避免asdict的反射和深拷贝）"""
+        return {
+            'id': self.id,
+            'lot_number': self.lot_number,
+            'operator': self.operator,
+            'owner': self.owner,
+            'storage_position': self.storage_position,
+            'storage_date': _isoformat(self.storage_date),
+            'notes': self.notes,
+            'created_at': _isoformat(self.created_at),
+            'items': [item.to_dict() for item in self.items],
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ADCInbound':
         """从字典创建对象"""
-        if data.get('storage_date') and isinstance(data['storage_date'], str):
-            try:
-                data['storage_date'] = datetime.fromisoformat(data['storage_date'])
-            except ValueError:
-                data['storage_date'] = datetime.strptime(data['storage_date'], '%Y-%m-%d')
-        if data.get('created_at') and isinstance(data['created_at'], str):
-            data['created_at'] = datetime.fromisoformat(data['created_at'])
+        if data.get('storage_date'):
+            data['storage_date'] = _to_datetime(data['storage_date'])
+        if data.get('created_at'):
+            data['created_at'] = _to_datetime(data['created_at'])
         
         inbound_fields = {
             'id', 'lot_number', 'operator', 'owner', 'storage_position',
@@ -245,21 +307,9 @@ class ADCInbound:
     
     def get_total_mg(self) -> float:
         """计算入库总毫克数"""
-        total = 0.0
-        for item in self.items:
-            if isinstance(item, ADCMovementItem):
-                total += item.get_total_mg()
-            elif isinstance(item, dict):
-                total += item.get('spec_mg', 0) * item.get('quantity', 0)
-        return total
+        return sum((item.spec_mg * item.quantity for item in self.items), 0.0)
     
     def get_total_vials(self) -> int:
         """计算入库总小管数"""
-        total = 0
-        for item in self.items:
-            if isinstance(item, ADCMovementItem):
-                total += item.quantity
-            elif isinstance(item, dict):
-                total += item.get('quantity', 0)
-        return total
+        return sum(item.quantity for item in self.items)
 
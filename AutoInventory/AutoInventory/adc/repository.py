@@ -2,7 +2,8 @@
 ADC模块 - 数据库操作层
 负责ADC相关表的数据库操作
 """
-from typing import List, Dict, Any, Optional
+import sqlite3
+from typing import List, Dict, Any, Optional, Tuple
 
 
 def init_adc_tables(cursor):
@@ -25,15 +26,16 @@ def init_adc_tables(cursor):
         )
     ''')
     
-    # 为现有表添加新列（如果不存在）
-    try:
-        cursor.execute('ALTER TABLE adc ADD COLUMN antibody TEXT DEFAULT ""')
-    except:
-        pass  # 列已存在
-    try:
-        cursor.execute('ALTER TABLE adc ADD COLUMN linker_payload TEXT DEFAULT ""')
-    except:
-        pass  # 列已存在
+    # 兼容旧表：缺少新列时追加（先查询已有列，不再靠ALTER失败判断）
+    cursor.execute("PRAGMA table_info(adc)")
+    existing_cols = [row[1] for row in cursor.fetchall()]
+    for col, defn in [
+        ("antibody", "TEXT DEFAULT ''"),
+        ("linker_payload", "TEXT DEFAULT ''"),
+    ]:
+        if col not in existing_cols:
+            cursor.execute("ALTER TABLE adc ADD COLUMN %s %s" % (col, defn))
+            existing_cols.append(col)
     
     # 创建ADC规格库存表
     cursor.execute('''
@@ -52,6 +54,14 @@ def init_adc_tables(cursor):
         CREATE INDEX IF NOT EXISTS idx_adc_sample_id ON adc (sample_id)
     ''')
     
+    # 规格按adc_id查询/级联删除、ADC列表按created_at排序（lot_number已有UNIQUE索引）
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adc_specs_adc_id ON adc_specs (adc_id, spec_mg)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adc_created_at ON adc (created_at)
+    ''')
+    
     # ==================== 出入库相关表 ====================
     
     # 创建出库记录表
@@ -111,13 +121,121 @@ def init_adc_tables(cursor):
     cursor.execute('''
         CREATE INDEX IF NOT EXISTS idx_adc_inbound_lot ON adc_inbound (lot_number)
     ''')
+    
+    # 出入库记录lot_number的子串搜索索引（FTS5 trigram）
+    _init_lot_number_fts(cursor, 'adc_outbound')
+    _init_lot_number_fts(cursor, 'adc_inbound')
+    
+    # 明细按所属记录查询，记录按created_at排序
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adc_outbound_items_outbound_id ON adc_outbound_items (outbound_id, spec_mg)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adc_inbound_items_inbound_id ON adc_inbound_items (inbound_id, spec_mg)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adc_outbound_created_at ON adc_outbound (created_at)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_adc_inbound_created_at ON adc_inbound (created_at)
+    ''')
+
+
+def _init_lot_number_fts(cursor, table: str):
+    """
+    为出入库表的lot_number建立FTS5 trigram外部内容索引，并用触发器与原表同步
+    trigram表上的 LIKE '%x%' 可以走索引；SQLite不支持FTS5/trigram（3.34以下）时跳过，搜索退回全表扫描
+    """
+    fts_table = f"{table}_fts"
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (fts_table,))
+    if cursor.fetchone():
+        return
+    try:
+        cursor.execute(f'''
+            CREATE VIRTUAL TABLE {fts_table} USING fts5(
+                lot_number, content='{table}', content_rowid='id', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError:
+        return
+    
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table}(rowid, lot_number) VALUES (new.id, new.lot_number);
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, lot_number) VALUES ('delete', old.id, old.lot_number);
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF lot_number ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, lot_number) VALUES ('delete', old.id, old.lot_number);
+            INSERT INTO {fts_table}(rowid, lot_number) VALUES (new.id, new.lot_number);
+        END
+    ''')
+    # 为已有记录建立索引
+    cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
 
 
 class ADCRepository:
     """ADC数据仓库"""
     
+    INSERT_ADC_SQL = (
+        "INSERT INTO adc (lot_number, sample_id, description, concentration, "
+        "owner, storage_temp, storage_position, antibody, linker_payload) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    # 出入库写入语句（单条写入与事务批量写入共用同一SQL文本）
+    INSERT_OUTBOUND_SQL = (
+        "INSERT INTO adc_outbound (lot_number, requester, operator, shipping_address, shipping_date, notes) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    INSERT_OUTBOUND_ITEM_SQL = "INSERT INTO adc_outbound_items (outbound_id, spec_mg, quantity) VALUES (?, ?, ?)"
+    INSERT_INBOUND_SQL = (
+        "INSERT INTO adc_inbound (lot_number, operator, owner, storage_position, storage_date, notes) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    INSERT_INBOUND_ITEM_SQL = "INSERT INTO adc_inbound_items (inbound_id, spec_mg, quantity) VALUES (?, ?, ?)"
+    INSERT_SPEC_SQL = "INSERT INTO adc_specs (adc_id, spec_mg, quantity) VALUES (?, ?, ?)"
+    DECREASE_SPEC_SQL = "UPDATE adc_specs SET quantity = quantity - ? WHERE id = ? AND quantity >= ?"
+    # 同一ADC可能有多行相同spec_mg的规格，只累加到其中id最小的一行（与逐条查找时取第一条一致）
+    INCREASE_SPEC_BY_MG_SQL = (
+        "UPDATE adc_specs SET quantity = quantity + ? WHERE id = "
+        "(SELECT id FROM adc_specs WHERE adc_id = ? AND spec_mg = ? ORDER BY id LIMIT 1)"
+    )
+    INCREASE_SPEC_SQL = "UPDATE adc_specs SET quantity = quantity + ? WHERE id = ?"
+    UPDATE_SPEC_SQL = "UPDATE adc_specs SET spec_mg=?, quantity=? WHERE id=?"
+    UPDATE_SPEC_QUANTITY_SQL = "UPDATE adc_specs SET quantity=? WHERE id=?"
+    DELETE_SPEC_SQL = "DELETE FROM adc_specs WHERE id = ?"
+    # 规格不存在时补建数量为0的规格行（随后由INCREASE_SPEC_BY_MG_SQL累加），两者都走(adc_id, spec_mg)索引
+    INSERT_MISSING_SPEC_SQL = (
+        "INSERT INTO adc_specs (adc_id, spec_mg, quantity) SELECT ?, ?, 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM adc_specs WHERE adc_id = ? AND spec_mg = ?)"
+    )
+    
+    # 单行读取语句（热点查询，类级常量保证每次调用的SQL文本一致，连接上的预编译语句缓存直接命中）
+    GET_ADC_BY_ID_SQL = "SELECT * FROM adc WHERE id = ?"
+    GET_SPEC_BY_ID_SQL = "SELECT * FROM adc_specs WHERE id = ?"
+    GET_SPECS_BY_ADC_ID_SQL = "SELECT * FROM adc_specs WHERE adc_id = ? ORDER BY spec_mg"
+    GET_SPEC_BY_ADC_AND_MG_SQL = "SELECT * FROM adc_specs WHERE adc_id = ? AND spec_mg = ?"
+    
     def __init__(self, db_manager):
         self.db = db_manager
+        self._has_lot_fts = None  # 出入库lot_number的trigram索引是否存在（首次搜索时检查）
+    
+    def _lot_number_filter(self, table: str, id_column: str, lot_column: str) -> str:
+        """lot_number子串匹配的WHERE条件：有trigram索引时通过FTS5查找rowid，否则直接LIKE"""
+        if self._has_lot_fts is None:
+            rows = self.db.execute_query(
+                "SELECT name FROM sqlite_master WHERE type='table' "
+                "AND name IN ('adc_outbound_fts', 'adc_inbound_fts')"
+            )
+            self._has_lot_fts = len(rows) == 2
+        if self._has_lot_fts:
+            return f"{id_column} IN (SELECT rowid FROM {table}_fts WHERE lot_number LIKE ?)"
+        return f"{lot_column} LIKE ?"
     
     # ==================== ADC CRUD ====================
     
@@ -126,32 +244,74 @@ class ADCRepository:
                    storage_temp: str = "", storage_position: str = "",
                    antibody: str = "", linker_payload: str = "") -> int:
         """创建ADC记录"""
-        query = '''
-            INSERT INTO adc (lot_number, sample_id, description, concentration, 
-                           owner, storage_temp, storage_position, antibody, linker_payload)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        '''
-        return self.db.execute_insert(query, (
+        return self.db.execute_insert(self.INSERT_ADC_SQL, (
             lot_number, sample_id, description, concentration,
             owner, storage_temp, storage_position, antibody, linker_payload
         ))
     
+    def create_adc_with_specs(self, lot_number: str, sample_id: str, description: str,
+                              concentration: float, owner: str, storage_temp: str,
+                              storage_position: str, antibody: str, linker_payload: str,
+                              specs: List[Tuple[float, int]]) -> int:
+        """
+        在同一事务中创建ADC记录并批量写入规格，返回ADC ID
+        specs: [(spec_mg, quantity)]
+        """
+        def _do_create(cursor):
+            cursor.execute(self.INSERT_ADC_SQL, (
+                lot_number, sample_id, description, concentration,
+                owner, storage_temp, storage_position, antibody, linker_payload
+            ))
+            adc_id = cursor.lastrowid
+            cursor.executemany(
+                self.INSERT_SPEC_SQL,
+                [(adc_id, spec_mg, quantity) for spec_mg, quantity in specs]
+            )
+            return adc_id
+        
+        return self.db.with_connection(_do_create)
+    
     def get_adc_by_id(self, adc_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取ADC"""
-        query = "SELECT * FROM adc WHERE id = ?"
-        results = self.db.execute_query(query, (adc_id,))
+        results = self.db.execute_query(self.GET_ADC_BY_ID_SQL, (adc_id,))
         return results[0] if results else None
     
+    def get_adc_with_specs(self, adc_id: int) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """
+        一次LEFT JOIN查询获取ADC及其规格，返回(ADC行, 规格行列表)，ADC不存在时返回None
+        规格列以spec_前缀取出，规格按spec_mg排序（与get_specs_by_adc_id一致）
+        """
+        query = '''
+            SELECT a.*, s.id AS spec_id, s.spec_mg AS spec_mg,
+                   s.quantity AS spec_quantity, s.created_at AS spec_created_at
+            FROM adc a
+            LEFT JOIN adc_specs s ON s.adc_id = a.id
+            WHERE a.id = ?
+            ORDER BY s.spec_mg
+        '''
+        rows = self.db.execute_query(query, (adc_id,))
+        if not rows:
+            return None
+        
+        spec_columns = ('spec_id', 'spec_mg', 'spec_quantity', 'spec_created_at')
+        adc_row = {k: v for k, v in rows[0].items() if k not in spec_columns}
+        spec_rows = [
+            {'id': row['spec_id'], 'adc_id': adc_id, 'spec_mg': row['spec_mg'],
+             'quantity': row['spec_quantity'], 'created_at': row['spec_created_at']}
+            for row in rows if row['spec_id'] is not None
+        ]
+        return adc_row, spec_rows
+    
     def get_adc_by_lot_number(self, lot_number: str) -> Optional[Dict[str, Any]]:
         """根据Lot Number获取ADC"""
         query = "SELECT * FROM adc WHERE lot_number = ?"
         results = self.db.execute_query(query, (lot_number,))
         return results[0] if results else None
     
-    def get_all_adcs(self) -> List[Dict[str, Any]]:
-        """获取所有ADC"""
-        query = "SELECT * FROM adc ORDER BY created_at DESC"
-        return self.db.execute_query(query)
+    def get_all_adcs(self) -> List[sqlite3.Row]:
+        """获取所有ADC（返回sqlite3.Row，由调用方直接构造模型）"""
+        query = "SELECT * FROM adc ORDER BY created_at DESC, id DESC"
+        return self.db.execute_query_rows(query)
     
     def search_by_sample_id(self, sample_id: str) -> List[Dict[str, Any]]:
         """根据SampleID搜索ADC（模糊匹配）"""
@@ -196,41 +356,56 @@ class ADCRepository:
     
     def add_spec(self, adc_id: int, spec_mg: float, quantity: int) -> int:
         """添加规格"""
-        query = '''
-            INSERT INTO adc_specs (adc_id, spec_mg, quantity)
-            VALUES (?, ?, ?)
-        '''
-        return self.db.execute_insert(query, (adc_id, spec_mg, quantity))
+        return self.db.execute_insert(self.INSERT_SPEC_SQL, (adc_id, spec_mg, quantity))
     
     def get_specs_by_adc_id(self, adc_id: int) -> List[Dict[str, Any]]:
         """获取ADC的所有规格"""
-        query = "SELECT * FROM adc_specs WHERE adc_id = ? ORDER BY spec_mg"
-        return self.db.execute_query(query, (adc_id,))
+        return self.db.execute_query(self.GET_SPECS_BY_ADC_ID_SQL, (adc_id,))
+    
+    def get_all_specs(self) -> List[sqlite3.Row]:
+        """获取所有ADC的规格（一次查询，按adc_id、spec_mg排序，返回sqlite3.Row）"""
+        query = "SELECT * FROM adc_specs ORDER BY adc_id, spec_mg"
+        return self.db.execute_query_rows(query)
     
     def get_spec_by_id(self, spec_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取规格"""
-        query = "SELECT * FROM adc_specs WHERE id = ?"
-        results = self.db.execute_query(query, (spec_id,))
+        results = self.db.execute_query(self.GET_SPEC_BY_ID_SQL, (spec_id,))
         return results[0] if results else None
     
     def update_spec(self, spec_id: int, spec_mg: float, quantity: int) -> bool:
         """更新规格"""
-        query = "UPDATE adc_specs SET spec_mg=?, quantity=? WHERE id=?"
-        affected = self.db.execute_update(query, (spec_mg, quantity, spec_id))
+        affected = self.db.execute_update(self.UPDATE_SPEC_SQL, (spec_mg, quantity, spec_id))
         return affected > 0
     
     def update_spec_quantity(self, spec_id: int, quantity: int) -> bool:
         """更新规格库存量"""
-        query = "UPDATE adc_specs SET quantity=? WHERE id=?"
-        affected = self.db.execute_update(query, (quantity, spec_id))
+        affected = self.db.execute_update(self.UPDATE_SPEC_QUANTITY_SQL, (quantity, spec_id))
         return affected > 0
     
     def delete_spec(self, spec_id: int) -> bool:
         """删除规格"""
-        query = "DELETE FROM adc_specs WHERE id = ?"
-        affected = self.db.execute_update(query, (spec_id,))
+        affected = self.db.execute_update(self.DELETE_SPEC_SQL, (spec_id,))
         return affected > 0
     
+    def apply_spec_changes(self, adc_id: int, inserts: List[Tuple[float, int]],
+                           updates: List[Tuple[float, int, int]], deletes: List[int]):
+        """
+        在同一事务中批量写入规格差异
+        inserts: [(spec_mg, quantity)]；updates: [(spec_mg, quantity, spec_id)]；deletes: [spec_id]
+        """
+        if not (inserts or updates or deletes):
+            return
+        
+        def _do_apply(cursor):
+            cursor.executemany(self.DELETE_SPEC_SQL, [(spec_id,) for spec_id in deletes])
+            cursor.executemany(self.UPDATE_SPEC_SQL, updates)
+            cursor.executemany(
+                self.INSERT_SPEC_SQL,
+                [(adc_id, spec_mg, quantity) for spec_mg, quantity in inserts]
+            )
+        
+        self.db.with_connection(_do_apply)
+    
     def delete_specs_by_adc_id(self, adc_id: int) -> bool:
         """删除ADC的所有规格"""
         query = "DELETE FROM adc_specs WHERE adc_id = ?"
@@ -260,21 +435,13 @@ class ADCRepository:
     def create_outbound(self, lot_number: str, requester: str, operator: str,
                        shipping_address: str, shipping_date: str, notes: str = "") -> int:
         """创建出库记录"""
-        query = '''
-            INSERT INTO adc_outbound (lot_number, requester, operator, shipping_address, shipping_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-        '''
-        return self.db.execute_insert(query, (
+        return self.db.execute_insert(self.INSERT_OUTBOUND_SQL, (
             lot_number, requester, operator, shipping_address, shipping_date, notes
         ))
     
     def add_outbound_item(self, outbound_id: int, spec_mg: float, quantity: int) -> int:
         """添加出库明细"""
-        query = '''
-            INSERT INTO adc_outbound_items (outbound_id, spec_mg, quantity)
-            VALUES (?, ?, ?)
-        '''
-        return self.db.execute_insert(query, (outbound_id, spec_mg, quantity))
+        return self.db.execute_insert(self.INSERT_OUTBOUND_ITEM_SQL, (outbound_id, spec_mg, quantity))
     
     def get_outbound_by_id(self, outbound_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取出库记录"""
@@ -287,14 +454,30 @@ class ADCRepository:
         query = "SELECT * FROM adc_outbound_items WHERE outbound_id = ? ORDER BY spec_mg"
         return self.db.execute_query(query, (outbound_id,))
     
+    def get_all_outbound_items(self) -> List[Dict[str, Any]]:
+        """获取全部出库明细（一次查询，由调用方按outbound_id分组）"""
+        query = "SELECT * FROM adc_outbound_items ORDER BY outbound_id, spec_mg"
+        return self.db.execute_query(query)
+    
+    def search_outbound_items_by_lot_number(self, lot_number: str) -> List[Dict[str, Any]]:
+        """根据LotNumber搜索出库记录的明细（一次查询）"""
+        query = f'''
+            SELECT i.* FROM adc_outbound_items i
+            JOIN adc_outbound m ON m.id = i.outbound_id
+            WHERE {self._lot_number_filter('adc_outbound', 'm.id', 'm.lot_number')}
+            ORDER BY i.outbound_id, i.spec_mg
+        '''
+        return self.db.execute_query(query, (f"%{lot_number}%",))
+    
     def get_all_outbounds(self) -> List[Dict[str, Any]]:
         """获取所有出库记录"""
-        query = "SELECT * FROM adc_outbound ORDER BY created_at DESC"
+        query = "SELECT * FROM adc_outbound ORDER BY created_at DESC, id DESC"
         return self.db.execute_query(query)
     
     def search_outbounds_by_lot_number(self, lot_number: str) -> List[Dict[str, Any]]:
         """根据LotNumber搜索出库记录"""
-        query = "SELECT * FROM adc_outbound WHERE lot_number LIKE ? ORDER BY created_at DESC"
+        query = (f"SELECT * FROM adc_outbound WHERE {self._lot_number_filter('adc_outbound', 'id', 'lot_number')} "
+                 "ORDER BY created_at DESC, id DESC")
         return self.db.execute_query(query, (f"%{lot_number}%",))
     
     def delete_outbound(self, outbound_id: int) -> bool:
@@ -308,21 +491,13 @@ class ADCRepository:
     def create_inbound(self, lot_number: str, operator: str, owner: str,
                       storage_position: str, storage_date: str, notes: str = "") -> int:
         """创建入库记录"""
-        query = '''
-            INSERT INTO adc_inbound (lot_number, operator, owner, storage_position, storage_date, notes)
-            VALUES (?, ?, ?, ?, ?, ?)
-        '''
-        return self.db.execute_insert(query, (
+        return self.db.execute_insert(self.INSERT_INBOUND_SQL, (
             lot_number, operator, owner, storage_position, storage_date, notes
         ))
     
     def add_inbound_item(self, inbound_id: int, spec_mg: float, quantity: int) -> int:
         """添加入库明细"""
-        query = '''
-            INSERT INTO adc_inbound_items (inbound_id, spec_mg, quantity)
-            VALUES (?, ?, ?)
-        '''
-        return self.db.execute_insert(query, (inbound_id, spec_mg, quantity))
+        return self.db.execute_insert(self.INSERT_INBOUND_ITEM_SQL, (inbound_id, spec_mg, quantity))
     
     def get_inbound_by_id(self, inbound_id: int) -> Optional[Dict[str, Any]]:
         """根据ID获取入库记录"""
@@ -335,14 +510,30 @@ class ADCRepository:
         query = "SELECT * FROM adc_inbound_items WHERE inbound_id = ? ORDER BY spec_mg"
         return self.db.execute_query(query, (inbound_id,))
     
+    def get_all_inbound_items(self) -> List[Dict[str, Any]]:
+        """获取全部入库明细（一次查询，由调用方按inbound_id分组）"""
+        query = "SELECT * FROM adc_inbound_items ORDER BY inbound_id, spec_mg"
+        return self.db.execute_query(query)
+    
+    def search_inbound_items_by_lot_number(self, lot_number: str) -> List[Dict[str, Any]]:
+        """根据LotNumber搜索入库记录的明细（一次查询）"""
+        query = f'''
+            SELECT i.* FROM adc_inbound_items i
+            JOIN adc_inbound m ON m.id = i.inbound_id
+            WHERE {self._lot_number_filter('adc_inbound', 'm.id', 'm.lot_number')}
+            ORDER BY i.inbound_id, i.spec_mg
+        '''
+        return self.db.execute_query(query, (f"%{lot_number}%",))
+    
     def get_all_inbounds(self) -> List[Dict[str, Any]]:
         """获取所有入库记录"""
-        query = "SELECT * FROM adc_inbound ORDER BY created_at DESC"
+        query = "SELECT * FROM adc_inbound ORDER BY created_at DESC, id DESC"
         return self.db.execute_query(query)
     
     def search_inbounds_by_lot_number(self, lot_number: str) -> List[Dict[str, Any]]:
         """根据LotNumber搜索入库记录"""
-        query = "SELECT * FROM adc_inbound WHERE lot_number LIKE ? ORDER BY created_at DESC"
+        query = (f"SELECT * FROM adc_inbound WHERE {self._lot_number_filter('adc_inbound', 'id', 'lot_number')} "
+                 "ORDER BY created_at DESC, id DESC")
         return self.db.execute_query(query, (f"%{lot_number}%",))
     
     def delete_inbound(self, inbound_id: int) -> bool:
@@ -351,23 +542,114 @@ class ADCRepository:
         affected = self.db.execute_update(query, (inbound_id,))
         return affected > 0
     
+    # ==================== 出入库事务写入 ====================
+    
+    def create_outbound_with_items(self, lot_number: str, requester: str, operator: str,
+                                   shipping_address: str, shipping_date: str, notes: str,
+                                   items: List[Tuple[float, int]],
+                                   decrements: List[Tuple[int, int]]) -> int:
+        """
+        在同一事务中创建出库记录、写入明细并扣减库存，返回出库ID
+        items: [(spec_mg, quantity)]；decrements: [(spec_id, quantity)]
+        """
+        def _decrease(cursor):
+            cursor.executemany(
+                self.DECREASE_SPEC_SQL,
+                [(quantity, spec_id, quantity) for spec_id, quantity in decrements]
+            )
+            # 每条扣减按id只影响一行；库存不足的条件UPDATE影响0行，此时抛出异常回滚整个出库
+            if cursor.rowcount != len(decrements):
+                raise ValueError("库存不足（可能已被其他出库占用），请刷新后重试")
+        
+        return self._create_movement_with_items(
+            self.INSERT_OUTBOUND_SQL,
+            (lot_number, requester, operator, shipping_address, shipping_date, notes),
+            self.INSERT_OUTBOUND_ITEM_SQL, items, _decrease
+        )
+    
+    def create_inbound_with_items(self, adc_id: int, lot_number: str, operator: str, owner: str,
+                                  storage_position: str, storage_date: str, notes: str,
+                                  items: List[Tuple[float, int]]) -> int:
+        """
+        在同一事务中创建入库记录、写入明细并增加库存（规格不存在时新建），返回入库ID
+        items: [(spec_mg, quantity)]
+        """
+        def _increase(cursor):
+            # 先补建缺失的规格，再统一累加，两步都是一次executemany
+            cursor.executemany(
+                self.INSERT_MISSING_SPEC_SQL,
+                [(adc_id, spec_mg, adc_id, spec_mg) for spec_mg, _ in items]
+            )
+            cursor.executemany(
+                self.INCREASE_SPEC_BY_MG_SQL,
+                [(quantity, adc_id, spec_mg) for spec_mg, quantity in items]
+            )
+        
+        return self._create_movement_with_items(
+            self.INSERT_INBOUND_SQL,
+            (lot_number, operator, owner, storage_position, storage_date, notes),
+            self.INSERT_INBOUND_ITEM_SQL, items, _increase
+        )
+    
+    def _create_movement_with_items(self, header_sql: str, header_params: tuple,
+                                    item_sql: str, items: List[Tuple[float, int]],
+                                    adjust_stock) -> int:
+        """出入库共用的事务写入：记录 -> 明细（executemany） -> adjust_stock(cursor)"""
+        def _do_create(cursor):
+            cursor.execute(header_sql, header_params)
+            movement_id = cursor.lastrowid
+            cursor.executemany(
+                item_sql,
+                [(movement_id, spec_mg, quantity) for spec_mg, quantity in items]
+            )
+            adjust_stock(cursor)
+            return movement_id
+        
+        return self.db.with_connection(_do_create)
+    
+    # ==================== 出入库混合查询 ====================
+    
+    # 出库/入库两表合并为同一组列（另一方独有的列补NULL），由SQLite排序
+    MOVEMENTS_UNION_SQL = '''
+        SELECT 'outbound' AS type, id, lot_number, operator, shipping_date AS date,
+               created_at, notes, requester, shipping_address,
+               NULL AS owner, NULL AS storage_position
+        FROM adc_outbound {outbound_where}
+        UNION ALL
+        SELECT 'inbound' AS type, id, lot_number, operator, storage_date AS date,
+               created_at, notes, NULL, NULL, owner, storage_position
+        FROM adc_inbound {inbound_where}
+        ORDER BY created_at DESC, type DESC, id DESC
+    '''
+    
+    def get_all_movements_union(self) -> List[Dict[str, Any]]:
+        """获取所有出入库记录（一次UNION ALL查询，按创建时间倒序，同一时间出库在前）"""
+        query = self.MOVEMENTS_UNION_SQL.format(outbound_where="", inbound_where="")
+        return self.db.execute_query(query)
+    
+    def search_movements_union(self, lot_number: str) -> List[Dict[str, Any]]:
+        """根据LotNumber搜索出入库记录（一次UNION ALL查询）"""
+        query = self.MOVEMENTS_UNION_SQL.format(
+            outbound_where="WHERE " + self._lot_number_filter('adc_outbound', 'id', 'lot_number'),
+            inbound_where="WHERE " + self._lot_number_filter('adc_inbound', 'id', 'lot_number')
+        )
+        pattern = f"%{lot_number}%"
+        return self.db.execute_query(query, (pattern, pattern))
+    
     # ==================== 库存更新 ====================
     
     def get_spec_by_adc_and_mg(self, adc_id: int, spec_mg: float) -> Optional[Dict[str, Any]]:
         """根据ADC ID和规格获取规格记录"""
-        query = "SELECT * FROM adc_specs WHERE adc_id = ? AND spec_mg = ?"
-        results = self.db.execute_query(query, (adc_id, spec_mg))
+        results = self.db.execute_query(self.GET_SPEC_BY_ADC_AND_MG_SQL, (adc_id, spec_mg))
         return results[0] if results else None
     
     def increase_spec_quantity(self, spec_id: int, delta: int) -> bool:
         """增加规格库存量"""
-        query = "UPDATE adc_specs SET quantity = quantity + ? WHERE id = ?"
-        affected = self.db.execute_update(query, (delta, spec_id))
+        affected = self.db.execute_update(self.INCREASE_SPEC_SQL, (delta, spec_id))
         return affected > 0
     
     def decrease_spec_quantity(self, spec_id: int, delta: int) -> bool:
         """减少规格库存量"""
-        query = "UPDATE adc_specs SET quantity = quantity - ? WHERE id = ? AND quantity >= ?"
-        affected = self.db.execute_update(query, (delta, spec_id, delta))
+        affected = self.db.execute_update(self.DECREASE_SPEC_SQL, (delta, spec_id, delta))
         return affected > 0
 
@@ -9,7 +9,6 @@ from .models import (
     ADCWorkflowStep,
     ADCExperimentResult,
 )
-from .controller import ADCWorkflowController
 
 __all__ = [
     "AppUser",
@@ -19,3 +18,11 @@ __all__ = [
     "ADCExperimentResult",
     "ADCWorkflowController",
 ]
+
+
+def __getattr__(name):
+    """ADCWorkflowController按需导入：只用到repository/models时（如数据库初始化）不加载控制器及其依赖"""
+    if name == "ADCWorkflowController":
+        from .controller import ADCWorkflowController
+        return ADCWorkflowController
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
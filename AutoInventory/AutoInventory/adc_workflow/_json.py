@@ -0,0 +1,28 @@
+"""
+ADC实验流程模块 - JSON 编解码
+- dumps 始终使用标准库 json（ensure_ascii=False，返回 str），写入数据库的文本与是否安装 orjson 无关；
+  编码只发生在导入时，不是热点
+- loads 在安装了 orjson（C 实现）时使用 orjson，否则使用标准库 json，两者解析结果一致；
+  orjson 拒绝解析的文本（旧数据中的 NaN/Infinity 等）自动改用标准库 json 解析
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False)
+
+
+if orjson is not None:
+    def loads(text: str) -> Any:
+        try:
+            return orjson.loads(text)
+        except ValueError:
+            return json.loads(text)
+else:
+    loads = json.loads
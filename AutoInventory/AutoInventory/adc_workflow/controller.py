@@ -2,8 +2,11 @@
 ADC实验流程模块 - 控制器层
 导入 xlsx、工作流/步骤/实验结果 CRUD、权限判断、投料表数据生成
 """
-import json
-from typing import List, Optional, Dict, Any, Tuple
+import re
+import time
+from collections import defaultdict
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Tuple, Mapping
 
 from .models import (
     AppUser,
@@ -20,14 +23,25 @@ from .repository import (
 )
 from .request_schema import ordered_request_items, coerce_request_values
 from . import sp_dar8
+from ._json import dumps as json_dumps
+
+
+# 纯化流程字符串 "Zeba + new Charcoal" 中的步骤名：以 "+" 分隔、去掉首尾空白，名称内部的空格保留
+_FLOW_STEP_RE = re.compile(r"[^+\s](?:[^+]*[^+\s])?")
 
 
 class ADCWorkflowController:
     """ADC 实验流程控制器"""
 
+    # 步骤类型名称/id 映射的缓存有效期（秒）；步骤类型很少变动，其它进程的修改最多延迟这么久生效
+    STEP_TYPE_CACHE_TTL = 30.0
+
     def __init__(self, db_manager):
         self.db = db_manager
         self.repo = ADCWorkflowRepository(db_manager)
+        self._step_type_cache: Optional[Tuple[Mapping[str, int], Mapping[int, str]]] = None
+        self._step_type_cache_ts = 0.0
+        self._step_type_cache_version = -1  # 构建缓存时仓库的 step_type_version
 
     def get_all_users(self) -> List[AppUser]:
         rows = self.repo.get_all_users()
@@ -45,6 +59,33 @@ class ADCWorkflowController:
         r = self.repo.get_step_type_by_name(name)
         return PurificationStepType.from_dict(r) if r else None
 
+    def invalidate_step_type_cache(self):
+        """清除名称/id 映射缓存（如直接改动了数据库中的步骤类型），下次使用时重新查询"""
+        self._step_type_cache = None
+
+    def _step_type_maps(self) -> Tuple[Mapping[str, int], Mapping[int, str]]:
+        """
+        返回 (名称 -> id, id -> 名称) 映射（含已停用的类型）
+        缓存在控制器上；通过本仓库写入步骤类型后立即失效，其它进程的修改在 STEP_TYPE_CACHE_TTL 后生效；
+        返回的映射为只读的 MappingProxyType，多个调用方共享同一份缓存
+        """
+        now = time.monotonic()
+        cache = self._step_type_cache
+        version = self.repo.step_type_version
+        if (cache is None or version != self._step_type_cache_version
+                or now - self._step_type_cache_ts > self.STEP_TYPE_CACHE_TTL):
+            rows = self.repo.get_all_step_types(active_only=False)
+            cache = (MappingProxyType({t["name"]: t["id"] for t in rows}),
+                     MappingProxyType({t["id"]: t["name"] for t in rows}))
+            self._step_type_cache = cache
+            self._step_type_cache_ts = now
+            self._step_type_cache_version = version
+        return cache
+
+    def get_step_type_id_to_name(self) -> Mapping[int, str]:
+        """步骤类型 id -> 名称（含已停用的类型），只读"""
+        return self._step_type_maps()[1]
+
     def can_edit_workflow(self, workflow: ADCWorkflow, current_user_id: int, current_user_role: str) -> bool:
         """实验员只能编辑自己的，leader 可编辑全部"""
         if current_user_role == ROLE_LEADER:
@@ -64,10 +105,14 @@ class ADCWorkflowController:
             rows = self.repo.get_all_workflows()
         else:
             rows = self.repo.get_all_workflows(created_by_user_id=current_user_id)
+        # 所有 workflow 的步骤一次查出，再按 workflow_id 分组
+        steps_by_wf = defaultdict(list)
+        for s in self.repo.get_steps_by_workflow_ids([r["id"] for r in rows]):
+            steps_by_wf[s["workflow_id"]].append(ADCWorkflowStep.from_dict(s))
         out = []
         for r in rows:
             w = ADCWorkflow.from_dict(r)
-            w.steps = [ADCWorkflowStep.from_dict(s) for s in self.repo.get_steps_by_workflow_id(w.id)]
+            w.steps = steps_by_wf.get(w.id, [])
             out.append(w)
         return out
 
@@ -86,7 +131,8 @@ class ADCWorkflowController:
         """
         try:
             import openpyxl
-            wb = openpyxl.load_workbook(xlsx_path, data_only=True)
+            # 只读模式流式解析，不在内存中构建整个工作簿
+            wb = openpyxl.load_workbook(xlsx_path, data_only=True, read_only=True)
         except Exception as e:
             return False, f"打开文件失败: {e}", []
 
@@ -98,11 +144,13 @@ class ADCWorkflowController:
         if not sheets_data:
             return False, "未解析到任何有效数据（请确认文件为 B/C 或 C/D 键值对格式）", []
 
+        # 步骤类型名称 -> id，整个导入只取一次
+        type_name_to_id = self._step_type_maps()[0]
         created_ids = []
         for kv in sheets_data:
             sheet_name = kv.pop("_sheet_name", "")
             coerced = coerce_request_values(kv)
-            raw_json = json.dumps(coerced, ensure_ascii=False)
+            raw_json = json_dumps(coerced)
             purification_flow = coerced.get(PURIFICATION_METHOD_KEY) or coerced.get("Purification method")
             if not isinstance(purification_flow, str):
                 purification_flow = str(purification_flow).strip() if purification_flow is not None else ""
@@ -127,28 +175,29 @@ class ADCWorkflowController:
 
             # 解析纯化步骤流程 "Zeba+Amicon" -> 按顺序创建 step
             if purification_flow:
-                step_names = [s.strip() for s in purification_flow.split("+") if s.strip()]
-                type_name_to_id = {}
-                for t in self.repo.get_all_step_types(active_only=False):
-                    type_name_to_id[t["name"]] = t["id"]
+                step_names = _FLOW_STEP_RE.findall(purification_flow)
+                steps = []
                 for order, name in enumerate(step_names):
-                    type_row = self.repo.get_step_type_by_name(name)
-                    if type_row:
-                        self.repo.add_workflow_step(wf_id, type_row["id"], order, "{}")
+                    tid = type_name_to_id.get(name)
+                    if tid is not None:
+                        steps.append((tid, order, "{}"))
+                if steps:
+                    self.repo.add_workflow_steps(wf_id, steps)
 
         return True, f"成功导入 {len(created_ids)} 条实验流程", created_ids
 
     def update_workflow_steps(self, workflow_id: int, step_type_names: List[str]) -> bool:
-        """用步骤类型名称列表覆盖该 workflow 的步骤（先删后加）"""
-        self.repo.delete_steps_by_workflow_id(workflow_id)
-        type_name_to_id = {t["name"]: t["id"] for t in self.repo.get_all_step_types(active_only=False)}
+        """用步骤类型名称列表覆盖该 workflow 的步骤（先删后加，同一事务内完成）"""
+        type_name_to_id = self._step_type_maps()[0]
+        steps = []
         for order, name in enumerate(step_type_names):
             name = name.strip()
             if not name:
                 continue
             tid = type_name_to_id.get(name)
             if tid is not None:
-                self.repo.add_workflow_step(workflow_id, tid, order, "{}")
+                steps.append((tid, order, "{}"))
+        self.repo.add_workflow_steps(workflow_id, steps, replace=True)
         return True
 
     def update_workflow_purification_string(self, workflow_id: int, purification_flow_string: str) -> bool:
@@ -162,17 +211,14 @@ class ADCWorkflowController:
         w = self.get_workflow_by_id(workflow_id)
         if not w:
             return None
-        try:
-            raw = json.loads(w.raw_request_json) if w.raw_request_json else {}
-        except Exception:
-            raw = {}
-        type_id_to_name = {t["id"]: t["name"] for t in self.repo.get_all_step_types(active_only=False)}
+        raw = w.raw_request
+        type_id_to_name = self._step_type_maps()[1]
         steps = []
         for s in w.steps:
             steps.append({
                 "order": s.step_order,
                 "type_name": type_id_to_name.get(s.step_type_id, ""),
-                "params": json.loads(s.params_json) if s.params_json else {},
+                "params": s.params,
             })
         return {
             "workflow_id": w.id,
@@ -194,10 +240,7 @@ class ADCWorkflowController:
         w = self.get_workflow_by_id(workflow_id)
         if not w:
             return None
-        try:
-            raw = json.loads(w.raw_request_json) if w.raw_request_json else {}
-        except Exception:
-            raw = {}
+        raw = w.raw_request
         dar8_inputs = sp_dar8.build_dar8_inputs_from_request(raw)
         return {
             "workflow_id": w.id,
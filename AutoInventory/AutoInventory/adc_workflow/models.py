@@ -2,9 +2,42 @@
 ADC实验流程模块 - 数据模型
 定义用户、纯化步骤类型、工作流、工作流步骤、实验结果
 """
-from dataclasses import dataclass, asdict, field
-from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Mapping, Tuple
+import sys
 from datetime import datetime
+from types import MappingProxyType
+
+from ._json import loads as json_loads
+
+
+# Python 3.10+ 使用 __slots__：实例不再带 __dict__，内存更省、属性访问更快
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _to_datetime(value: Any) -> Any:
+    """数据库时间字段转为datetime：非空字符串按ISO格式解析，其它值（datetime、None、空串）原样返回"""
+    if value and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def _parse_json_cached(text: str, cache: Optional[Tuple[str, Mapping[str, Any]]]) -> Tuple[str, Mapping[str, Any]]:
+    """
+    解析 JSON 对象文本并返回 (原文本, 只读映射) 缓存项
+    缓存项的原文本与当前文本是同一对象时直接复用；字段被重新赋值后自动重新解析。
+    解析结果被多次返回，因此包装成 MappingProxyType，调用方无法改写缓存；
+    需要修改时请先 dict(...) 复制（嵌套的列表/字典同样不应修改）
+    """
+    if cache is not None and cache[0] is text:
+        return cache
+    try:
+        value = json_loads(text) if text else {}
+    except Exception:
+        value = {}
+    if not isinstance(value, dict):
+        value = {}
+    return text, MappingProxyType(value)
 
 
 # 角色枚举
@@ -12,35 +45,43 @@ ROLE_EXPERIMENTER = "实验员"
 ROLE_LEADER = "leader"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AppUser:
     """应用用户（实验员/leader）"""
+    # from_dict 接受的字段名（类属性，不是 dataclass 字段）
+    _FIELDS = frozenset(("id", "username", "role", "created_at"))
     id: Optional[int] = None
     username: str = ""
     role: str = ROLE_EXPERIMENTER
     created_at: Optional[datetime] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        if data.get("created_at"):
-            data["created_at"] = data["created_at"].isoformat()
-        return data
+        return {
+            "id": self.id,
+            "username": self.username,
+            "role": self.role,
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AppUser":
-        if data.get("created_at") and isinstance(data["created_at"], str):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-        fields = {"id", "username", "role", "created_at"}
-        filtered = {k: v for k, v in data.items() if k in fields}
+        filtered = {k: data[k] for k in cls._FIELDS if k in data}
+        if "created_at" in filtered:
+            filtered["created_at"] = _to_datetime(filtered["created_at"])
         return cls(**filtered)
 
     def is_leader(self) -> bool:
         return self.role == ROLE_LEADER
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PurificationStepType:
     """纯化步骤类型（Zeba/Amicon/G25 等）"""
+    # from_dict 接受的字段名（类属性，不是 dataclass 字段）
+    _FIELDS = frozenset((
+        "id", "name", "display_order", "is_active",
+        "param_schema", "schema_version", "created_at", "updated_at",
+    ))
     id: Optional[int] = None
     name: str = ""
     display_order: int = 0
@@ -51,53 +92,72 @@ class PurificationStepType:
     updated_at: Optional[datetime] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        for key in ("created_at", "updated_at"):
-            if data.get(key):
-                data[key] = data[key].isoformat()
-        return data
+        return {
+            "id": self.id,
+            "name": self.name,
+            "display_order": self.display_order,
+            "is_active": self.is_active,
+            "param_schema": self.param_schema,
+            "schema_version": self.schema_version,
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else self.updated_at,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "PurificationStepType":
+        filtered = {k: data[k] for k in cls._FIELDS if k in data}
         for key in ("created_at", "updated_at"):
-            if data.get(key) and isinstance(data[key], str):
-                data[key] = datetime.fromisoformat(data[key])
-        fields = {
-            "id", "name", "display_order", "is_active",
-            "param_schema", "schema_version", "created_at", "updated_at",
-        }
-        filtered = {k: v for k, v in data.items() if k in fields}
+            if key in filtered:
+                filtered[key] = _to_datetime(filtered[key])
         return cls(**filtered)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCWorkflowStep:
     """单次工作流中的纯化步骤实例"""
+    # from_dict 接受的字段名（类属性，不是 dataclass 字段）
+    _FIELDS = frozenset(("id", "workflow_id", "step_type_id", "step_order", "params_json", "created_at"))
     id: Optional[int] = None
     workflow_id: int = 0
     step_type_id: int = 0
     step_order: int = 0
     params_json: str = ""  # 该步骤参数 + Estimated recovery 等
     created_at: Optional[datetime] = None
+    # params_json 的解析缓存 (原文本, 解析结果)
+    _params_cache: Optional[Tuple[str, Mapping[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def params(self) -> Mapping[str, Any]:
+        """解析后的步骤参数（只读映射，解析失败时为空），同一 params_json 只解析一次"""
+        self._params_cache = _parse_json_cached(self.params_json, self._params_cache)
+        return self._params_cache[1]
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        if data.get("created_at"):
-            data["created_at"] = data["created_at"].isoformat()
-        return data
+        return {
+            "id": self.id,
+            "workflow_id": self.workflow_id,
+            "step_type_id": self.step_type_id,
+            "step_order": self.step_order,
+            "params_json": self.params_json,
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ADCWorkflowStep":
-        if data.get("created_at") and isinstance(data["created_at"], str):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-        fields = {"id", "workflow_id", "step_type_id", "step_order", "params_json", "created_at"}
-        filtered = {k: v for k, v in data.items() if k in fields}
+        filtered = {k: data[k] for k in cls._FIELDS if k in data}
+        if "created_at" in filtered:
+            filtered["created_at"] = _to_datetime(filtered["created_at"])
         return cls(**filtered)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCWorkflow:
     """ADC实验流程（单次 Request + 步骤）"""
+    # from_dict 接受的字段名（类属性，不是 dataclass 字段）
+    _FIELDS = frozenset((
+        "id", "request_sn", "raw_request_json", "purification_flow_string",
+        "created_by_user_id", "created_at", "updated_at", "steps",
+    ))
     id: Optional[int] = None
     request_sn: str = ""
     raw_request_json: str = ""
@@ -106,41 +166,50 @@ class ADCWorkflow:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     steps: List[ADCWorkflowStep] = field(default_factory=list)
+    # raw_request_json 的解析缓存 (原文本, 解析结果)
+    _raw_request_cache: Optional[Tuple[str, Mapping[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def raw_request(self) -> Mapping[str, Any]:
+        """解析后的 Request 键值对（只读映射，解析失败时为空），同一 raw_request_json 只解析一次"""
+        self._raw_request_cache = _parse_json_cached(self.raw_request_json, self._raw_request_cache)
+        return self._raw_request_cache[1]
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        for key in ("created_at", "updated_at"):
-            if data.get(key):
-                data[key] = data[key].isoformat()
-        if data.get("steps"):
-            data["steps"] = [
-                s if isinstance(s, dict) else s.to_dict() for s in data["steps"]
-            ]
-        return data
+        return {
+            "id": self.id,
+            "request_sn": self.request_sn,
+            "raw_request_json": self.raw_request_json,
+            "purification_flow_string": self.purification_flow_string,
+            "created_by_user_id": self.created_by_user_id,
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else self.updated_at,
+            "steps": [s if isinstance(s, dict) else s.to_dict() for s in self.steps],
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ADCWorkflow":
+        filtered = {k: data[k] for k in cls._FIELDS if k in data}
         for key in ("created_at", "updated_at"):
-            if data.get(key) and isinstance(data[key], str):
-                data[key] = datetime.fromisoformat(data[key])
-        if data.get("steps"):
-            data["steps"] = [
-                ADCWorkflowStep.from_dict(s) if isinstance(s, dict) else s
-                for s in data["steps"]
-            ]
-        fields = {
-            "id", "request_sn", "raw_request_json", "purification_flow_string",
-            "created_by_user_id", "created_at", "updated_at", "steps",
-        }
-        filtered = {k: v for k, v in data.items() if k in fields}
-        if "steps" not in filtered:
-            filtered["steps"] = []
+            if key in filtered:
+                filtered[key] = _to_datetime(filtered[key])
+        steps = filtered.get("steps")
+        filtered["steps"] = [
+            ADCWorkflowStep.from_dict(s) if isinstance(s, dict) else s
+            for s in steps
+        ] if steps else []
         return cls(**filtered)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ADCExperimentResult:
     """实验结果（单条）"""
+    # from_dict 接受的字段名（类属性，不是 dataclass 字段）
+    _FIELDS = frozenset((
+        "id", "workflow_id", "sample_id", "lot_no", "conc_mg_ml", "amount_mg",
+        "yield_pct", "ms_dar", "monomer_pct", "free_drug_pct", "endotoxin",
+        "aliquot", "purification_method", "created_at", "created_by_user_id",
+    ))
     id: Optional[int] = None
     workflow_id: int = 0
     sample_id: str = ""
@@ -158,19 +227,27 @@ class ADCExperimentResult:
     created_by_user_id: int = 0
 
     def to_dict(self) -> Dict[str, Any]:
-        data = asdict(self)
-        if data.get("created_at"):
-            data["created_at"] = data["created_at"].isoformat()
-        return data
+        return {
+            "id": self.id,
+            "workflow_id": self.workflow_id,
+            "sample_id": self.sample_id,
+            "lot_no": self.lot_no,
+            "conc_mg_ml": self.conc_mg_ml,
+            "amount_mg": self.amount_mg,
+            "yield_pct": self.yield_pct,
+            "ms_dar": self.ms_dar,
+            "monomer_pct": self.monomer_pct,
+            "free_drug_pct": self.free_drug_pct,
+            "endotoxin": self.endotoxin,
+            "aliquot": self.aliquot,
+            "purification_method": self.purification_method,
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+            "created_by_user_id": self.created_by_user_id,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ADCExperimentResult":
-        if data.get("created_at") and isinstance(data["created_at"], str):
-            data["created_at"] = datetime.fromisoformat(data["created_at"])
-        fields = {
-            "id", "workflow_id", "sample_id", "lot_no", "conc_mg_ml", "amount_mg",
-            "yield_pct", "ms_dar", "monomer_pct", "free_drug_pct", "endotoxin",
-            "aliquot", "purification_method", "created_at", "created_by_user_id",
-        }
-        filtered = {k: v for k, v in data.items() if k in fields}
+        filtered = {k: data[k] for k in cls._FIELDS if k in data}
+        if "created_at" in filtered:
+            filtered["created_at"] = _to_datetime(filtered["created_at"])
         return cls(**filtered)
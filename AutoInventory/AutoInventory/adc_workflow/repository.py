@@ -42,12 +42,13 @@ def _parse_sheet_key_value(ws) -> Dict[str, Any]:
     按 task_template 格式解析：B=名称、C=内容；或 B 为空时 C=名称、D=内容。
     仅 B 非空且 C 为空的行为分组标题，不产出键值对。
     返回键值对字典，键为名称（strip），值为内容（保持类型）。
+    按行顺序单次遍历 B~D 列（兼容 read_only 模式的流式工作表，不做随机单元格访问）。
     """
     result = {}
-    for r in range(1, ws.max_row + 1):
-        b_val = _decode_cell_string(ws.cell(r, 2).value)
-        c_val = _decode_cell_string(ws.cell(r, 3).value)
-        d_val = _decode_cell_string(ws.cell(r, 4).value) if ws.max_column >= 4 else None
+    for b_raw, c_raw, d_raw in ws.iter_rows(min_col=2, max_col=4, values_only=True):
+        b_val = _decode_cell_string(b_raw)
+        c_val = _decode_cell_string(c_raw)
+        d_val = _decode_cell_string(d_raw)
 
         # B 有值且 C 有值（或 C 为数字）-> (B, C)
         if b_val is not None and b_val != "":
@@ -73,6 +74,9 @@ def parse_workbook_key_value(wb) -> List[Dict[str, Any]]:
     sheets_data = []
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
+        if hasattr(ws, "reset_dimensions"):
+            # read_only 工作表的行列数取自文件内记录的尺寸，可能不准确；清除后按实际存在的行遍历
+            ws.reset_dimensions()
         kv = _parse_sheet_key_value(ws)
         if kv:
             kv["_sheet_name"] = sheet_name
@@ -204,8 +208,15 @@ def init_adc_workflow_tables(cursor):
 class ADCWorkflowRepository:
     """ADC 实验流程数据仓库"""
 
+    INSERT_STEP_SQL = """INSERT INTO adc_workflow_step (workflow_id, step_type_id, step_order, params_json)
+                         VALUES (?, ?, ?, ?)"""
+    # IN (...) 查询每批的参数个数上限（低于旧版 SQLite 的 999 个变量限制）
+    IN_BATCH_SIZE = 500
+
     def __init__(self, db_manager):
         self.db = db_manager
+        # 每次通过本仓库写入步骤类型后递增，控制器据此使步骤类型映射缓存失效
+        self.step_type_version = 0
 
     # ---------- AppUser ----------
     def get_all_users(self) -> List[Dict[str, Any]]:
@@ -233,11 +244,14 @@ class ADCWorkflowRepository:
         return r[0] if r else None
 
     def create_step_type(self, name: str, display_order: int = 0, param_schema: str = "") -> int:
-        return self.db.execute_insert(
-            """INSERT INTO purification_step_type (name, display_order, is_active, param_schema, schema_version)
-               VALUES (?, ?, 1, ?, 1)""",
-            (name.strip(), display_order, param_schema)
-        )
+        try:
+            return self.db.execute_insert(
+                """INSERT INTO purification_step_type (name, display_order, is_active, param_schema, schema_version)
+                   VALUES (?, ?, 1, ?, 1)""",
+                (name.strip(), display_order, param_schema)
+            )
+        finally:
+            self.step_type_version += 1
 
     def update_step_type(self, type_id: int, name: str = None, display_order: int = None,
                          is_active: bool = None, param_schema: str = None) -> bool:
@@ -260,10 +274,16 @@ class ADCWorkflowRepository:
         updates.append("updated_at = CURRENT_TIMESTAMP")
         params.append(type_id)
         q = "UPDATE purification_step_type SET " + ", ".join(updates) + " WHERE id = ?"
-        return self.db.execute_update(q, tuple(params)) > 0
+        try:
+            return self.db.execute_update(q, tuple(params)) > 0
+        finally:
+            self.step_type_version += 1
 
     def delete_step_type(self, type_id: int) -> bool:
-        return self.db.execute_update("DELETE FROM purification_step_type WHERE id = ?", (type_id,)) > 0
+        try:
+            return self.db.execute_update("DELETE FROM purification_step_type WHERE id = ?", (type_id,)) > 0
+        finally:
+            self.step_type_version += 1
 
     # ---------- ADCWorkflow ----------
     def create_workflow(self, request_sn: str, raw_request_json: str, purification_flow_string: str,
@@ -286,8 +306,13 @@ class ADCWorkflowRepository:
                        VALUES (?, ?, ?, ?)""",
                     (request_sn, raw_request_json, purification_flow_string, uid)
                 )
-                return cursor.lastrowid
+                workflow_id = cursor.lastrowid
+                # PRAGMA foreign_keys 在事务内不生效：先提交插入，再在事务外恢复外键校验
+                conn.commit()
+                return workflow_id
             finally:
+                if conn.in_transaction:
+                    conn.rollback()
                 conn.execute("PRAGMA foreign_keys=ON")
 
         return self.db.with_connection(_do_create)
@@ -330,17 +355,47 @@ class ADCWorkflowRepository:
     # ---------- ADCWorkflowStep ----------
     def add_workflow_step(self, workflow_id: int, step_type_id: int, step_order: int, params_json: str = "{}") -> int:
         return self.db.execute_insert(
-            """INSERT INTO adc_workflow_step (workflow_id, step_type_id, step_order, params_json)
-               VALUES (?, ?, ?, ?)""",
+            self.INSERT_STEP_SQL,
             (workflow_id, step_type_id, step_order, params_json or "{}")
         )
 
+    def add_workflow_steps(self, workflow_id: int, steps: List[Tuple[int, int, str]],
+                           replace: bool = False) -> int:
+        """
+        批量写入步骤，steps 为 (step_type_id, step_order, params_json) 列表
+        一次 executemany、一次提交；replace=True 时在同一事务内先删除该 workflow 的原有步骤
+        """
+        rows = [(workflow_id, tid, order, params_json or "{}") for tid, order, params_json in steps]
+
+        def _do_add(cursor):
+            if replace:
+                cursor.execute("DELETE FROM adc_workflow_step WHERE workflow_id = ?", (workflow_id,))
+            if rows:
+                cursor.executemany(self.INSERT_STEP_SQL, rows)
+            return len(rows)
+
+        return self.db.with_connection(_do_add)
+
     def get_steps_by_workflow_id(self, workflow_id: int) -> List[Dict[str, Any]]:
         return self.db.execute_query(
             "SELECT * FROM adc_workflow_step WHERE workflow_id = ? ORDER BY step_order, id",
             (workflow_id,)
         )
 
+    def get_steps_by_workflow_ids(self, workflow_ids: List[int]) -> List[Dict[str, Any]]:
+        """一次查询多个 workflow 的步骤（按 workflow_id、step_order 排序），ids 过多时分批 IN 查询"""
+        ids = list(workflow_ids)
+        out: List[Dict[str, Any]] = []
+        for start in range(0, len(ids), self.IN_BATCH_SIZE):
+            chunk = ids[start:start + self.IN_BATCH_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            out.extend(self.db.execute_query(
+                f"SELECT * FROM adc_workflow_step WHERE workflow_id IN ({placeholders}) "
+                "ORDER BY workflow_id, step_order, id",
+                tuple(chunk)
+            ))
+        return out
+
     def update_workflow_step(self, step_id: int, step_type_id: int = None, step_order: int = None,
                               params_json: str = None) -> bool:
         updates = []
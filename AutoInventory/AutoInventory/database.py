@@ -118,6 +118,7 @@ class DatabaseManager:
             self.db_path = db_path
         
         self._lock = threading.Lock()  # 线程锁
+        self._local = threading.local()  # 每个线程复用的连接
         self.max_retries = 3  # 最大重试次数
         self.retry_delay = 0.1  # 重试延迟（秒）
         self.init_database()
@@ -131,14 +132,10 @@ class DatabaseManager:
         """获取数据库连接，支持重试机制"""
         for attempt in range(self.max_retries):
             try:
-                conn = sqlite3.connect(self.db_path, timeout=10.0)  # 10秒超时
+                # 10秒超时；放大预编译语句缓存（默认128条），复用连接时热点SQL只编译一次
+                conn = sqlite3.connect(self.db_path, timeout=10.0, cached_statements=256)
                 conn.row_factory = sqlite3.Row
-                # 启用WAL模式提高并发性能
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                conn.execute("PRAGMA cache_size=10000")
-                # 启用外键约束
-                conn.execute("PRAGMA foreign_keys=ON")
+                self._configure_connection(conn)
                 return conn
             except sqlite3.OperationalError as e:
                 if "database is locked" in str(e) and attempt < self.max_retries - 1:
@@ -146,9 +143,26 @@ class DatabaseManager:
                     continue
                 raise
     
+    def _configure_connection(self, conn: sqlite3.Connection):
+        """
+        设置连接级PRAGMA，每次打开连接时调用
+        WAL模式写入数据库文件后持久生效，在init_database中设置一次即可
+        """
+        # WAL模式下NORMAL只在检查点时fsync，提交不再等待刷盘
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB内存映射读
+        conn.execute("PRAGMA cache_size=-16000")  # 约16MB页缓存
+        # 启用外键约束（各子表的ON DELETE CASCADE依赖它）
+        conn.execute("PRAGMA foreign_keys=ON")
+    
     def init_database(self):
         """初始化数据库表结构"""
         conn = self.get_connection()
+        # 启用WAL模式提高并发性能（持久保存在数据库文件中）
+        conn.execute("PRAGMA journal_mode=WAL")
+        # 检查点后将-wal文件截断到约6MB，避免其无限增长
+        conn.execute("PRAGMA journal_size_limit=6144000")
         cursor = conn.cursor()
         
         # 初始化物料模块的表
@@ -166,38 +180,44 @@ class DatabaseManager:
         conn.commit()
         conn.close()
     
+    def _thread_connection(self) -> sqlite3.Connection:
+        """
+        获取当前线程复用的连接（首次使用或切换数据库后重新打开）
+        各线程仍使用独立连接；同一线程内连续的操作共用连接，sqlite3的预编译语句缓存才能跨调用命中
+        """
+        local = self._local
+        conn = getattr(local, 'conn', None)
+        if conn is None or local.db_path != self.db_path:
+            if conn is not None:
+                conn.close()
+            conn = self.get_connection()
+            local.conn = conn
+            local.db_path = self.db_path
+        elif not conn.in_transaction and not conn.execute("PRAGMA foreign_keys").fetchone()[0]:
+            # 复用的连接可能被之前的调用关闭了外键约束，交出前恢复（PRAGMA只能在事务外生效）
+            conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+    
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """执行查询并返回结果"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        results = [dict(row) for row in cursor.fetchall()]
-        conn.close()
-        return results
+        cursor = self._thread_connection().execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def execute_query_rows(self, query: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """执行查询并直接返回sqlite3.Row（不逐行转换为dict，供批量构造模型的热点路径使用）"""
+        return self._thread_connection().execute(query, params).fetchall()
     
     def execute_update(self, query: str, params: tuple = ()) -> int:
         """执行更新操作并返回影响的行数"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        affected_rows = cursor.rowcount
-        conn.close()
-        return affected_rows
+        return self.with_connection(lambda cursor: cursor.execute(query, params).rowcount)
     
     def execute_insert(self, query: str, params: tuple = ()) -> int:
         """执行插入操作并返回新插入行的ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        conn.commit()
-        new_id = cursor.lastrowid
-        conn.close()
-        return new_id
+        return self.with_connection(lambda cursor: cursor.execute(query, params).lastrowid)
 
     def with_connection(self, fn):
-        """在单一连接上执行 fn(cursor)，返回 fn 的返回值。调用方负责 commit/rollback。"""
-        conn = self.get_connection()
+        """在单一连接上执行 fn(cursor)，返回 fn 的返回值；成功则提交，异常则回滚"""
+        conn = self._thread_connection()
         try:
             cursor = conn.cursor()
             result = fn(cursor)
@@ -206,15 +226,13 @@ class DatabaseManager:
         except Exception:
             conn.rollback()
             raise
-        finally:
-            conn.close()
 
     def execute_transaction(self, operations: List[tuple]) -> bool:
         """执行事务操作，确保原子性"""
         with self._lock:  # 使用锁确保事务的原子性
             conn = None
             try:
-                conn = self.get_connection()
+                conn = self._thread_connection()
                 cursor = conn.cursor()
                 
                 for query, params in operations:
@@ -226,6 +244,3 @@ class DatabaseManager:
                 if conn:
                     conn.rollback()
                 raise e
-            finally:
-                if conn:
-                    conn.close()
@@ -2,17 +2,44 @@
 物料模块 - 控制器层
 实现物料、订单相关业务逻辑
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, TYPE_CHECKING
 from datetime import datetime
+from dataclasses import replace
+from collections import OrderedDict
 import uuid
 import os
 import base64
-from PIL import Image
 import io
 
 from .models import Material, Order, OrderMaterial, StockMovement, OrderStatus, Priority, MovementType
 from .repository import MaterialRepository
 
+if TYPE_CHECKING:
+    from PIL import Image  # 仅用于类型注解，运行时在 image_bytes_to_pil_image 中延迟导入
+
+
+# 常见图片格式的文件头
+_IMAGE_SIGNATURES = (
+    (b'\xff\xd8\xff', 'jpg'),
+    (b'\x89PNG\r\n\x1a\n', 'png'),
+    (b'GIF87a', 'gif'),
+    (b'GIF89a', 'gif'),
+    (b'BM', 'bmp'),
+)
+
+
+def _as_bytes(data) -> bytes:
+    """统一BLOB数据类型（memoryview/bytearray转为bytes），界面层无需再做类型判断"""
+    return data if isinstance(data, bytes) else bytes(data)
+
+
+def detect_image_format(image_bytes: bytes) -> Optional[str]:
+    """根据文件头判断图片格式，无法识别时返回None"""
+    for signature, image_format in _IMAGE_SIGNATURES:
+        if image_bytes.startswith(signature):
+            return image_format
+    return None
+
 
 class MaterialController:
     """物料控制器"""
@@ -20,8 +47,10 @@ class MaterialController:
     def __init__(self, db_manager):
         self.db = db_manager
         self.repository = MaterialRepository(db_manager)
-        self._material_cache = {}  # 内存缓存：material_id -> Material对象
+        self._material_cache = {}  # 内存缓存：material_id -> Material对象（不含原图）
         self._all_materials_cache = []  # 所有物料的缓存列表
+        self._full_material_cache = OrderedDict()  # 含原图的物料LRU缓存：material_id -> Material对象
+        self._full_cache_size = 16
         self._cache_initialized = False
     
     def _init_cache(self):
@@ -35,20 +64,27 @@ class MaterialController:
         # 清空缓存
         self._material_cache.clear()
         self._all_materials_cache.clear()
+        self._full_material_cache.clear()
         
-        # 从数据库加载所有物料
-        query = "SELECT * FROM materials ORDER BY name"
-        results = self.db.execute_query(query)
+        # 从数据库加载所有物料（只含缩略图，原图在查看详情时按需加载）
+        for material in self._load_materials_with_thumbs():
+            self._material_cache[material.id] = material
+            self._all_materials_cache.append(material)
+    
+    def _load_materials_with_thumbs(self) -> List[Material]:
+        """查询所有物料及其缩略图（两次查询，不加载原图）"""
+        results = self.db.execute_query("SELECT * FROM materials ORDER BY name")
+        
+        thumbnails_by_id = {}
+        for row in self.repository.get_all_thumbnails():
+            thumbnails_by_id.setdefault(row['material_id'], []).append(_as_bytes(row['thumbnail']))
         
+        materials = []
         for row in results:
             material = Material.from_dict(row)
-            # 加载图片列表
-            images = self.repository.get_material_images(material.id)
-            material.images = [img['image_data'] for img in images]
-            
-            # 存入缓存
-            self._material_cache[material.id] = material
-            self._all_materials_cache.append(material)
+            material.thumbnails = thumbnails_by_id.get(material.id, [])
+            materials.append(material)
+        return materials
     
     def create_material(self, material: Material) -> int:
         """创建新物料"""
@@ -76,8 +112,12 @@ class MaterialController:
                 else:
                     # 如果是字节数据
                     image_bytes = image_data['data'] if isinstance(image_data, dict) else image_data
-                    image_type = image_data.get('type', 'jpg') if isinstance(image_data, dict) else 'jpg'
-                self.repository.add_material_image(material_id, image_bytes, image_type, idx)
+                    if isinstance(image_data, dict):
+                        image_type = image_data.get('type', 'jpg')
+                    else:
+                        image_type = detect_image_format(image_bytes) or 'jpg'
+                thumbnail = material.thumbnails[idx] if idx < len(material.thumbnails) else None
+                self.repository.add_material_image(material_id, image_bytes, image_type, idx, thumbnail=thumbnail)
         
         # 记录库存变动
         if material.quantity > 0:
@@ -107,15 +147,41 @@ class MaterialController:
         return material_id
     
     def get_material(self, material_id: int) -> Optional[Material]:
-        """获取单个物料（从缓存）"""
+        """获取单个物料（从缓存，不含原图）"""
         self._init_cache()
         return self._material_cache.get(material_id)
     
+    def get_material_full(self, material_id: int) -> Optional[Material]:
+        """获取单个物料及其全部原图（按需加载，LRU缓存）"""
+        material = self._full_material_cache.get(material_id)
+        if material is not None:
+            self._full_material_cache.move_to_end(material_id)
+            return material
+        
+        summary = self.get_material(material_id)
+        if summary is None:
+            return None
+        
+        images = self.repository.get_material_images(material_id)
+        material = replace(
+            summary,
+            images=[_as_bytes(img['image_data']) for img in images],
+            thumbnails=[_as_bytes(img['thumbnail'] or img['image_data']) for img in images]
+        )
+        self._full_material_cache[material_id] = material
+        if len(self._full_material_cache) > self._full_cache_size:
+            self._full_material_cache.popitem(last=False)
+        return material
+    
     def get_all_materials(self) -> List[Material]:
         """获取所有物料（从缓存）"""
         self._init_cache()
         return self._all_materials_cache.copy()
     
+    def get_all_materials_with_thumbs_only(self) -> List[Material]:
+        """获取所有物料（只含缩略图，不含原图），用于列表显示"""
+        return self.get_all_materials()
+    
     def update_material(self, material: Material, expected_version: str = None) -> tuple:
         """更新物料信息，返回(成功状态, 错误信息)"""
         if not material.id:
@@ -164,10 +230,11 @@ class MaterialController:
                 return False, "更新失败，物料可能已被删除"
         
         # 更新图片
-        # 先删除旧图片记录
-        self.repository.delete_material_images(material.id)
-        # 添加新图片（存储二进制数据）
-        if material.images:
+        # 只有缩略图没有原图说明来自列表缓存（原图未加载），保留原有图片
+        if material.images or not material.thumbnails:
+            # 先删除旧图片记录
+            self.repository.delete_material_images(material.id)
+            # 添加新图片（存储二进制数据）
             for idx, image_data in enumerate(material.images):
                 if isinstance(image_data, str):
                     # 如果是文件路径，读取文件
@@ -180,8 +247,9 @@ class MaterialController:
                 else:
                     # 如果是字节数据
                     image_bytes = image_data
-                    image_type = 'jpg'
-                self.repository.add_material_image(material.id, image_bytes, image_type, idx)
+                    image_type = detect_image_format(image_bytes) or 'jpg'
+                thumbnail = material.thumbnails[idx] if idx < len(material.thumbnails) else None
+                self.repository.add_material_image(material.id, image_bytes, image_type, idx, thumbnail=thumbnail)
         
         # 记录库存变动
         quantity_diff = material.quantity - current_data['quantity']
@@ -208,9 +276,16 @@ class MaterialController:
     def search_materials(self, keyword: str) -> List[Material]:
         """搜索物料（从缓存）"""
         self._init_cache()
+        return self.filter_materials(self._all_materials_cache, keyword)
+    
+    @staticmethod
+    def filter_materials(materials: List[Material], keyword: str) -> List[Material]:
+        """按名称/类别/描述（不区分大小写）过滤给定的物料列表，关键字为空时返回全部"""
         keyword_lower = keyword.lower()
+        if not keyword_lower:
+            return list(materials)
         results = []
-        for material in self._all_materials_cache:
+        for material in materials:
             if (keyword_lower in material.name.lower() or 
                 keyword_lower in material.category.lower() or 
                 keyword_lower in (material.description or "").lower()):
@@ -235,8 +310,9 @@ class MaterialController:
         """将图片字节数据转换为base64字符串用于显示"""
         return base64.b64encode(image_bytes).decode('utf-8')
     
-    def image_bytes_to_pil_image(self, image_bytes: bytes) -> Image.Image:
+    def image_bytes_to_pil_image(self, image_bytes: bytes) -> "Image.Image":
         """将图片字节数据转换为PIL Image对象"""
+        from PIL import Image  # 仅此处用到PIL，延迟导入以加快启动
         return Image.open(io.BytesIO(image_bytes))
 
 
@@ -3,6 +3,7 @@
 定义物料、订单等业务对象的模型
 """
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -46,10 +47,22 @@ class Material:
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     images: List[str] = None  # 图片路径列表
+    thumbnails: List[bytes] = None  # 缩略图列表（与images一一对应）
     
     def __post_init__(self):
         if self.images is None:
             self.images = []
+        if self.thumbnails is None:
+            self.thumbnails = []
+    
+    @property
+    def version(self) -> int:
+        """可变字段的哈希，用于判断界面是否需要刷新"""
+        return hash((
+            self.name, self.category, self.description, self.quantity, self.unit,
+            self.min_stock, self.location, self.supplier, self.updated_at,
+            tuple(self.thumbnails)
+        ))
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -74,7 +87,7 @@ class Material:
         material_fields = {
             'id', 'name', 'category', 'description', 'quantity', 
             'unit', 'min_stock', 'location', 'supplier', 
-            'created_at', 'updated_at', 'images'
+            'created_at', 'updated_at', 'images', 'thumbnails'
         }
         filtered_data = {k: v for k, v in data.items() if k in material_fields}
         # 确保images字段存在
@@ -102,6 +115,11 @@ class Order:
         if self.materials is None:
             self.materials = []
     
+    @cached_property
+    def created_at_text(self) -> str:
+        """创建时间的显示文本（首次访问时格式化并缓存）"""
+        return self.created_at.strftime('%Y-%m-%d %H:%M') if self.created_at else 'N/A'
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
         data = asdict(self)
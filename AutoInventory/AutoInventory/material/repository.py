@@ -94,6 +94,7 @@ def _migrate_material_images_table(cursor):
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 material_id INTEGER NOT NULL,
                 image_data BLOB NOT NULL,
+                thumbnail BLOB,
                 image_type TEXT,
                 display_order INTEGER DEFAULT 0,
                 notes TEXT,
@@ -101,6 +102,12 @@ def _migrate_material_images_table(cursor):
                 FOREIGN KEY (material_id) REFERENCES materials (id) ON DELETE CASCADE
             )
         ''')
+        
+        # 旧表补充缩略图列
+        cursor.execute("PRAGMA table_info(material_images)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if 'thumbnail' not in columns:
+            cursor.execute("ALTER TABLE material_images ADD COLUMN thumbnail BLOB")
     except Exception as e:
         print(f"迁移表结构时出错: {e}")
         # 如果迁移失败，尝试直接创建新表
@@ -110,6 +117,7 @@ def _migrate_material_images_table(cursor):
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 material_id INTEGER NOT NULL,
                 image_data BLOB NOT NULL,
+                thumbnail BLOB,
                 image_type TEXT,
                 display_order INTEGER DEFAULT 0,
                 notes TEXT,
@@ -148,24 +156,33 @@ class MaterialRepository:
         return affected > 0
     
     def add_material_image(self, material_id: int, image_data: bytes, image_type: str, 
-                          display_order: int = 0, notes: str = "") -> int:
-        """添加物料图片（存储二进制数据）"""
+                          display_order: int = 0, notes: str = "", thumbnail: bytes = None) -> int:
+        """添加物料图片（存储二进制数据，可附带缩略图）"""
         query = '''
-            INSERT INTO material_images (material_id, image_data, image_type, display_order, notes)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO material_images (material_id, image_data, thumbnail, image_type, display_order, notes)
+            VALUES (?, ?, ?, ?, ?, ?)
         '''
-        return self.db.execute_insert(query, (material_id, image_data, image_type, display_order, notes))
+        return self.db.execute_insert(query, (material_id, image_data, thumbnail, image_type, display_order, notes))
     
     def get_material_images(self, material_id: int) -> List[Dict[str, Any]]:
         """获取物料的图片列表（返回二进制数据）"""
         query = '''
-            SELECT id, material_id, image_data, image_type, display_order, notes, created_at
+            SELECT id, material_id, image_data, thumbnail, image_type, display_order, notes, created_at
             FROM material_images 
             WHERE material_id = ? 
             ORDER BY display_order, created_at
         '''
         return self.db.execute_query(query, (material_id,))
     
+    def get_all_thumbnails(self) -> List[Dict[str, Any]]:
+        """获取所有物料的缩略图（旧数据没有缩略图时退回原图）"""
+        query = '''
+            SELECT material_id, COALESCE(thumbnail, image_data) AS thumbnail
+            FROM material_images
+            ORDER BY material_id, display_order, created_at
+        '''
+        return self.db.execute_query(query)
+    
     def delete_material_image(self, image_id: int) -> bool:
         """删除物料图片"""
         query = "DELETE FROM material_images WHERE id = ?"
@@ -0,0 +1,127 @@
+"""
+ADC出入库库存测试
+验证出入库记录与库存调整的事务性，以及同一ADC存在重复规格(spec_mg相同)时的库存计算
+可直接运行（python test_adc_stock.py），也可用 pytest 收集
+"""
+import os
+import sys
+import shutil
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import DatabaseManager
+from adc.controller import ADCController
+from adc.models import ADC, ADCSpec, ADCInbound, ADCOutbound, ADCMovementItem
+
+
+def _setup(tmp_dir: str, specs):
+    """新建数据库和一个带给定规格[(spec_mg, quantity)]的ADC，返回 (db, controller, adc_id)"""
+    db = DatabaseManager(os.path.join(tmp_dir, "test.db"))
+    controller = ADCController(db)
+    adc = ADC(lot_number="LOT-1", sample_id="S1")
+    adc.set_specs([ADCSpec(spec_mg=mg, quantity=qty) for mg, qty in specs])
+    adc_id = controller.create_adc(adc)
+    return db, controller, adc_id
+
+
+def _spec_rows(db, adc_id):
+    """按id顺序返回 [(spec_mg, quantity)]"""
+    rows = db.execute_query("SELECT spec_mg, quantity FROM adc_specs WHERE adc_id = ? ORDER BY id", (adc_id,))
+    return [(r["spec_mg"], r["quantity"]) for r in rows]
+
+
+def test_inbound_duplicate_specs_increase_first_row_only():
+    """重复规格时入库只累加到第一行，总库存只增加入库数量"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db, controller, adc_id = _setup(tmp_dir, [(1.0, 2), (1.0, 3)])
+        inbound = ADCInbound(lot_number="LOT-1", operator="op",
+                             items=[ADCMovementItem(spec_mg=1.0, quantity=5)])
+        success, _ = controller.create_inbound(inbound)
+        assert success
+        assert _spec_rows(db, adc_id) == [(1.0, 7), (1.0, 3)]
+        assert controller.calculate_total_vials(adc_id) == 10
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_outbound_duplicate_specs_take_first_row():
+    """重复规格时出库从第一行扣减"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db, controller, adc_id = _setup(tmp_dir, [(1.0, 2), (1.0, 3)])
+        outbound = ADCOutbound(lot_number="LOT-1", operator="op",
+                               items=[ADCMovementItem(spec_mg=1.0, quantity=1)])
+        success, _ = controller.create_outbound(outbound)
+        assert success
+        assert _spec_rows(db, adc_id) == [(1.0, 1), (1.0, 3)]
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+
+def _count(db, table):
+    return db.execute_query(f"SELECT COUNT(*) AS n FROM {table}")[0]["n"]
+
+
+def test_outbound_and_inbound_happy_path():
+    """出库扣减、入库累加（含新规格），记录和明细都写入"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db, controller, adc_id = _setup(tmp_dir, [(1.0, 5), (5.0, 2)])
+        success, outbound_id = controller.create_outbound(ADCOutbound(
+            lot_number="LOT-1", operator="op",
+            items=[ADCMovementItem(spec_mg=1.0, quantity=2), ADCMovementItem(spec_mg=5.0, quantity=2)]))
+        assert success
+        assert _spec_rows(db, adc_id) == [(1.0, 3), (5.0, 0)]
+        assert [(i.spec_mg, i.quantity) for i in controller.get_outbound_items(outbound_id)] == [(1.0, 2), (5.0, 2)]
+
+        success, inbound_id = controller.create_inbound(ADCInbound(
+            lot_number="LOT-1", operator="op",
+            items=[ADCMovementItem(spec_mg=5.0, quantity=1), ADCMovementItem(spec_mg=10.0, quantity=4)]))
+        assert success
+        assert _spec_rows(db, adc_id) == [(1.0, 3), (5.0, 1), (10.0, 4)]
+        assert [(i.spec_mg, i.quantity) for i in controller.get_inbound_items(inbound_id)] == [(5.0, 1), (10.0, 4)]
+        # 缓存与数据库一致
+        assert controller.calculate_total_vials(adc_id) == 8
+        assert controller.calculate_total_mg(adc_id) == 3 * 1.0 + 1 * 5.0 + 4 * 10.0
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_outbound_rolls_back_when_decrement_fails():
+    """缓存显示库存充足但数据库已被扣减时，出库整体回滚：不写记录和明细，库存不变"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db, controller, adc_id = _setup(tmp_dir, [(1.0, 5), (5.0, 2)])
+        controller.get_all_adcs()  # 加载缓存
+        # 模拟其他客户端已取走5mg规格（本控制器缓存仍为2）
+        db.execute_update("UPDATE adc_specs SET quantity = 0 WHERE adc_id = ? AND spec_mg = 5.0", (adc_id,))
+
+        success, message = controller.create_outbound(ADCOutbound(
+            lot_number="LOT-1", operator="op",
+            items=[ADCMovementItem(spec_mg=1.0, quantity=1), ADCMovementItem(spec_mg=5.0, quantity=1)]))
+        assert not success
+        assert "库存不足" in message
+        assert _count(db, "adc_outbound") == 0
+        assert _count(db, "adc_outbound_items") == 0
+        # 第一条扣减也已回滚
+        assert _spec_rows(db, adc_id) == [(1.0, 5), (5.0, 0)]
+        # 失败后缓存已刷新为数据库的值
+        assert controller.calculate_total_vials(adc_id) == 5
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    tests = [(name, fn) for name, fn in globals().items() if name.startswith("test_") and callable(fn)]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
+    print(f"\n🎉 {len(tests)} 项测试全部通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+ADC实验流程模块测试
+验证步骤类型映射缓存的失效、JSON 字段解析缓存的只读性、orjson/标准库两种 JSON 后端的一致性
+可直接运行（python test_adc_workflow.py），也可用 pytest 收集
+"""
+import os
+import sys
+import shutil
+import tempfile
+import importlib.util
+import math
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import DatabaseManager
+from adc_workflow.controller import ADCWorkflowController
+from adc_workflow.models import ADCWorkflow, ADCWorkflowStep
+from adc_workflow import _json
+
+
+def test_step_type_maps_follow_repository_writes():
+    """通过仓库增删改步骤类型后，控制器的名称/id 映射立即更新（不等待 TTL）"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        controller = ADCWorkflowController(DatabaseManager(os.path.join(tmp_dir, "test.db")))
+        id_to_name = controller.get_step_type_id_to_name()
+        assert "Zeba" in id_to_name.values()
+        # 返回的是共享缓存，调用方不能改写
+        try:
+            id_to_name[-1] = "changed"
+            assert False, "映射应为只读"
+        except TypeError:
+            pass
+
+        type_id = controller.repo.create_step_type("Test Column", 99)
+        assert controller.get_step_type_id_to_name()[type_id] == "Test Column"
+
+        controller.repo.update_step_type(type_id, name="Test Column 2")
+        assert controller.get_step_type_id_to_name()[type_id] == "Test Column 2"
+
+        controller.repo.delete_step_type(type_id)
+        assert type_id not in controller.get_step_type_id_to_name()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_parsed_json_is_read_only_and_follows_reassignment():
+    """raw_request/params 返回只读映射，调用方无法改写缓存；字段重新赋值后重新解析"""
+    workflow = ADCWorkflow(raw_request_json='{"WBP Code": "W1", "Reaction Scale (mg)": 5}')
+    raw = workflow.raw_request
+    assert raw["WBP Code"] == "W1"
+    try:
+        raw["WBP Code"] = "changed"
+        assert False, "解析结果应为只读"
+    except TypeError:
+        pass
+    assert workflow.raw_request is raw
+    assert dict(workflow.raw_request) == {"WBP Code": "W1", "Reaction Scale (mg)": 5}
+
+    workflow.raw_request_json = '{"WBP Code": "W2"}'
+    assert dict(workflow.raw_request) == {"WBP Code": "W2"}
+
+    step = ADCWorkflowStep(params_json="not json")
+    assert dict(step.params) == {}
+    step.params_json = '{"recovery": 0.9}'
+    assert step.params["recovery"] == 0.9
+
+
+def _load_json_module_without_orjson():
+    """以未安装 orjson 的方式重新加载 adc_workflow._json（得到标准库后端）"""
+    saved = sys.modules.get("orjson")
+    sys.modules["orjson"] = None  # import orjson 将抛出 ImportError
+    try:
+        spec = importlib.util.spec_from_file_location("_json_stdlib_backend", _json.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if saved is None:
+            del sys.modules["orjson"]
+        else:
+            sys.modules["orjson"] = saved
+
+
+def test_json_backends_round_trip_identically():
+    """两种后端编码出相同的文本，解析结果相同且与原对象一致"""
+    fallback = _load_json_module_without_orjson()
+    assert fallback.orjson is None
+    samples = [
+        {"WBP Code": "W1", "中文键": "值", "Reaction Scale (mg)": 5, "conc": 1e-07, "big": 10 ** 20},
+        {"ADC Target Quality": [{"DAR": 4.0, "ok": True}], "nested": {"none": None}},
+        {},
+    ]
+    for obj in samples:
+        text = _json.dumps(obj)
+        assert text == fallback.dumps(obj)
+        assert _json.loads(text) == fallback.loads(text) == obj
+    # 旧数据中标准库写入的 NaN 两种后端都能解析
+    assert math.isnan(fallback.loads('{"x": NaN}')["x"])
+    assert math.isnan(_json.loads('{"x": NaN}')["x"])
+
+
+def main():
+    tests = [(name, fn) for name, fn in globals().items() if name.startswith("test_") and callable(fn)]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
+    print(f"\n🎉 {len(tests)} 项测试全部通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+数据库连接管理测试
+验证线程内复用连接、事务提交/回滚、切换数据库以及连接级PRAGMA设置，连接状态（外键约束等）不会在调用之间泄漏
+可直接运行（python test_database.py），也可用 pytest 收集
+"""
+import os
+import sys
+import shutil
+import sqlite3
+import tempfile
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from database import DatabaseManager
+from adc.controller import ADCController
+from adc.models import ADC, ADCSpec
+from adc_workflow.repository import ADCWorkflowRepository
+
+
+def _make_db(tmp_dir: str, name: str = "test.db") -> DatabaseManager:
+    return DatabaseManager(os.path.join(tmp_dir, name))
+
+
+def test_foreign_keys_restored_after_create_workflow():
+    """create_workflow 临时关闭外键后必须恢复，删除ADC时规格随之级联删除"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db = _make_db(tmp_dir)
+        repo = ADCWorkflowRepository(db)
+        user_id = repo.get_all_users()[0]["id"]
+        repo.create_workflow("REQ-1", "{}", "Zeba", user_id)
+
+        assert db.execute_query("PRAGMA foreign_keys")[0]["foreign_keys"] == 1
+
+        controller = ADCController(db)
+        adc = ADC(lot_number="FK-LOT-1", sample_id="S1")
+        adc.set_specs([ADCSpec(spec_mg=1.0, quantity=2), ADCSpec(spec_mg=5.0, quantity=1)])
+        adc_id = controller.create_adc(adc)
+        assert controller.delete_adc(adc_id)
+
+        orphans = db.execute_query("SELECT COUNT(*) AS n FROM adc_specs WHERE adc_id = ?", (adc_id,))
+        assert orphans[0]["n"] == 0
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_with_connection_rolls_back_on_exception():
+    """fn 抛出异常时回滚已执行的写入，连接可继续使用"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db = _make_db(tmp_dir)
+        db.execute_update("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+
+        def _fail(cursor):
+            cursor.execute("INSERT INTO t (v) VALUES ('a')")
+            raise ValueError("boom")
+
+        try:
+            db.with_connection(_fail)
+            assert False, "异常应向上抛出"
+        except ValueError:
+            pass
+        assert db.execute_query("SELECT COUNT(*) AS n FROM t")[0]["n"] == 0
+        assert not db._thread_connection().in_transaction
+
+        db.execute_insert("INSERT INTO t (v) VALUES ('b')")
+        assert [r["v"] for r in db.execute_query("SELECT v FROM t")] == ["b"]
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_thread_connection_reopens_after_switch_database():
+    """切换数据库后线程连接重新打开，指向新库"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db = _make_db(tmp_dir, "a.db")
+        db.execute_update("CREATE TABLE only_in_a (id INTEGER)")
+        conn_a = db._thread_connection()
+        assert db._thread_connection() is conn_a
+
+        db.switch_database(os.path.join(tmp_dir, "b.db"))
+        conn_b = db._thread_connection()
+        assert conn_b is not conn_a
+        assert db.execute_query("SELECT name FROM sqlite_master WHERE name = 'only_in_a'") == []
+        # 旧连接已关闭
+        try:
+            conn_a.execute("SELECT 1")
+            assert False, "旧连接应已关闭"
+        except sqlite3.ProgrammingError:
+            pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def test_pragmas_after_transaction():
+    """事务提交/回滚后，复用的连接仍保持连接级PRAGMA设置"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        db = _make_db(tmp_dir)
+        db.execute_update("CREATE TABLE t (id INTEGER PRIMARY KEY)")
+        db.execute_transaction([("INSERT INTO t (id) VALUES (?)", (1,))])
+        try:
+            db.with_connection(lambda cursor: cursor.execute("INSERT INTO t (id) VALUES (1)"))
+        except sqlite3.IntegrityError:
+            pass
+
+        def _pragma(name):
+            return db.execute_query(f"PRAGMA {name}")[0][name]
+
+        assert _pragma("journal_mode") == "wal"
+        assert _pragma("foreign_keys") == 1
+        assert _pragma("synchronous") == 1  # NORMAL
+        assert _pragma("temp_store") == 2  # MEMORY
+        assert _pragma("cache_size") == -16000
+        # execute_query_rows 与 execute_query 读取相同的数据
+        rows = db.execute_query_rows("SELECT id FROM t")
+        assert isinstance(rows[0], sqlite3.Row)
+        assert [dict(r) for r in rows] == db.execute_query("SELECT id FROM t")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def main():
+    tests = [(name, fn) for name, fn in globals().items() if name.startswith("test_") and callable(fn)]
+    for name, fn in tests:
+        fn()
+        print(f"✅ {name}")
+    print(f"\n🎉 {len(tests)} 项测试全部通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -1074,10 +1074,8 @@ class MainWindow:
             messagebox.showwarning("警告", "请选择要生成报告的订单")
             return
         
-        order_ids = []
-        for item in selection:
-            order_id = self.report_order_tree.item(item)['values'][0]
-            order_ids.append(order_id)
+        # 行的iid即订单ID，无需逐行读取values
+        order_ids = [int(iid) for iid in selection]
         
         try:
             html_content = self.report_controller.generate_order_report(order_ids)
@@ -1530,10 +1528,9 @@ class MainWindow:
         
         # 添加新数据
         for order in orders:
-            created_at = order.created_at.strftime('%Y-%m-%d %H:%M') if order.created_at else 'N/A'
             self.order_tree.insert("", tk.END, values=(
                 order.id, order.order_number, order.requester,
-                order.department, order.status, order.priority, created_at
+                order.department, order.status, order.priority, order.created_at_text
             ))
     
     def update_report_order_tree(self, orders):
@@ -1544,10 +1541,9 @@ class MainWindow:
         
         # 添加新数据
         for order in orders:
-            created_at = order.created_at.strftime('%Y-%m-%d %H:%M') if order.created_at else 'N/A'
-            self.report_order_tree.insert("", tk.END, values=(
+            self.report_order_tree.insert("", tk.END, iid=str(order.id), values=(
                 order.id, order.order_number, order.requester,
-                order.department, order.status, order.priority, created_at
+                order.department, order.status, order.priority, order.created_at_text
             ))
     
     def show_processing_dialog(self, message: str):
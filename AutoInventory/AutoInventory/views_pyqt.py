@@ -5,7 +5,10 @@
 import sys
 import os
 import io
-from typing import List, Optional, Dict, Any, Tuple
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Optional, Dict, Any, Tuple, Sequence
 from datetime import datetime
 
 from PyQt5.QtWidgets import (
@@ -13,14 +16,18 @@ from PyQt5.QtWidgets import (
     QLabel, QPushButton, QLineEdit, QTextEdit, QComboBox, QScrollArea,
     QListWidget, QListWidgetItem, QFrame, QSplitter, QMessageBox, QFileDialog,
     QDialog, QDialogButtonBox, QSpinBox, QDoubleSpinBox, QGroupBox, QTableWidget, QTableWidgetItem,
-    QHeaderView, QTabWidget, QProgressBar, QDateEdit, QInputDialog, QSizePolicy, QCheckBox
+    QHeaderView, QTabWidget, QProgressBar, QDateEdit, QInputDialog, QSizePolicy, QCheckBox,
+    QListView, QStyledItemDelegate, QStyle, QStackedWidget, QTableView
 )
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QThread, QTimer, QDate
-from PyQt5.QtGui import QPixmap, QFont, QColor, QImage
+from PyQt5.QtCore import (
+    Qt, QSize, pyqtSignal, QThread, QTimer, QDate, QAbstractListModel, QAbstractTableModel, QModelIndex, QRect,
+    QObject, QRunnable, QThreadPool, QBuffer, QByteArray, QIODevice
+)
+from PyQt5.QtGui import QPixmap, QPixmapCache, QFont, QColor, QImage, QImageReader, QPainter, QPen, QFontMetrics
 
 # 从模块导入
 from material.models import Material, Order, OrderStatus, Priority
-from material.controller import MaterialController, OrderController, ReportController
+from material.controller import MaterialController, OrderController, ReportController, detect_image_format
 from adc.models import ADC, ADCSpec, ADCOutbound, ADCInbound, ADCMovementItem
 from adc.controller import ADCController, PRESET_SPECS
 from adc_workflow.models import ADCWorkflow, ADCWorkflowStep, ADCExperimentResult, AppUser
@@ -33,9 +40,287 @@ from database import (
 )
 
 
+# 查看大图时缩放后的图片缓存上限（KB）
+QPixmapCache.setCacheLimit(102400)
+
+# 物料类别颜色
+CATEGORY_COLORS = {
+    "试剂": "#28a745",
+    "耗材": "#17a2b8",
+    "设备": "#ffc107",
+    "工具": "#fd7e14",
+    "其他": "#6c757d"
+}
+
+_CHIP_CACHE: Dict[Tuple[str, int, int], QPixmap] = {}
+
+# 预先构建的样式表（避免每个控件构造时重复拼接字符串）
+CARD_QSS_NORMAL = """
+    QFrame {
+        background-color: white;
+        border-radius: 5px;
+    }
+"""
+ADC_CARD_QSS_SELECTED = """
+    QFrame {
+        background-color: white;
+        border: 3px solid #007bff;
+        border-radius: 5px;
+    }
+"""
+# 预先构建的字体（QFont内部写时复制，可安全共享）
+EMOJI_FONT = QFont("Arial", 16)
+CARD_NAME_FONT = QFont("Microsoft YaHei", 16, QFont.Bold)
+DETAIL_NAME_FONT = QFont("Microsoft YaHei", 18, QFont.Bold)
+ADC_CARD_LOT_FONT = QFont("Microsoft YaHei", 12, QFont.Bold)
+DETAIL_SUBTITLE_FONT = QFont("Microsoft YaHei", 14)
+
+MUTED_TEXT_QSS = "color: #6c757d;"
+SUMMARY_TEXT_QSS = "font-weight: bold; color: #007bff;"
+WARNING_TEXT_QSS = "color: #dc3545;"
+DESCRIPTION_QSS = "padding: 6px; background-color: #f8f9fa; border-radius: 4px;"
+TOTAL_TEXT_QSS = "font-weight: bold; font-size: 14px; color: #007bff;"
+HINT_TEXT_QSS = "color: #6b7280;"
+
+# 常用颜色和画笔（模块加载时创建一次，绘制和逐行填充表格时复用）
+COLOR_WHITE = QColor("white")
+COLOR_BLACK = QColor("black")
+ID_CHIP_COLOR = QColor("#e9ecef")
+MUTED_TEXT_COLOR = QColor("#6c757d")
+INBOUND_ROW_COLOR = QColor("#d4edda")
+OUTBOUND_ROW_COLOR = QColor("#f8d7da")
+CARD_PEN_SELECTED = QPen(QColor("#28a745"), 3)
+CARD_PEN_NORMAL = QPen(QColor("#adb5bd"), 2)
+
+
+def category_chip_pixmap(category: str, width: int = 80, height: int = 28, radius: int = 3) -> QPixmap:
+    """类别标签图片（按类别和尺寸缓存，只绘制一次）"""
+    key = (category, width, height)
+    pixmap = _CHIP_CACHE.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(width, height)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(CATEGORY_COLORS.get(category, "#6c757d")))
+        painter.drawRoundedRect(pixmap.rect(), radius, radius)
+        painter.setPen(COLOR_WHITE)
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, category)
+        painter.end()
+        _CHIP_CACHE[key] = pixmap
+    return pixmap
+
+
+def decode_thumb(img_bytes: bytes, w: int, h: int) -> QImage:
+    """
+    解码并缩放到不超过 w x h（保持比例）。
+    通过QImageReader.setScaledSize让解码器直接输出小图（JPEG可在DCT阶段缩放），
+    能识别文件头时直接指定格式，跳过Qt逐个插件探测。
+    """
+    buf = QBuffer()
+    buf.setData(img_bytes)
+    buf.open(QIODevice.ReadOnly)
+    image_format = detect_image_format(img_bytes)
+    reader = QImageReader(buf, image_format.encode() if image_format else b"")
+    reader.setAutoTransform(True)
+    size = reader.size()
+    if size.isValid():
+        reader.setScaledSize(size.scaled(w, h, Qt.KeepAspectRatio))
+    return reader.read()
+
+
+def set_cell_text(table: QTableWidget, row: int, column: int, text: str) -> QTableWidgetItem:
+    """设置单元格文字，已有条目时原地setText复用，不重新创建QTableWidgetItem"""
+    item = table.item(row, column)
+    if item is None:
+        item = QTableWidgetItem(text)
+        table.setItem(row, column, item)
+    else:
+        item.setText(text)
+    return item
+
+
+class ThumbCache:
+    """缩略图缓存：内存LRU + 磁盘PNG，按图片内容哈希寻址，避免重复解码原图"""
+    
+    MAX_ITEMS = 256
+    CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "autoinventory", "thumbs")
+    
+    _memory: "OrderedDict[str, QPixmap]" = OrderedDict()
+    
+    @staticmethod
+    def make_key(img_bytes: bytes, w: int, h: int) -> str:
+        """根据图片内容和尺寸生成缓存键"""
+        return hashlib.blake2b(img_bytes, digest_size=16).hexdigest() + f"_{w}x{h}"
+    
+    @classmethod
+    def _disk_path(cls, key: str) -> str:
+        return os.path.join(cls.CACHE_DIR, f"{key}.png")
+    
+    @classmethod
+    def _remember(cls, key: str, pixmap: QPixmap):
+        cls._memory[key] = pixmap
+        cls._memory.move_to_end(key)
+        while len(cls._memory) > cls.MAX_ITEMS:
+            cls._memory.popitem(last=False)
+    
+    # ---------- 异步加载 ----------
+    
+    _pending: Dict[str, List] = {}  # key -> 等待中的回调列表
+    _failed: set = set()  # 无法解码的图片键，避免每次绘制都重新解码
+    
+    @classmethod
+    def request(cls, img_bytes: bytes, w: int, h: int, callback, key: str = None) -> Optional[QPixmap]:
+        """
+        异步获取缩略图：内存命中时直接返回，否则在线程池中解码，
+        完成后在主线程调用 callback(pixmap)。相同图片的并发请求只解码一次。
+        图片无法解码时返回/回调空QPixmap（isNull()为True），调用方应显示占位符。
+        """
+        if key is None:
+            key = cls.make_key(img_bytes, w, h)
+        pixmap = cls._memory.get(key)
+        if pixmap is not None and not pixmap.isNull():
+            cls._memory.move_to_end(key)
+            return pixmap
+        if key in cls._failed:
+            return QPixmap()
+        
+        if key in cls._pending:
+            cls._pending[key].append(callback)
+            return None
+        
+        cls._pending[key] = [callback]
+        worker = ThumbWorker(key, img_bytes, w, h, cls._disk_path(key))
+        worker.signals.finished.connect(cls._on_worker_finished)
+        QThreadPool.globalInstance().start(worker)
+        return None
+    
+    @classmethod
+    def _on_worker_finished(cls, key: str, img: QImage):
+        """解码完成（主线程）：QPixmap只能在主线程创建"""
+        pixmap = QPixmap.fromImage(img)
+        if pixmap.isNull():
+            # 不缓存空结果，记录失败键，让调用方显示"无图片"
+            cls._failed.add(key)
+        else:
+            cls._remember(key, pixmap)
+        for callback in cls._pending.pop(key, []):
+            try:
+                callback(pixmap)
+            except RuntimeError:
+                # 接收控件已被销毁
+                pass
+
+
+def make_thumbnail(image_bytes: bytes, size: int = 256) -> Optional[bytes]:
+    """生成用于存储的JPEG缩略图，无法解码时返回None"""
+    thumb = decode_thumb(image_bytes, size, size)
+    if thumb.isNull():
+        return None
+    data = QByteArray()
+    buf = QBuffer(data)
+    buf.open(QIODevice.WriteOnly)
+    thumb.save(buf, "JPEG", 85)
+    buf.close()
+    return bytes(data)
+
+
+class WorkerSignals(QObject):
+    """后台任务信号"""
+    
+    finished = pyqtSignal(str, QImage)  # key, 缩略图
+
+
+class ThumbWorker(QRunnable):
+    """后台解码缩略图（QImage可在非GUI线程使用，QPixmap不行）"""
+    
+    def __init__(self, key: str, img_bytes: bytes, w: int, h: int, disk_path: str):
+        super().__init__()
+        self.key = key
+        self.img_bytes = img_bytes
+        self.size = (w, h)
+        self.disk_path = disk_path
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        img = QImage()
+        if os.path.exists(self.disk_path):
+            img.load(self.disk_path)
+        if img.isNull():
+            img = decode_thumb(self.img_bytes, self.size[0], self.size[1])
+            if not img.isNull():
+                try:
+                    os.makedirs(os.path.dirname(self.disk_path), exist_ok=True)
+                    img.save(self.disk_path, "PNG")
+                except OSError:
+                    pass
+        self.signals.finished.emit(self.key, img)
+
+
+class ImageReadWorker(QRunnable):
+    """后台读取图片文件并生成缩略图，结果写入 Future"""
+    
+    def __init__(self, image_path: str, future: Future):
+        super().__init__()
+        self.image_path = image_path
+        self.future = future
+    
+    def run(self):
+        try:
+            with open(self.image_path, 'rb') as f:
+                image_bytes = f.read()
+            self.future.set_result((image_bytes, make_thumbnail(image_bytes)))
+        except Exception as e:
+            self.future.set_exception(e)
+
+
+class ReportSignals(QObject):
+    """报告生成任务信号"""
+    
+    finished = pyqtSignal(str)  # 保存的文件路径
+    failed = pyqtSignal(str)    # 错误信息
+
+
+class ReportWorker(QRunnable):
+    """后台生成订单HTML报告并写入文件"""
+    
+    def __init__(self, report_controller, order_ids: List[int], filename: str):
+        super().__init__()
+        self.report_controller = report_controller
+        self.order_ids = order_ids
+        self.filename = filename
+        self.signals = ReportSignals()
+    
+    def run(self):
+        try:
+            html_content = self.report_controller.generate_order_report(self.order_ids)
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                f.write(html_content)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(self.filename)
+
+
+
 class EmojiPicker(QDialog):
     """Emoji选择器"""
     
+    _instance = None
+    
+    @classmethod
+    def instance(cls, parent=None) -> 'EmojiPicker':
+        """获取共享的选择器实例（按钮只创建一次，每次打开前重置结果）"""
+        # 不设置父对象，避免随第一个打开它的对话框一起被销毁
+        if cls._instance is None:
+            cls._instance = cls()
+        picker = cls._instance
+        picker.result = None
+        if parent is not None:
+            picker.move(parent.frameGeometry().center() - picker.rect().center())
+        return picker
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("选择Emoji")
@@ -57,16 +342,16 @@ class EmojiPicker(QDialog):
         for emoji in emojis:
             btn = QPushButton(emoji)
             btn.setFixedSize(40, 40)
-            btn.setFont(QFont("Arial", 16))
-            btn.clicked.connect(lambda checked, e=emoji: self._select_emoji(e))
+            btn.setFont(EMOJI_FONT)
+            btn.clicked.connect(self._on_emoji_btn)
             layout.addWidget(btn, row, col)
             col += 1
             if col >= 10:
                 col = 0
                 row += 1
     
-    def _select_emoji(self, emoji):
-        self.result = emoji
+    def _on_emoji_btn(self):
+        self.result = self.sender().text()
         self.accept()
 
 
@@ -79,6 +364,7 @@ class MaterialDialog(QDialog):
         self.material_controller = material_controller
         self.result = None
         self.image_paths = []
+        self._image_futures: Dict[str, Future] = {}  # 图片路径 -> (原图, 缩略图)
         
         self.setWindowTitle("编辑物料" if material else "添加物料")
         self.setFixedSize(600, 700)
@@ -184,7 +470,7 @@ class MaterialDialog(QDialog):
         layout.addWidget(buttons)
     
     def _insert_emoji(self):
-        emoji_picker = EmojiPicker(self)
+        emoji_picker = EmojiPicker.instance(self)
         if emoji_picker.exec_() == QDialog.Accepted:
             emoji = emoji_picker.result
             if emoji:
@@ -197,6 +483,11 @@ class MaterialDialog(QDialog):
         if filename:
             self.image_paths.append(filename)
             self.image_list.addItem(os.path.basename(filename))
+            # 立即在后台读取，保存时通常已读取完毕
+            if filename not in self._image_futures:
+                future = Future()
+                self._image_futures[filename] = future
+                QThreadPool.globalInstance().start(ImageReadWorker(filename, future))
     
     def _remove_image(self):
         current_item = self.image_list.currentItem()
@@ -219,9 +510,18 @@ class MaterialDialog(QDialog):
         dialog.setFixedSize(800, 600)
         layout = QVBoxLayout()
         
-        pixmap = QPixmap(image_path)
+        # 缓存键包含修改时间，文件被替换后自动失效
+        try:
+            mtime = os.path.getmtime(image_path)
+        except OSError:
+            mtime = 0
+        key = f"{image_path}@{mtime}@700x500"
+        pixmap = QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = QPixmap(image_path).scaled(700, 500, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            QPixmapCache.insert(key, pixmap)
         label = QLabel()
-        label.setPixmap(pixmap.scaled(700, 500, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        label.setPixmap(pixmap)
         label.setAlignment(Qt.AlignCenter)
         layout.addWidget(label)
         
@@ -245,13 +545,19 @@ class MaterialDialog(QDialog):
             QMessageBox.critical(self, "错误", "请输入单位")
             return
         
-        # 读取图片文件为二进制数据
+        # 取出后台读取的图片数据和缩略图（仍在读取时等待完成）
         image_data_list = []
+        thumbnail_list = []
         for image_path in self.image_paths:
-            if os.path.exists(image_path):
-                with open(image_path, 'rb') as f:
-                    image_bytes = f.read()
-                image_data_list.append(image_bytes)
+            future = self._image_futures.get(image_path)
+            if future is None:
+                continue
+            try:
+                image_bytes, thumbnail = future.result()
+            except OSError:
+                continue
+            image_data_list.append(image_bytes)
+            thumbnail_list.append(thumbnail)
         
         material = Material(
             id=self.material.id if self.material else None,
@@ -263,7 +569,8 @@ class MaterialDialog(QDialog):
             min_stock=self.min_stock_edit.value(),
             location=self.location_edit.text().strip(),
             supplier=self.supplier_edit.text().strip(),
-            images=image_data_list
+            images=image_data_list,
+            thumbnails=thumbnail_list
         )
         
         self.result = material
@@ -385,128 +692,247 @@ class OrderDialog(QDialog):
         self.accept()
 
 
-class MaterialCard(QFrame):
-    """物料卡片"""
+class OrderTableModel(QAbstractTableModel):
+    """订单表格模型（QTableView直接从Order对象取值，不为每个单元格创建条目）"""
     
-    clicked = pyqtSignal(int)  # material_id
+    HEADERS = ["ID", "订单号", "申请人", "部门", "状态", "优先级", "创建时间"]
     
-    def __init__(self, material: Material, parent=None):
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.material = material
-        self.setFrameStyle(QFrame.Box)
-        self.setLineWidth(2)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 5px;
-            }
-        """)
-        self.setup_ui()
+        self.orders: List[Order] = []
+        # 行号→订单ID，供批量取选中订单时直接按行索引
+        self.order_ids: List[int] = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.orders)
+    
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        order = self.orders[index.row()]
+        column = index.column()
+        if column == 0:
+            return str(order.id)
+        if column == 1:
+            return order.order_number
+        if column == 2:
+            return order.requester
+        if column == 3:
+            return order.department or ""
+        if column == 4:
+            return order.status
+        if column == 5:
+            return order.priority
+        if column == 6:
+            return order.created_at_text
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def set_orders(self, orders: List[Order]):
+        """替换全部订单"""
+        self.beginResetModel()
+        self.orders = list(orders)
+        self.order_ids = [o.id for o in self.orders]
+        self.endResetModel()
+    
+    def order_at(self, row: int) -> Optional[Order]:
+        """获取指定行的订单"""
+        if 0 <= row < len(self.orders):
+            return self.orders[row]
+        return None
+
+
+class MaterialListModel(QAbstractListModel):
+    """物料列表模型（配合QListView只绘制可见行）"""
     
-    def setup_ui(self):
-        layout = QHBoxLayout()
-        self.setLayout(layout)
+    MaterialRole = Qt.UserRole + 1
+    MaterialIdRole = Qt.UserRole + 2
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._materials: List[Material] = []
+        self._thumb_keys: Dict[int, Tuple[bytes, str]] = {}  # material_id -> (图片数据, 缓存键)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._materials)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        material = self._materials[index.row()]
+        if role == Qt.DisplayRole:
+            return material.name
+        if role == Qt.DecorationRole:
+            # 优先使用存储的缩略图，解码成本远低于原图
+            if material.thumbnails:
+                img_bytes = material.thumbnails[0]
+            else:
+                img_bytes = material.images[0] if material.images else None
+            if img_bytes:
+                return ThumbCache.request(
+                    img_bytes, 120, 120,
+                    lambda pixmap, material_id=material.id: self._on_thumb_ready(material_id),
+                    key=self._thumb_key(material.id, img_bytes)
+                )
+            return None
+        if role == self.MaterialRole:
+            return material
+        if role == self.MaterialIdRole:
+            return material.id
+        return None
+    
+    def _thumb_key(self, material_id: int, img_bytes: bytes) -> str:
+        """缓存每个物料的缩略图键，避免每次绘制都对图片做哈希"""
+        cached = self._thumb_keys.get(material_id)
+        if cached is None or cached[0] is not img_bytes:
+            cached = (img_bytes, ThumbCache.make_key(img_bytes, 120, 120))
+            self._thumb_keys[material_id] = cached
+        return cached[1]
+    
+    def _on_thumb_ready(self, material_id: int):
+        """缩略图解码完成后刷新对应行"""
+        row = self.row_of(material_id)
+        if row >= 0:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+    
+    def set_materials(self, materials: List[Material]):
+        """替换全部物料"""
+        self.beginResetModel()
+        self._materials = list(materials)
+        self.endResetModel()
+    
+    def materials(self) -> List[Material]:
+        return self._materials
+    
+    def row_of(self, material_id: int) -> int:
+        """根据物料ID查找行号，不存在返回-1"""
+        for row, material in enumerate(self._materials):
+            if material.id == material_id:
+                return row
+        return -1
+
+
+class MaterialDelegate(QStyledItemDelegate):
+    """物料卡片绘制代理，用QPainter直接绘制卡片内容"""
+    
+    ROW_HEIGHT = 160
+    IMAGE_SIZE = 150
+    
+    def paint(self, painter, option, index):
+        material = index.data(MaterialListModel.MaterialRole)
+        if material is None:
+            return
         
-        # 左侧图片
-        img_label = QLabel()
-        if self.material.images and len(self.material.images) > 0:
-            try:
-                img_bytes = self.material.images[0]
-                if isinstance(img_bytes, bytes):
-                    img = QImage.fromData(img_bytes)
-                    pixmap = QPixmap.fromImage(img)
-                    img_label.setPixmap(pixmap.scaled(120, 120, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                img_label.setAlignment(Qt.AlignCenter)
-            except:
-                img_label.setText("📷\n无图片")
-                img_label.setAlignment(Qt.AlignCenter)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # 卡片背景与边框
+        card = option.rect.adjusted(4, 4, -4, -4)
+        if option.state & QStyle.State_Selected:
+            painter.setPen(CARD_PEN_SELECTED)
         else:
-            img_label.setText("📷\n无图片")
-            img_label.setAlignment(Qt.AlignCenter)
+            painter.setPen(CARD_PEN_NORMAL)
+        painter.setBrush(COLOR_WHITE)
+        painter.drawRoundedRect(card, 5, 5)
         
-        img_label.setFixedSize(150, 150)
-        layout.addWidget(img_label)
+        # 左侧图片
+        img_rect = QRect(card.x() + 5, card.y() + (card.height() - self.IMAGE_SIZE) // 2,
+                         self.IMAGE_SIZE, self.IMAGE_SIZE)
+        pixmap = index.data(Qt.DecorationRole)
+        painter.setPen(COLOR_BLACK)
+        if pixmap is not None and not pixmap.isNull():
+            x = img_rect.x() + (img_rect.width() - pixmap.width()) // 2
+            y = img_rect.y() + (img_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        elif pixmap is None and (material.thumbnails or material.images):
+            # 缩略图加载中
+            painter.drawText(img_rect, Qt.AlignCenter, "📷")
+        else:
+            painter.drawText(img_rect, Qt.AlignCenter, "📷\n无图片")
         
         # 右侧信息
-        info_layout = QVBoxLayout()
+        x = img_rect.right() + 10
+        y = card.y() + 8
         
         # 标题
-        title_layout = QHBoxLayout()
-        name_label = QLabel(self.material.name)
-        name_label.setFont(QFont("Microsoft YaHei", 16, QFont.Bold))
-        title_layout.addWidget(name_label)
-        
-        id_label = QLabel(f"ID: {self.material.id}")
-        id_label.setStyleSheet("background-color: #e9ecef; padding: 5px; border-radius: 3px;")
-        title_layout.addWidget(id_label)
-        info_layout.addLayout(title_layout)
+        name_font = CARD_NAME_FONT
+        painter.setFont(name_font)
+        name_metrics = QFontMetrics(name_font)
+        name_width = name_metrics.horizontalAdvance(material.name)
+        painter.drawText(QRect(x, y, name_width, name_metrics.height()), Qt.AlignVCenter, material.name)
+        
+        painter.setFont(option.font)
+        metrics = QFontMetrics(option.font)
+        id_text = f"ID: {material.id}"
+        id_rect = QRect(x + name_width + 10, y + (name_metrics.height() - metrics.height() - 10) // 2,
+                        metrics.horizontalAdvance(id_text) + 10, metrics.height() + 10)
+        self._draw_chip(painter, id_rect, id_text, ID_CHIP_COLOR, COLOR_BLACK)
+        y += name_metrics.height() + 6
         
         # 类别
-        category_colors = {
-            "试剂": "#28a745",
-            "耗材": "#17a2b8",
-            "设备": "#ffc107",
-            "工具": "#fd7e14",
-            "其他": "#6c757d"
-        }
-        category_color = category_colors.get(self.material.category, "#6c757d")
-        category_label = QLabel(self.material.category)
-        category_label.setStyleSheet(f"background-color: {category_color}; color: white; padding: 5px; border-radius: 3px;")
-        category_label.setFixedWidth(80)
-        info_layout.addWidget(category_label)
+        chip = category_chip_pixmap(material.category)
+        painter.drawPixmap(x, y, chip)
+        y += chip.height() + 6
         
         # 信息
-        info_text = f"数量: {self.material.quantity} {self.material.unit}"
-        if self.material.quantity <= self.material.min_stock:
-            info_text += f" ⚠️ 库存不足"
-        info_label = QLabel(info_text)
-        info_layout.addWidget(info_label)
-        
-        if self.material.location:
-            location_label = QLabel(f"📍 {self.material.location}")
-            info_layout.addWidget(location_label)
-        
-        if self.material.supplier:
-            supplier_label = QLabel(f"🏢 {self.material.supplier}")
-            info_layout.addWidget(supplier_label)
-        
-        layout.addLayout(info_layout)
-        
-        # 鼠标点击事件
-        self.mousePressEvent = self._on_click
-    
-    def _on_click(self, event):
-        self.clicked.emit(self.material.id)
-    
-    def set_selected(self, selected: bool):
-        """设置选中状态"""
-        if selected:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: white;
-                    border: 3px solid #28a745;
-                    border-radius: 5px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: white;
-                    border-radius: 5px;
-                }
-            """)
+        lines = [f"数量: {material.quantity} {material.unit}"]
+        if material.quantity <= material.min_stock:
+            lines[0] += f" ⚠️ 库存不足"
+        if material.location:
+            lines.append(f"📍 {material.location}")
+        if material.supplier:
+            lines.append(f"🏢 {material.supplier}")
+        
+        painter.setPen(COLOR_BLACK)
+        text_width = card.right() - x - 5
+        for line in lines:
+            painter.drawText(QRect(x, y, text_width, metrics.height()), Qt.AlignVCenter, line)
+            y += metrics.height() + 4
+        
+        painter.restore()
+    
+    def _draw_chip(self, painter, rect: QRect, text: str, background: QColor, foreground: QColor):
+        """绘制圆角标签"""
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(background)
+        painter.drawRoundedRect(rect, 3, 3)
+        painter.setPen(foreground)
+        painter.drawText(rect.adjusted(5, 0, -5, 0), Qt.AlignVCenter | Qt.AlignLeft, text)
+    
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
 
 
 class MaterialDetailPanel(QWidget):
-    """物料详情面板"""
+    """物料详情面板（只创建一次，切换物料时通过set_material更新内容）"""
     
     edit_requested = pyqtSignal(int)  # material_id
     delete_requested = pyqtSignal(int)  # material_id
     
-    def __init__(self, material: Material, parent=None):
+    MAX_IMAGES = 3
+    
+    def __init__(self, material: Optional[Material] = None, parent=None):
         super().__init__(parent)
-        self.material = material
+        self.material: Optional[Material] = None
+        self.version = None
+        self._image_generation = 0  # 切换物料后丢弃旧物料迟到的缩略图
         self.setup_ui()
+        if material is not None:
+            self.set_material(material)
     
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -519,82 +945,57 @@ class MaterialDetailPanel(QWidget):
         content.setLayout(scroll_layout)
         
         # 物料名称
-        name_label = QLabel(self.material.name)
-        name_label.setFont(QFont("Microsoft YaHei", 18, QFont.Bold))
-        name_label.setAlignment(Qt.AlignCenter)
-        scroll_layout.addWidget(name_label)
+        self.name_label = QLabel()
+        self.name_label.setFont(DETAIL_NAME_FONT)
+        self.name_label.setAlignment(Qt.AlignCenter)
+        scroll_layout.addWidget(self.name_label)
         
         # 类别
-        category_colors = {
-            "试剂": "#28a745",
-            "耗材": "#17a2b8",
-            "设备": "#ffc107",
-            "工具": "#fd7e14",
-            "其他": "#6c757d"
-        }
-        category_color = category_colors.get(self.material.category, "#6c757d")
-        category_label = QLabel(self.material.category)
-        category_label.setStyleSheet(f"background-color: {category_color}; color: white; padding: 10px; border-radius: 5px;")
-        category_label.setAlignment(Qt.AlignCenter)
-        scroll_layout.addWidget(category_label)
+        self.category_label = QLabel()
+        self.category_label.setAlignment(Qt.AlignCenter)
+        scroll_layout.addWidget(self.category_label)
         
         # 基本信息
         info_group = QGroupBox("基本信息")
         info_layout = QVBoxLayout()
-        info_layout.addWidget(QLabel(f"ID: {self.material.id}"))
-        info_layout.addWidget(QLabel(f"数量: {self.material.quantity} {self.material.unit}"))
-        
-        min_stock_text = f"最低库存: {self.material.min_stock}"
-        if self.material.quantity <= self.material.min_stock:
-            min_stock_label = QLabel(min_stock_text)
-            min_stock_label.setStyleSheet("color: #dc3545;")
-            info_layout.addWidget(min_stock_label)
-        else:
-            info_layout.addWidget(QLabel(min_stock_text))
-        
-        if self.material.location:
-            info_layout.addWidget(QLabel(f"📍 位置: {self.material.location}"))
-        if self.material.supplier:
-            info_layout.addWidget(QLabel(f"🏢 供应商: {self.material.supplier}"))
-        
+        self.id_label = QLabel()
+        info_layout.addWidget(self.id_label)
+        self.quantity_label = QLabel()
+        info_layout.addWidget(self.quantity_label)
+        self.min_stock_label = QLabel()
+        info_layout.addWidget(self.min_stock_label)
+        self.location_label = QLabel()
+        info_layout.addWidget(self.location_label)
+        self.supplier_label = QLabel()
+        info_layout.addWidget(self.supplier_label)
         info_group.setLayout(info_layout)
         scroll_layout.addWidget(info_group)
         
         # 描述
-        if self.material.description:
-            desc_group = QGroupBox("描述")
-            desc_layout = QVBoxLayout()
-            desc_text = QTextEdit()
-            desc_text.setPlainText(self.material.description)
-            desc_text.setReadOnly(True)
-            desc_text.setMaximumHeight(100)
-            desc_layout.addWidget(desc_text)
-            desc_group.setLayout(desc_layout)
-            scroll_layout.addWidget(desc_group)
-        
-        # 图片
-        if self.material.images and len(self.material.images) > 0:
-            img_group = QGroupBox("图片")
-            img_layout = QVBoxLayout()
-            
-            max_images = 3
-            for idx, img_bytes in enumerate(self.material.images[:max_images]):
-                if isinstance(img_bytes, bytes):
-                    try:
-                        img = QImage.fromData(img_bytes)
-                        pixmap = QPixmap.fromImage(img)
-                        label = QLabel()
-                        label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                        label.setAlignment(Qt.AlignCenter)
-                        img_layout.addWidget(label)
-                    except:
-                        pass
-            
-            if len(self.material.images) > max_images:
-                img_layout.addWidget(QLabel(f"...还有 {len(self.material.images) - max_images} 张图片"))
-            
-            img_group.setLayout(img_layout)
-            scroll_layout.addWidget(img_group)
+        self.desc_group = QGroupBox("描述")
+        desc_layout = QVBoxLayout()
+        self.desc_label = QLabel()
+        self.desc_label.setWordWrap(True)
+        self.desc_label.setTextFormat(Qt.PlainText)
+        self.desc_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.desc_label.setStyleSheet(DESCRIPTION_QSS)
+        desc_layout.addWidget(self.desc_label)
+        self.desc_group.setLayout(desc_layout)
+        scroll_layout.addWidget(self.desc_group)
+        
+        # 图片（固定数量的标签，按需显示）
+        self.img_group = QGroupBox("图片")
+        img_layout = QVBoxLayout()
+        self.image_labels: List[QLabel] = []
+        for _ in range(self.MAX_IMAGES):
+            label = QLabel()
+            label.setAlignment(Qt.AlignCenter)
+            img_layout.addWidget(label)
+            self.image_labels.append(label)
+        self.more_images_label = QLabel()
+        img_layout.addWidget(self.more_images_label)
+        self.img_group.setLayout(img_layout)
+        scroll_layout.addWidget(self.img_group)
         
         scroll_layout.addStretch()
         
@@ -611,6 +1012,60 @@ class MaterialDetailPanel(QWidget):
         btn_layout.addWidget(edit_btn)
         btn_layout.addWidget(delete_btn)
         layout.addLayout(btn_layout)
+    
+    def set_material(self, material: Material):
+        """显示指定物料（只更新已有控件的内容，不重建子控件）"""
+        self.material = material
+        self.version = material.version
+        self._image_generation += 1
+        
+        self.name_label.setText(material.name)
+        self.category_label.setPixmap(category_chip_pixmap(material.category, 160, 40, 5))
+        
+        self.id_label.setText(f"ID: {material.id}")
+        self.quantity_label.setText(f"数量: {material.quantity} {material.unit}")
+        self.min_stock_label.setText(f"最低库存: {material.min_stock}")
+        self.min_stock_label.setStyleSheet(
+            WARNING_TEXT_QSS if material.quantity <= material.min_stock else ""
+        )
+        self.location_label.setText(f"📍 位置: {material.location}")
+        self.location_label.setVisible(bool(material.location))
+        self.supplier_label.setText(f"🏢 供应商: {material.supplier}")
+        self.supplier_label.setVisible(bool(material.supplier))
+        
+        self.desc_label.setText(material.description or "")
+        self.desc_group.setVisible(bool(material.description))
+        
+        # 控制器保证图片数据均为bytes
+        images = material.images[:self.MAX_IMAGES]
+        generation = self._image_generation
+        for i, label in enumerate(self.image_labels):
+            if i < len(images):
+                label.setText("📷")
+                pixmap = ThumbCache.request(
+                    images[i], 200, 200,
+                    lambda pm, label=label: self._on_image_ready(label, generation, pm)
+                )
+                if pixmap is not None:
+                    self._on_image_ready(label, generation, pixmap)
+                label.show()
+            else:
+                label.clear()
+                label.hide()
+        
+        extra = len(material.images) - self.MAX_IMAGES
+        self.more_images_label.setText(f"...还有 {extra} 张图片" if extra > 0 else "")
+        self.more_images_label.setVisible(extra > 0)
+        self.img_group.setVisible(bool(material.images))
+    
+    def _on_image_ready(self, label: QLabel, generation: int, pixmap: QPixmap):
+        """缩略图解码完成（仍是同一物料时才显示）"""
+        if generation != self._image_generation:
+            return
+        if pixmap.isNull():
+            label.setText("📷\n无图片")
+        else:
+            label.setPixmap(pixmap)
 
 
 # ==================== ADC 相关UI组件 ====================
@@ -618,7 +1073,7 @@ class MaterialDetailPanel(QWidget):
 class ADCSpecDialog(QDialog):
     """ADC规格编辑对话框"""
     
-    def __init__(self, parent=None, spec: Optional[ADCSpec] = None, preset_specs: List[float] = None):
+    def __init__(self, parent=None, spec: Optional[ADCSpec] = None, preset_specs: Optional[Sequence[float]] = None):
         super().__init__(parent)
         self.spec = spec
         self.preset_specs = preset_specs or PRESET_SPECS
@@ -638,8 +1093,7 @@ class ADCSpecDialog(QDialog):
         
         self.spec_combo = QComboBox()
         self.spec_combo.setEditable(True)
-        for preset in self.preset_specs:
-            self.spec_combo.addItem(f"{preset}")
+        self.spec_combo.addItems([f"{preset}" for preset in self.preset_specs])
         if self.spec:
             self.spec_combo.setCurrentText(f"{self.spec.spec_mg}")
         spec_layout.addWidget(self.spec_combo)
@@ -800,7 +1254,7 @@ class ADCDialog(QDialog):
         
         # 汇总显示（必须在调用_refresh_specs_table之前创建）
         self.total_label = QLabel()
-        self.total_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #007bff;")
+        self.total_label.setStyleSheet(TOTAL_TEXT_QSS)
         specs_layout.addWidget(self.total_label)
         
         # 刷新表格和汇总
@@ -900,7 +1354,7 @@ class ADCDialog(QDialog):
 
 
 class ADCCard(QFrame):
-    """ADC卡片"""
+    """ADC卡片（控件只创建一次，可通过set_adc复用显示其他ADC）"""
     
     clicked = pyqtSignal(int)  # adc_id
     
@@ -909,13 +1363,9 @@ class ADCCard(QFrame):
         self.adc = adc
         self.setFrameStyle(QFrame.Box)
         self.setLineWidth(2)
-        self.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border-radius: 5px;
-            }
-        """)
+        self.setStyleSheet(CARD_QSS_NORMAL)
         self.setup_ui()
+        self.set_adc(adc)
     
     def setup_ui(self):
         layout = QVBoxLayout()
@@ -924,63 +1374,61 @@ class ADCCard(QFrame):
         # 标题行
         title_layout = QHBoxLayout()
         
-        lot_label = QLabel(f"Lot#: {self.adc.lot_number}")
-        lot_label.setFont(QFont("Microsoft YaHei", 12, QFont.Bold))
-        title_layout.addWidget(lot_label)
+        self.lot_label = QLabel()
+        self.lot_label.setFont(ADC_CARD_LOT_FONT)
+        title_layout.addWidget(self.lot_label)
         
         title_layout.addStretch()
         layout.addLayout(title_layout)
         
         # Sample ID
-        sample_label = QLabel(f"Sample ID: {self.adc.sample_id}")
-        sample_label.setStyleSheet("color: #6c757d;")
-        layout.addWidget(sample_label)
+        self.sample_label = QLabel()
+        self.sample_label.setStyleSheet(MUTED_TEXT_QSS)
+        layout.addWidget(self.sample_label)
         
         # Owner
-        if self.adc.owner:
-            owner_label = QLabel(f"👤 {self.adc.owner}")
-            layout.addWidget(owner_label)
+        self.owner_label = QLabel()
+        layout.addWidget(self.owner_label)
         
         # 存储信息
-        storage_info = []
-        if self.adc.storage_temp:
-            storage_info.append(self.adc.storage_temp)
-        if self.adc.storage_position:
-            storage_info.append(self.adc.storage_position)
-        if storage_info:
-            storage_label = QLabel(f"📍 {' / '.join(storage_info)}")
-            layout.addWidget(storage_label)
+        self.storage_label = QLabel()
+        layout.addWidget(self.storage_label)
         
         # 汇总信息
-        total_mg = self.adc.get_total_mg()
-        total_vials = self.adc.get_total_vials()
-        summary_label = QLabel(f"📦 {total_vials} 管 | 总量: {total_mg:.2f} mg")
-        summary_label.setStyleSheet("font-weight: bold; color: #007bff;")
-        layout.addWidget(summary_label)
+        self.summary_label = QLabel()
+        self.summary_label.setStyleSheet(SUMMARY_TEXT_QSS)
+        layout.addWidget(self.summary_label)
         
         # 鼠标点击事件
         self.mousePressEvent = self._on_click
     
+    def set_adc(self, adc: ADC):
+        """显示指定ADC（只更新文字，不重建子控件）"""
+        self.adc = adc
+        self.lot_label.setText(f"Lot#: {adc.lot_number}")
+        self.sample_label.setText(f"Sample ID: {adc.sample_id}")
+        
+        self.owner_label.setText(f"👤 {adc.owner}")
+        self.owner_label.setVisible(bool(adc.owner))
+        
+        storage_info = []
+        if adc.storage_temp:
+            storage_info.append(adc.storage_temp)
+        if adc.storage_position:
+            storage_info.append(adc.storage_position)
+        self.storage_label.setText(f"📍 {' / '.join(storage_info)}")
+        self.storage_label.setVisible(bool(storage_info))
+        
+        total_mg = adc.get_total_mg()
+        total_vials = adc.get_total_vials()
+        self.summary_label.setText(f"📦 {total_vials} 管 | 总量: {total_mg:.2f} mg")
+    
     def _on_click(self, event):
         self.clicked.emit(self.adc.id)
     
     def set_selected(self, selected: bool):
         """设置选中状态"""
-        if selected:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: white;
-                    border: 3px solid #007bff;
-                    border-radius: 5px;
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QFrame {
-                    background-color: white;
-                    border-radius: 5px;
-                }
-            """)
+        self.setStyleSheet(ADC_CARD_QSS_SELECTED if selected else CARD_QSS_NORMAL)
 
 
 class ADCDetailPanel(QWidget):
@@ -1006,15 +1454,15 @@ class ADCDetailPanel(QWidget):
         
         # Lot Number 标题
         lot_label = QLabel(f"Lot#: {self.adc.lot_number}")
-        lot_label.setFont(QFont("Microsoft YaHei", 18, QFont.Bold))
+        lot_label.setFont(DETAIL_NAME_FONT)
         lot_label.setAlignment(Qt.AlignCenter)
         scroll_layout.addWidget(lot_label)
         
         # Sample ID
         sample_label = QLabel(f"Sample ID: {self.adc.sample_id}")
-        sample_label.setFont(QFont("Microsoft YaHei", 14))
+        sample_label.setFont(DETAIL_SUBTITLE_FONT)
         sample_label.setAlignment(Qt.AlignCenter)
-        sample_label.setStyleSheet("color: #6c757d;")
+        sample_label.setStyleSheet(MUTED_TEXT_QSS)
         scroll_layout.addWidget(sample_label)
         
         # 基本信息
@@ -1069,11 +1517,12 @@ class ADCDetailPanel(QWidget):
         if self.adc.description:
             desc_group = QGroupBox("描述")
             desc_layout = QVBoxLayout()
-            desc_text = QTextEdit()
-            desc_text.setPlainText(self.adc.description)
-            desc_text.setReadOnly(True)
-            desc_text.setMaximumHeight(80)
-            desc_layout.addWidget(desc_text)
+            desc_label = QLabel(self.adc.description)
+            desc_label.setWordWrap(True)
+            desc_label.setTextFormat(Qt.PlainText)
+            desc_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            desc_label.setStyleSheet(DESCRIPTION_QSS)
+            desc_layout.addWidget(desc_label)
             desc_group.setLayout(desc_layout)
             scroll_layout.addWidget(desc_group)
         
@@ -1109,7 +1558,7 @@ class ADCDetailPanel(QWidget):
         total_mg = self.adc.get_total_mg()
         total_vials = self.adc.get_total_vials()
         total_label = QLabel(f"汇总: {total_vials} 个小管, 共计 {total_mg:.2f} mg")
-        total_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #007bff;")
+        total_label.setStyleSheet(TOTAL_TEXT_QSS)
         specs_layout.addWidget(total_label)
         
         specs_group.setLayout(specs_layout)
@@ -1137,7 +1586,7 @@ class ADCDetailPanel(QWidget):
 class ADCMovementItemDialog(QDialog):
     """出入库明细编辑对话框"""
     
-    def __init__(self, parent=None, item: Optional[Dict] = None, preset_specs: List[float] = None):
+    def __init__(self, parent=None, item: Optional[Dict] = None, preset_specs: Optional[Sequence[float]] = None):
         super().__init__(parent)
         self.item = item
         self.preset_specs = preset_specs or PRESET_SPECS
@@ -1156,8 +1605,7 @@ class ADCMovementItemDialog(QDialog):
         spec_layout.addWidget(QLabel("规格 (mg):"))
         self.spec_combo = QComboBox()
         self.spec_combo.setEditable(True)
-        for preset in self.preset_specs:
-            self.spec_combo.addItem(f"{preset}")
+        self.spec_combo.addItems([f"{preset}" for preset in self.preset_specs])
         if self.item:
             self.spec_combo.setCurrentText(f"{self.item.get('spec_mg', '')}")
         spec_layout.addWidget(self.spec_combo)
@@ -1359,8 +1807,8 @@ class ADCOutboundDialog(QDialog):
         
         self.total_label.setText(f"合计: {total_vials} 个小管, {total_mg:.2f} mg")
     
-    def _get_available_specs(self) -> List[float]:
-        """获取当前选中LotNumber的可用规格列表"""
+    def _get_available_specs(self) -> Sequence[float]:
+        """获取当前选中LotNumber的可用规格列表（无可用规格时返回共享的只读预设元组）"""
         lot_number = self.lot_combo.currentText().strip()
         if self.adc_controller and lot_number:
             adc = self.adc_controller.get_adc_by_lot_number(lot_number)
@@ -1666,13 +2114,32 @@ class MainWindow(QMainWindow):
         self._init_controllers()
         
         # 物料相关缓存
-        self.material_cards = {}
-        self.detail_panels = {}
+        self.material_model = MaterialListModel(self)
+        self.material_detail_panel: Optional[MaterialDetailPanel] = None  # 唯一的详情面板，复用显示
         self.selected_material_id = None
+        self._all_materials: List[Material] = []
+        
+        # 搜索防抖：停止输入一段时间后再执行搜索
+        self._material_search_timer = QTimer(self)
+        self._material_search_timer.setSingleShot(True)
+        self._material_search_timer.timeout.connect(self.search_materials)
+        self._adc_search_timer = QTimer(self)
+        self._adc_search_timer.setSingleShot(True)
+        self._adc_search_timer.timeout.connect(self.search_adcs)
+        self._movement_search_timer = QTimer(self)
+        self._movement_search_timer.setSingleShot(True)
+        self._movement_search_timer.timeout.connect(self.search_adc_movements)
         
         # ADC相关缓存
         self.adc_cards = {}
+        self._pending_adcs: Sequence[ADC] = ()  # 待创建卡片的ADC（分批创建，直接引用控制器返回的元组）
+        self._pending_adc_pos = 0  # 下一批在_pending_adcs中的起始位置
+        self._reusable_adc_cards: Dict[int, ADCCard] = {}  # 刷新时可复用的卡片
+        self._adc_card_pool: List[ADCCard] = []  # 空闲卡片池，复用时通过set_adc更新内容
+        self.adc_card_pool_size = 64
+        self._adc_batch_generation = 0
         self.adc_detail_panels = {}
+        self._current_adc_detail_panel: Optional[QWidget] = None  # 当前显示的详情面板
         self.selected_adc_id = None
         
         self.setup_ui()
@@ -1781,7 +2248,7 @@ class MainWindow(QMainWindow):
         
         toolbar.addWidget(QLabel("搜索:"))
         self.material_search_edit = QLineEdit()
-        self.material_search_edit.textChanged.connect(self.search_materials)
+        self.material_search_edit.textChanged.connect(lambda: self._material_search_timer.start(150))
         toolbar.addWidget(self.material_search_edit)
         
         toolbar.addStretch()
@@ -1795,24 +2262,31 @@ class MainWindow(QMainWindow):
         list_layout = QVBoxLayout()
         list_widget.setLayout(list_layout)
         
-        self.material_scroll = QScrollArea()
-        self.material_scroll.setWidgetResizable(True)
-        self.material_scroll.setWidget(QWidget())
-        list_layout.addWidget(self.material_scroll)
+        self.material_list_view = QListView()
+        self.material_list_view.setModel(self.material_model)
+        self.material_list_view.setItemDelegate(MaterialDelegate(self.material_list_view))
+        self.material_list_view.setUniformItemSizes(True)
+        self.material_list_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.material_list_view.setSelectionMode(QListView.SingleSelection)
+        self.material_list_view.clicked.connect(self._on_material_index_clicked)
+        list_layout.addWidget(self.material_list_view)
         
         splitter.addWidget(list_widget)
         splitter.setStretchFactor(0, 2)
         
         # 右侧详情面板
-        self.detail_widget = QWidget()
-        self.detail_layout = QVBoxLayout()
-        self.detail_widget.setLayout(self.detail_layout)
+        self.detail_stack = QStackedWidget()
         
         self.detail_placeholder = QLabel("请点击左侧物料卡片查看详情")
         self.detail_placeholder.setAlignment(Qt.AlignCenter)
-        self.detail_layout.addWidget(self.detail_placeholder)
+        self.detail_stack.addWidget(self.detail_placeholder)
+        
+        self.material_detail_panel = MaterialDetailPanel(parent=self.detail_stack)
+        self.material_detail_panel.edit_requested.connect(self.edit_material_by_id)
+        self.material_detail_panel.delete_requested.connect(self.delete_material_by_id)
+        self.detail_stack.addWidget(self.material_detail_panel)
         
-        splitter.addWidget(self.detail_widget)
+        splitter.addWidget(self.detail_stack)
         splitter.setStretchFactor(1, 1)
         
         layout.addWidget(splitter)
@@ -1855,11 +2329,11 @@ class MainWindow(QMainWindow):
         layout.addLayout(toolbar)
         
         # 订单表格
-        self.order_table = QTableWidget()
-        self.order_table.setColumnCount(7)
-        self.order_table.setHorizontalHeaderLabels(["ID", "订单号", "申请人", "部门", "状态", "优先级", "创建时间"])
+        self.order_model = OrderTableModel(self)
+        self.order_table = QTableView()
+        self.order_table.setModel(self.order_model)
         self.order_table.horizontalHeader().setStretchLastSection(True)
-        self.order_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.order_table.setSelectionBehavior(QTableView.SelectRows)
         layout.addWidget(self.order_table)
     
     def setup_adc_tab(self, parent):
@@ -1905,25 +2379,25 @@ class MainWindow(QMainWindow):
         toolbar_row2.addWidget(QLabel("LotNumber:"))
         self.adc_lot_search_edit = QLineEdit()
         self.adc_lot_search_edit.setPlaceholderText("搜索LotNumber")
-        self.adc_lot_search_edit.textChanged.connect(self.search_adcs)
+        self.adc_lot_search_edit.textChanged.connect(lambda: self._adc_search_timer.start(250))
         toolbar_row2.addWidget(self.adc_lot_search_edit)
         
         toolbar_row2.addWidget(QLabel("SampleID:"))
         self.adc_search_edit = QLineEdit()
         self.adc_search_edit.setPlaceholderText("搜索SampleID")
-        self.adc_search_edit.textChanged.connect(self.search_adcs)
+        self.adc_search_edit.textChanged.connect(lambda: self._adc_search_timer.start(250))
         toolbar_row2.addWidget(self.adc_search_edit)
         
         toolbar_row2.addWidget(QLabel("Antibody:"))
         self.adc_antibody_search_edit = QLineEdit()
         self.adc_antibody_search_edit.setPlaceholderText("搜索Antibody")
-        self.adc_antibody_search_edit.textChanged.connect(self.search_adcs)
+        self.adc_antibody_search_edit.textChanged.connect(lambda: self._adc_search_timer.start(250))
         toolbar_row2.addWidget(self.adc_antibody_search_edit)
         
         toolbar_row2.addWidget(QLabel("Linker-payload:"))
         self.adc_linker_search_edit = QLineEdit()
         self.adc_linker_search_edit.setPlaceholderText("搜索Linker-payload")
-        self.adc_linker_search_edit.textChanged.connect(self.search_adcs)
+        self.adc_linker_search_edit.textChanged.connect(lambda: self._adc_search_timer.start(250))
         toolbar_row2.addWidget(self.adc_linker_search_edit)
         
         toolbar_row2.addStretch()
@@ -1939,7 +2413,12 @@ class MainWindow(QMainWindow):
         
         self.adc_scroll = QScrollArea()
         self.adc_scroll.setWidgetResizable(True)
-        self.adc_scroll.setWidget(QWidget())
+        # 卡片容器只创建一次，刷新时在原布局中增删卡片
+        self._adc_card_container = QWidget()
+        self._adc_card_layout = QVBoxLayout()
+        self._adc_card_container.setLayout(self._adc_card_layout)
+        self._adc_card_layout.addStretch()
+        self.adc_scroll.setWidget(self._adc_card_container)
         list_layout.addWidget(self.adc_scroll)
         
         splitter.addWidget(list_widget)
@@ -1999,14 +2478,14 @@ class MainWindow(QMainWindow):
         toolbar_row2.addWidget(QLabel("LotNumber:"))
         self.movement_search_edit = QLineEdit()
         self.movement_search_edit.setPlaceholderText("输入LotNumber")
-        self.movement_search_edit.textChanged.connect(self.search_adc_movements)
+        self.movement_search_edit.textChanged.connect(lambda: self._movement_search_timer.start(250))
         toolbar_row2.addWidget(self.movement_search_edit)
         
         # 操作人搜索
         toolbar_row2.addWidget(QLabel("操作人:"))
         self.movement_operator_edit = QLineEdit()
         self.movement_operator_edit.setPlaceholderText("输入操作人")
-        self.movement_operator_edit.textChanged.connect(self.search_adc_movements)
+        self.movement_operator_edit.textChanged.connect(lambda: self._movement_search_timer.start(250))
         toolbar_row2.addWidget(self.movement_operator_edit)
         
         # 日期范围筛选
@@ -2069,7 +2548,7 @@ class MainWindow(QMainWindow):
         detail_layout = QVBoxLayout()
         
         self.movement_lot_label = QLabel("请选择一条记录")
-        self.movement_lot_label.setStyleSheet("font-weight: bold; font-size: 14px; color: #007bff;")
+        self.movement_lot_label.setStyleSheet(TOTAL_TEXT_QSS)
         detail_layout.addWidget(self.movement_lot_label)
         
         self.movement_detail_label = QLabel("")
@@ -2218,20 +2697,20 @@ class MainWindow(QMainWindow):
         """更新出入库历史表格"""
         movements = self.adc_controller.search_movements_by_lot_number(lot_number)
         
+        # 只增减行数，保留的行原地更新文字
         self.movement_history_table.setRowCount(len(movements))
         
         for row, movement in enumerate(movements):
             # 类型
             type_text = "入库" if movement['type'] == 'inbound' else "出库"
-            type_item = QTableWidgetItem(type_text)
+            type_item = set_cell_text(self.movement_history_table, row, 0, type_text)
             if movement['type'] == 'inbound':
-                type_item.setBackground(QColor("#d4edda"))
+                type_item.setBackground(INBOUND_ROW_COLOR)
             else:
-                type_item.setBackground(QColor("#f8d7da"))
-            self.movement_history_table.setItem(row, 0, type_item)
+                type_item.setBackground(OUTBOUND_ROW_COLOR)
             
             # 操作人
-            self.movement_history_table.setItem(row, 1, QTableWidgetItem(movement['operator']))
+            set_cell_text(self.movement_history_table, row, 1, movement['operator'])
             
             # 日期
             date_str = ""
@@ -2246,7 +2725,7 @@ class MainWindow(QMainWindow):
                         date_str = str(movement['date'])
                 else:
                     date_str = str(movement['date'])
-            self.movement_history_table.setItem(row, 2, QTableWidgetItem(date_str))
+            set_cell_text(self.movement_history_table, row, 2, date_str)
             
             # 明细
             items = movement['items']
@@ -2255,7 +2734,7 @@ class MainWindow(QMainWindow):
                 else f"{item.get('spec_mg', 0)}mg×{item.get('quantity', 0)}"
                 for item in items
             ])
-            self.movement_history_table.setItem(row, 3, QTableWidgetItem(items_str))
+            set_cell_text(self.movement_history_table, row, 3, items_str)
             
             # 合计
             total_mg = sum([
@@ -2263,7 +2742,7 @@ class MainWindow(QMainWindow):
                 else item.get('spec_mg', 0) * item.get('quantity', 0)
                 for item in items
             ])
-            self.movement_history_table.setItem(row, 4, QTableWidgetItem(f"{total_mg:.2f}"))
+            set_cell_text(self.movement_history_table, row, 4, f"{total_mg:.2f}")
     
     def _update_movement_stock(self, lot_number: str):
         """更新当前库存表格"""
@@ -2547,11 +3026,7 @@ class MainWindow(QMainWindow):
         self.workflow_btn_step_remove.setEnabled(can_edit)
         self.workflow_btn_add_result.setEnabled(can_edit)
         self.workflow_btn_del_wf.setEnabled(can_edit)
-        import json
-        try:
-            raw = json.loads(workflow.raw_request_json) if workflow.raw_request_json else {}
-        except Exception:
-            raw = {}
+        raw = workflow.raw_request
         ordered = ordered_request_items_for_display(raw)
         self.workflow_request_table.setRowCount(len(ordered))
         for row, (key, type_str, optional_label, value_str) in enumerate(ordered):
@@ -2565,12 +3040,12 @@ class MainWindow(QMainWindow):
             value_item = QTableWidgetItem(value_str)
             value_item.setTextAlignment(Qt.AlignCenter)
             if value_str == "null":
-                value_item.setForeground(QColor("#6c757d"))
+                value_item.setForeground(MUTED_TEXT_COLOR)
                 f = value_item.font()
                 f.setItalic(True)
                 value_item.setFont(f)
             self.workflow_request_table.setItem(row, 3, value_item)
-        step_types = {t.id: t.name for t in self.workflow_controller.get_all_step_types(active_only=False)}
+        step_types = self.workflow_controller.get_step_type_id_to_name()
         self.workflow_steps_table.setRowCount(len(workflow.steps))
         for row, s in enumerate(workflow.steps):
             self.workflow_steps_table.setItem(row, 0, QTableWidgetItem(str(s.step_order + 1)))
@@ -2621,7 +3096,7 @@ class MainWindow(QMainWindow):
         steps = list(w.steps)
         steps[row], steps[row - 1] = steps[row - 1], steps[row]
         names = []
-        type_id_to_name = {t.id: t.name for t in self.workflow_controller.get_all_step_types(active_only=False)}
+        type_id_to_name = self.workflow_controller.get_step_type_id_to_name()
         for s in steps:
             names.append(type_id_to_name.get(s.step_type_id, ""))
         self.workflow_controller.update_workflow_steps(self._current_workflow_id, names)
@@ -2638,7 +3113,7 @@ class MainWindow(QMainWindow):
         w = self._current_workflow
         steps = list(w.steps)
         steps[row], steps[row + 1] = steps[row + 1], steps[row]
-        type_id_to_name = {t.id: t.name for t in self.workflow_controller.get_all_step_types(active_only=False)}
+        type_id_to_name = self.workflow_controller.get_step_type_id_to_name()
         names = [type_id_to_name.get(s.step_type_id, "") for s in steps]
         self.workflow_controller.update_workflow_steps(self._current_workflow_id, names)
         self._on_workflow_selected()
@@ -2656,7 +3131,7 @@ class MainWindow(QMainWindow):
         if not ok or not name:
             return
         w = self._current_workflow
-        type_id_to_name = {t.id: t.name for t in self.workflow_controller.get_all_step_types(active_only=False)}
+        type_id_to_name = self.workflow_controller.get_step_type_id_to_name()
         names = [type_id_to_name.get(s.step_type_id, "") for s in w.steps]
         names.append(name)
         self.workflow_controller.update_workflow_steps(self._current_workflow_id, names)
@@ -2671,7 +3146,7 @@ class MainWindow(QMainWindow):
         if row < 0:
             return
         w = self._current_workflow
-        type_id_to_name = {t.id: t.name for t in self.workflow_controller.get_all_step_types(active_only=False)}
+        type_id_to_name = self.workflow_controller.get_step_type_id_to_name()
         names = [type_id_to_name.get(s.step_type_id, "") for i, s in enumerate(w.steps) if i != row]
         self.workflow_controller.update_workflow_steps(self._current_workflow_id, names)
         flow_str = "+".join(names)
@@ -2774,7 +3249,7 @@ class MainWindow(QMainWindow):
 
         def _add_summary_row(r: int, name: str, value: str) -> None:
             name_label = QLabel(name)
-            name_label.setStyleSheet("color: #6b7280;")
+            name_label.setStyleSheet(HINT_TEXT_QSS)
             value_label = QLabel(value)
             v_font = value_label.font()
             v_font.setBold(True)
@@ -2816,7 +3291,7 @@ class MainWindow(QMainWindow):
             value_item = QTableWidgetItem(value_str)
             value_item.setTextAlignment(Qt.AlignCenter)
             if value_str == "null":
-                value_item.setForeground(QColor("#6c757d"))
+                value_item.setForeground(MUTED_TEXT_COLOR)
                 f = value_item.font()
                 f.setItalic(True)
                 value_item.setFont(f)
@@ -2900,7 +3375,7 @@ class MainWindow(QMainWindow):
 
         # 底部提示
         hint_label = QLabel("提示：修改任意输入参数后，点击上方按钮以刷新右侧结果与计算说明。")
-        hint_label.setStyleSheet("color: #6b7280;")
+        hint_label.setStyleSheet(HINT_TEXT_QSS)
         dar8_form.addWidget(hint_label, row, 0, 1, 2)
         row += 1
 
@@ -2938,7 +3413,7 @@ class MainWindow(QMainWindow):
             box.setFixedSize(14, 14)
             box.setStyleSheet(f"background-color: {color}; border: 1px solid #cbd5e1; border-radius: 3px;")
             lbl = QLabel(text)
-            lbl.setStyleSheet("color: #6b7280;")
+            lbl.setStyleSheet(HINT_TEXT_QSS)
             lay.addWidget(box)
             lay.addWidget(lbl)
             return w
@@ -3174,11 +3649,7 @@ class MainWindow(QMainWindow):
             return
         user_id, role, w = t
         default_purification = w.purification_flow_string or ""
-        try:
-            import json
-            raw = json.loads(w.raw_request_json) if w.raw_request_json else {}
-        except Exception:
-            raw = {}
+        raw = w.raw_request
         default_sample = (raw.get("Product ID") or raw.get("Request ID") or w.request_sn or "")
         if isinstance(default_sample, (int, float)):
             default_sample = str(int(default_sample))
@@ -3306,18 +3777,18 @@ class MainWindow(QMainWindow):
         info_label.setWordWrap(True)
         layout.addWidget(info_label)
         
-        self.report_table = QTableWidget()
-        self.report_table.setColumnCount(7)
-        self.report_table.setHorizontalHeaderLabels(["ID", "订单号", "申请人", "部门", "状态", "优先级", "创建时间"])
-        self.report_table.setSelectionMode(QTableWidget.ExtendedSelection)
-        self.report_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.report_model = OrderTableModel(self)
+        self.report_table = QTableView()
+        self.report_table.setModel(self.report_model)
+        self.report_table.setSelectionMode(QTableView.ExtendedSelection)
+        self.report_table.setSelectionBehavior(QTableView.SelectRows)
         self.report_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.report_table)
         
         btn_layout = QHBoxLayout()
-        generate_btn = QPushButton("生成报告")
-        generate_btn.clicked.connect(self.generate_report)
-        btn_layout.addWidget(generate_btn)
+        self.generate_report_btn = QPushButton("生成报告")
+        self.generate_report_btn.clicked.connect(self.generate_report)
+        btn_layout.addWidget(self.generate_report_btn)
         
         refresh_btn = QPushButton("刷新订单列表")
         refresh_btn.clicked.connect(self.refresh_report_orders)
@@ -3369,12 +3840,13 @@ class MainWindow(QMainWindow):
         self._init_controllers()
         
         # 清空缓存
-        self.material_cards.clear()
-        self.detail_panels.clear()
+        self._all_materials = []
+        self.material_model.set_materials([])
         self.selected_material_id = None
-        self.adc_cards.clear()
-        self.adc_detail_panels.clear()
-        self.selected_adc_id = None
+        if self.material_detail_panel is not None:
+            self.detail_stack.setCurrentWidget(self.detail_placeholder)
+        # 卡片容器是持久的，需要真正移除旧库的卡片和详情面板
+        self.update_adc_cards([])
         
         # 更新路径标签
         self._update_db_path_label()
@@ -3455,79 +3927,47 @@ class MainWindow(QMainWindow):
     
     def refresh_materials(self):
         """刷新物料列表"""
-        materials = self.material_controller.get_all_materials()
-        self.update_material_cards(materials)
+        self._all_materials = self.material_controller.get_all_materials_with_thumbs_only()
+        self.search_materials()
     
     def update_material_cards(self, materials: List[Material]):
-        """更新物料卡片"""
-        # 清空现有卡片
-        for card in self.material_cards.values():
-            card.deleteLater()
-        self.material_cards.clear()
-        
-        # 清空详情面板缓存
-        for panel in self.detail_panels.values():
-            panel.deleteLater()
-        self.detail_panels.clear()
-        
-        self.selected_material_id = None
+        """更新物料列表（只替换模型数据，视图按需绘制可见行）"""
+        self.material_model.set_materials(materials)
         
-        # 创建新卡片
-        container = QWidget()
-        layout = QVBoxLayout()
-        container.setLayout(layout)
-        
-        for material in materials:
-            card = MaterialCard(material)
-            card.clicked.connect(self._on_material_card_clicked)
-            layout.addWidget(card)
-            self.material_cards[material.id] = card
-        
-        layout.addStretch()
-        
-        self.material_scroll.setWidget(container)
-        
-        # 显示placeholder
-        self.detail_placeholder.show()
+        row = self.material_model.row_of(self.selected_material_id) if self.selected_material_id else -1
+        if row < 0:
+            self.selected_material_id = None
+            # 显示placeholder
+            self.detail_stack.setCurrentWidget(self.detail_placeholder)
+        else:
+            # 恢复选中状态
+            self.material_list_view.setCurrentIndex(self.material_model.index(row))
+            if self.material_model.materials()[row].version != self.material_detail_panel.version:
+                # 选中的物料有更新，重新显示详情
+                self._show_material_detail(self.selected_material_id)
+    
+    def _on_material_index_clicked(self, index: QModelIndex):
+        """物料列表行点击事件"""
+        material_id = index.data(MaterialListModel.MaterialIdRole)
+        if material_id is not None:
+            self._on_material_card_clicked(material_id)
     
     def _on_material_card_clicked(self, material_id: int):
         """物料卡片点击事件"""
-        # 取消之前选中的卡片
-        if self.selected_material_id:
-            if self.selected_material_id in self.material_cards:
-                self.material_cards[self.selected_material_id].set_selected(False)
-        
-        # 选中当前卡片
-        if material_id in self.material_cards:
-            self.material_cards[material_id].set_selected(True)
         self.selected_material_id = material_id
         
         # 显示详情
         self._show_material_detail(material_id)
     
     def _show_material_detail(self, material_id: int):
-        """显示物料详情"""
-        # 隐藏placeholder
-        self.detail_placeholder.hide()
-        
-        # 如果已经有缓存的面板，直接显示
-        if material_id in self.detail_panels:
-            for mid, panel in self.detail_panels.items():
-                panel.hide()
-            self.detail_panels[material_id].show()
-            return
-        
-        # 从缓存获取物料信息
-        material = self.material_controller.get_material(material_id)
+        """显示物料详情（复用同一个面板，只更新内容）"""
+        # 获取含原图的物料信息（控制器内有LRU缓存）
+        material = self.material_controller.get_material_full(material_id)
         if not material:
             return
         
-        # 创建新的详情面板并缓存
-        panel = MaterialDetailPanel(material, self.detail_widget)
-        panel.edit_requested.connect(self.edit_material_by_id)
-        panel.delete_requested.connect(self.delete_material_by_id)
-        self.detail_panels[material_id] = panel
-        self.detail_layout.addWidget(panel)
+        self.material_detail_panel.set_material(material)
+        self.detail_stack.setCurrentWidget(self.material_detail_panel)
     
     def add_material(self):
         """添加物料"""
@@ -3552,7 +3992,7 @@ class MainWindow(QMainWindow):
     
     def edit_material_by_id(self, material_id: int):
         """根据ID编辑物料"""
-        material = self.material_controller.get_material(material_id)
+        material = self.material_controller.get_material_full(material_id)
         if not material:
             QMessageBox.critical(self, "错误", "物料不存在")
             return
@@ -3590,12 +4030,13 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "错误", f"删除失败: {str(e)}")
     
     def search_materials(self):
-        """搜索物料"""
+        """搜索物料（在已加载的物料列表中过滤，不重新查询）"""
+        self._material_search_timer.stop()
         keyword = self.material_search_edit.text()
         if keyword:
-            materials = self.material_controller.search_materials(keyword)
+            materials = self.material_controller.filter_materials(self._all_materials, keyword)
         else:
-            materials = self.material_controller.get_all_materials()
+            materials = self._all_materials
         
         self.update_material_cards(materials)
     
@@ -3604,32 +4045,12 @@ class MainWindow(QMainWindow):
     def refresh_orders(self):
         """刷新订单列表"""
         orders = self.order_controller.get_all_orders()
-        self.order_table.setRowCount(len(orders))
-        
-        for row, order in enumerate(orders):
-            self.order_table.setItem(row, 0, QTableWidgetItem(str(order.id)))
-            self.order_table.setItem(row, 1, QTableWidgetItem(order.order_number))
-            self.order_table.setItem(row, 2, QTableWidgetItem(order.requester))
-            self.order_table.setItem(row, 3, QTableWidgetItem(order.department or ""))
-            self.order_table.setItem(row, 4, QTableWidgetItem(order.status))
-            self.order_table.setItem(row, 5, QTableWidgetItem(order.priority))
-            created_at = order.created_at.strftime('%Y-%m-%d %H:%M') if order.created_at else 'N/A'
-            self.order_table.setItem(row, 6, QTableWidgetItem(created_at))
+        self.order_model.set_orders(orders)
     
     def refresh_report_orders(self):
         """刷新报告页面的订单列表"""
         orders = self.order_controller.get_all_orders()
-        self.report_table.setRowCount(len(orders))
-        
-        for row, order in enumerate(orders):
-            self.report_table.setItem(row, 0, QTableWidgetItem(str(order.id)))
-            self.report_table.setItem(row, 1, QTableWidgetItem(order.order_number))
-            self.report_table.setItem(row, 2, QTableWidgetItem(order.requester))
-            self.report_table.setItem(row, 3, QTableWidgetItem(order.department or ""))
-            self.report_table.setItem(row, 4, QTableWidgetItem(order.status))
-            self.report_table.setItem(row, 5, QTableWidgetItem(order.priority))
-            created_at = order.created_at.strftime('%Y-%m-%d %H:%M') if order.created_at else 'N/A'
-            self.report_table.setItem(row, 6, QTableWidgetItem(created_at))
+        self.report_model.set_orders(orders)
     
     def create_order(self):
         """创建订单"""
@@ -3646,13 +4067,12 @@ class MainWindow(QMainWindow):
     
     def edit_order(self):
         """编辑订单"""
-        current_row = self.order_table.currentRow()
-        if current_row < 0:
+        current = self.order_model.order_at(self.order_table.currentIndex().row())
+        if current is None:
             QMessageBox.warning(self, "警告", "请选择要编辑的订单")
             return
         
-        order_id = int(self.order_table.item(current_row, 0).text())
-        order = self.order_controller.get_order(order_id)
+        order = self.order_controller.get_order(current.id)
         
         if order:
             dialog = OrderDialog(self, order, self.material_controller)
@@ -3668,13 +4088,13 @@ class MainWindow(QMainWindow):
     
     def complete_order(self):
         """完成订单"""
-        current_row = self.order_table.currentRow()
-        if current_row < 0:
+        current = self.order_model.order_at(self.order_table.currentIndex().row())
+        if current is None:
             QMessageBox.warning(self, "警告", "请选择要完成的订单")
             return
         
-        order_id = int(self.order_table.item(current_row, 0).text())
-        order_number = self.order_table.item(current_row, 1).text()
+        order_id = current.id
+        order_number = current.order_number
         
         if QMessageBox.question(self, "确认完成订单", 
                               f"确定要完成订单 {order_number} 吗？\n\n"
@@ -3696,13 +4116,13 @@ class MainWindow(QMainWindow):
     
     def cancel_order(self):
         """取消订单"""
-        current_row = self.order_table.currentRow()
-        if current_row < 0:
+        current = self.order_model.order_at(self.order_table.currentIndex().row())
+        if current is None:
             QMessageBox.warning(self, "警告", "请选择要取消的订单")
             return
         
         if QMessageBox.question(self, "确认", "确定要取消选中的订单吗？") == QMessageBox.Yes:
-            order_id = int(self.order_table.item(current_row, 0).text())
+            order_id = current.id
             try:
                 self.order_controller.cancel_order(order_id)
                 QMessageBox.information(self, "成功", "订单已取消")
@@ -3718,50 +4138,45 @@ class MainWindow(QMainWindow):
         else:
             orders = self.order_controller.get_orders_by_status(status)
         
-        self.order_table.setRowCount(len(orders))
-        for row, order in enumerate(orders):
-            self.order_table.setItem(row, 0, QTableWidgetItem(str(order.id)))
-            self.order_table.setItem(row, 1, QTableWidgetItem(order.order_number))
-            self.order_table.setItem(row, 2, QTableWidgetItem(order.requester))
-            self.order_table.setItem(row, 3, QTableWidgetItem(order.department or ""))
-            self.order_table.setItem(row, 4, QTableWidgetItem(order.status))
-            self.order_table.setItem(row, 5, QTableWidgetItem(order.priority))
-            created_at = order.created_at.strftime('%Y-%m-%d %H:%M') if order.created_at else 'N/A'
-            self.order_table.setItem(row, 6, QTableWidgetItem(created_at))
+        self.order_model.set_orders(orders)
     
     def generate_report(self):
         """生成订单报告"""
-        selected_ranges = self.report_table.selectedRanges()
-        if not selected_ranges:
-            QMessageBox.warning(self, "警告", "请选择要生成报告的订单")
-            return
-        
-        order_ids = set()
-        for range_item in selected_ranges:
-            top_row = range_item.topRow()
-            bottom_row = range_item.bottomRow()
-            for row in range(top_row, bottom_row + 1):
-                if self.report_table.item(row, 0):
-                    order_id = int(self.report_table.item(row, 0).text())
-                    order_ids.add(order_id)
+        row_to_order_id = self.report_model.order_ids
+        order_ids = {
+            row_to_order_id[index.row()]
+            for index in self.report_table.selectionModel().selectedRows(0)
+        }
         
         if not order_ids:
             QMessageBox.warning(self, "警告", "请选择要生成报告的订单")
             return
         
-        try:
-            html_content = self.report_controller.generate_order_report(list(order_ids))
-            
-            filename, _ = QFileDialog.getSaveFileName(
-                self, "保存报告", "order_report.html", "HTML文件 (*.html)"
-            )
-            
-            if filename:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    f.write(html_content)
-                QMessageBox.information(self, "成功", f"报告已保存到: {filename}")
-        except Exception as e:
-            QMessageBox.critical(self, "错误", f"生成报告失败: {str(e)}")
+        filename, _ = QFileDialog.getSaveFileName(
+            self, "保存报告", "order_report.html", "HTML文件 (*.html)"
+        )
+        if not filename:
+            return
+        
+        # 报告生成和写文件放到线程池，界面保持响应
+        worker = ReportWorker(self.report_controller, list(order_ids), filename)
+        worker.signals.finished.connect(self._on_report_finished)
+        worker.signals.failed.connect(self._on_report_failed)
+        self.generate_report_btn.setEnabled(False)
+        self.statusBar().showMessage("正在生成报告...")
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_report_finished(self, filename: str):
+        """报告生成完成"""
+        self.generate_report_btn.setEnabled(True)
+        self.statusBar().clearMessage()
+        QMessageBox.information(self, "成功", f"报告已保存到: {filename}")
+    
+    def _on_report_failed(self, error: str):
+        """报告生成失败"""
+        self.generate_report_btn.setEnabled(True)
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "错误", f"生成报告失败: {error}")
     
     # ==================== ADC相关方法 ====================
     
@@ -3770,38 +4185,83 @@ class MainWindow(QMainWindow):
         adcs = self.adc_controller.get_all_adcs()
         self.update_adc_cards(adcs)
     
-    def update_adc_cards(self, adcs: List[ADC]):
-        """更新ADC卡片"""
-        # 清空现有卡片
-        for card in self.adc_cards.values():
-            card.deleteLater()
+    def update_adc_cards(self, adcs: Sequence[ADC]):
+        """更新ADC卡片（复用数据未变化的卡片，容器和布局保持不变）"""
+        new_adcs = {adc.id: adc for adc in adcs}
+        layout = self._adc_card_layout
+        
+        # 取消选中
+        if self.selected_adc_id in self.adc_cards:
+            self.adc_cards[self.selected_adc_id].set_selected(False)
+        
+        # 上次刷新尚未放回布局的卡片（分批未完成）直接回收
+        for card in self._reusable_adc_cards.values():
+            self._release_adc_card(card)
+        
+        # 从布局中取出所有卡片：数据未变化的暂时隐藏等待按新顺序放回，其余回收到卡片池
+        reusable = {}
+        for adc_id, card in self.adc_cards.items():
+            layout.removeWidget(card)
+            if new_adcs.get(adc_id) == card.adc:
+                card.hide()
+                reusable[adc_id] = card
+            else:
+                self._release_adc_card(card)
         self.adc_cards.clear()
+        self._reusable_adc_cards = reusable
         
         # 清空详情面板缓存
         for panel in self.adc_detail_panels.values():
             panel.deleteLater()
         self.adc_detail_panels.clear()
+        self._current_adc_detail_panel = None
         
         self.selected_adc_id = None
         
-        # 创建新卡片
-        container = QWidget()
-        layout = QVBoxLayout()
-        container.setLayout(layout)
-        
-        for adc in adcs:
-            card = ADCCard(adc)
-            card.clicked.connect(self._on_adc_card_clicked)
-            layout.addWidget(card)
-            self.adc_cards[adc.id] = card
-        
-        layout.addStretch()
-        
-        self.adc_scroll.setWidget(container)
+        # 分批放入卡片，批次之间让出事件循环，避免大量ADC时界面卡顿
+        self._pending_adcs = adcs
+        self._pending_adc_pos = 0
+        self._adc_batch_generation += 1
+        self._create_next_adc_batch(self._adc_batch_generation)
         
         # 显示placeholder
         self.adc_detail_placeholder.show()
     
+    def _create_next_adc_batch(self, generation: int, batch_size: int = 20):
+        """创建（或复用）下一批ADC卡片"""
+        # 期间列表已被重新刷新，放弃旧批次
+        if generation != self._adc_batch_generation:
+            return
+        
+        start = self._pending_adc_pos
+        batch = self._pending_adcs[start:start + batch_size]
+        self._pending_adc_pos = start + len(batch)
+        
+        layout = self._adc_card_layout
+        for adc in batch:
+            card = self._reusable_adc_cards.pop(adc.id, None)
+            if card is None:
+                if self._adc_card_pool:
+                    card = self._adc_card_pool.pop()
+                    card.set_adc(adc)
+                else:
+                    card = ADCCard(adc)
+                    card.clicked.connect(self._on_adc_card_clicked)
+            layout.insertWidget(layout.count() - 1, card)  # 保持stretch在最后
+            card.show()
+            self.adc_cards[adc.id] = card
+        
+        if self._pending_adc_pos < len(self._pending_adcs):
+            QTimer.singleShot(0, lambda: self._create_next_adc_batch(generation, batch_size))
+    
+    def _release_adc_card(self, card: ADCCard):
+        """回收不再显示的卡片：放入卡片池，池满时销毁"""
+        card.hide()
+        if len(self._adc_card_pool) < self.adc_card_pool_size:
+            self._adc_card_pool.append(card)
+        else:
+            card.deleteLater()
+    
     def _on_adc_card_clicked(self, adc_id: int):
         """ADC卡片点击事件"""
         # 取消之前选中的卡片
@@ -3822,24 +4282,25 @@ class MainWindow(QMainWindow):
         # 隐藏placeholder
         self.adc_detail_placeholder.hide()
         
-        # 如果已经有缓存的面板，直接显示
-        if adc_id in self.adc_detail_panels:
-            for aid, panel in self.adc_detail_panels.items():
-                panel.hide()
-            self.adc_detail_panels[adc_id].show()
-            return
-        
-        # 从缓存获取ADC信息
-        adc = self.adc_controller.get_adc(adc_id)
-        if not adc:
-            return
-        
-        # 创建新的详情面板并缓存
-        panel = ADCDetailPanel(adc, self.adc_detail_widget)
-        panel.edit_requested.connect(self.edit_adc_by_id)
-        panel.delete_requested.connect(self.delete_adc_by_id)
-        self.adc_detail_panels[adc_id] = panel
-        self.adc_detail_layout.addWidget(panel)
+        panel = self.adc_detail_panels.get(adc_id)
+        if panel is None:
+            # 从缓存获取ADC信息
+            adc = self.adc_controller.get_adc(adc_id)
+            if not adc:
+                return
+            
+            # 创建新的详情面板并缓存
+            panel = ADCDetailPanel(adc, self.adc_detail_widget)
+            panel.edit_requested.connect(self.edit_adc_by_id)
+            panel.delete_requested.connect(self.delete_adc_by_id)
+            self.adc_detail_panels[adc_id] = panel
+            self.adc_detail_layout.addWidget(panel)
+        
+        # 只隐藏当前显示的面板，不遍历全部缓存面板
+        if self._current_adc_detail_panel is not None and self._current_adc_detail_panel is not panel:
+            self._current_adc_detail_panel.hide()
+        panel.show()
+        self._current_adc_detail_panel = panel
     
     def add_adc(self):
         """添加ADC"""
@@ -3903,6 +4364,7 @@ class MainWindow(QMainWindow):
     
     def search_adcs(self):
         """搜索ADC（支持多条件组合搜索）"""
+        self._adc_search_timer.stop()
         lot_number = self.adc_lot_search_edit.text().strip()
         sample_id = self.adc_search_edit.text().strip()
         antibody = self.adc_antibody_search_edit.text().strip()
@@ -4230,64 +4692,74 @@ class MainWindow(QMainWindow):
         """更新出入库记录表格"""
         # 保存movements列表以便选中时获取详细信息
         self._current_movements = movements
-        self.movement_table.setRowCount(len(movements))
         
-        for row, movement in enumerate(movements):
-            # 类型
-            type_text = "入库" if movement['type'] == 'inbound' else "出库"
-            type_item = QTableWidgetItem(type_text)
-            if movement['type'] == 'inbound':
-                type_item.setBackground(QColor("#d4edda"))
-            else:
-                type_item.setBackground(QColor("#f8d7da"))
-            self.movement_table.setItem(row, 0, type_item)
-            
-            # Lot Number
-            self.movement_table.setItem(row, 1, QTableWidgetItem(movement['lot_number']))
-            
-            # 操作人
-            self.movement_table.setItem(row, 2, QTableWidgetItem(movement['operator']))
+        # 批量填充期间暂停重绘和信号，结束后统一刷新一次
+        table = self.movement_table
+        table.setUpdatesEnabled(False)
+        table.blockSignals(True)
+        try:
+            # 只增减行数，保留的行原地更新文字
+            table.setRowCount(len(movements))
             
-            # 日期（精确到秒）
-            date_str = ""
-            if movement['date']:
-                if isinstance(movement['date'], datetime):
-                    date_str = movement['date'].strftime('%Y-%m-%d %H:%M:%S')
-                elif isinstance(movement['date'], str):
-                    # 尝试解析字符串格式的日期
-                    try:
-                        dt = datetime.strptime(movement['date'], '%Y-%m-%d %H:%M:%S.%f')
-                        date_str = dt.strftime('%Y-%m-%d %H:%M:%S')
-                    except ValueError:
-                        date_str = str(movement['date'])
+            for row, movement in enumerate(movements):
+                # 类型
+                type_text = "入库" if movement['type'] == 'inbound' else "出库"
+                type_item = set_cell_text(table, row, 0, type_text)
+                if movement['type'] == 'inbound':
+                    type_item.setBackground(INBOUND_ROW_COLOR)
                 else:
-                    date_str = str(movement['date'])
-            self.movement_table.setItem(row, 3, QTableWidgetItem(date_str))
-            
-            # 明细
-            items = movement['items']
-            items_str = ", ".join([
-                f"{item.spec_mg}mg×{item.quantity}" if isinstance(item, ADCMovementItem) 
-                else f"{item.get('spec_mg', 0)}mg×{item.get('quantity', 0)}"
-                for item in items
-            ])
-            self.movement_table.setItem(row, 4, QTableWidgetItem(items_str))
-            
-            # 合计
-            total_mg = sum([
-                item.spec_mg * item.quantity if isinstance(item, ADCMovementItem)
-                else item.get('spec_mg', 0) * item.get('quantity', 0)
-                for item in items
-            ])
-            self.movement_table.setItem(row, 5, QTableWidgetItem(f"{total_mg:.2f}"))
-            
-            # 备注
-            record = movement['record']
-            notes = record.notes if hasattr(record, 'notes') else ""
-            self.movement_table.setItem(row, 6, QTableWidgetItem(notes))
+                    type_item.setBackground(OUTBOUND_ROW_COLOR)
+                
+                # Lot Number
+                set_cell_text(table, row, 1, movement['lot_number'])
+                
+                # 操作人
+                set_cell_text(table, row, 2, movement['operator'])
+                
+                # 日期（精确到秒）
+                date_str = ""
+                if movement['date']:
+                    if isinstance(movement['date'], datetime):
+                        date_str = movement['date'].strftime('%Y-%m-%d %H:%M:%S')
+                    elif isinstance(movement['date'], str):
+                        # 尝试解析字符串格式的日期
+                        try:
+                            dt = datetime.strptime(movement['date'], '%Y-%m-%d %H:%M:%S.%f')
+                            date_str = dt.strftime('%Y-%m-%d %H:%M:%S')
+                        except ValueError:
+                            date_str = str(movement['date'])
+                    else:
+                        date_str = str(movement['date'])
+                set_cell_text(table, row, 3, date_str)
+                
+                # 明细
+                items = movement['items']
+                items_str = ", ".join([
+                    f"{item.spec_mg}mg×{item.quantity}" if isinstance(item, ADCMovementItem) 
+                    else f"{item.get('spec_mg', 0)}mg×{item.get('quantity', 0)}"
+                    for item in items
+                ])
+                set_cell_text(table, row, 4, items_str)
+                
+                # 合计
+                total_mg = sum([
+                    item.spec_mg * item.quantity if isinstance(item, ADCMovementItem)
+                    else item.get('spec_mg', 0) * item.get('quantity', 0)
+                    for item in items
+                ])
+                set_cell_text(table, row, 5, f"{total_mg:.2f}")
+                
+                # 备注
+                record = movement['record']
+                notes = record.notes if hasattr(record, 'notes') else ""
+                set_cell_text(table, row, 6, notes)
+        finally:
+            table.blockSignals(False)
+            table.setUpdatesEnabled(True)
     
     def search_adc_movements(self):
         """搜索出入库记录（支持多条件筛选）"""
+        self._movement_search_timer.stop()
         # 获取所有记录
         lot_keyword = self.movement_search_edit.text().strip()
         if lot_keyword: